@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Attribute carrying the user's employee id, loaded with the user and kept in
+# the cache entry so authorization needs no query of its own (see principal)
+EMPLOYEE_ID_ATTR = 'principal_employee_id'
+
+
+class UserCache:
+    """
+    Bounded, process-local LRU cache of User rows with a TTL.
+
+    Rows are stored as plain column values, plus the id of the user's
+    employee record, and a fresh User instance is built on every hit, so
+    requests never share (and mutate) the same object. User and Employee
+    saves and deletes and permission changes invalidate entries through
+    signals in this process; other processes pick them up once the TTL
+    (``AUTH_USER_CACHE_TTL`` seconds) expires.
+    """
+
+    def __init__(self):
+        # Keyed by str(user id): token claims may carry the id as a string
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so loads racing a write are not cached
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, model, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[user_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+        _, db, field_names, values, employee_id = entry
+        user = model.from_db(db, field_names, values)
+        setattr(user, EMPLOYEE_ID_ATTR, employee_id)
+        return user
+
+    def put(self, user_id, user, generation):
+        field_names = [field.attname for field in user._meta.concrete_fields]
+        values = tuple(getattr(user, name) for name in field_names)
+        employee_id = getattr(user, EMPLOYEE_ID_ATTR, None)
+        user_id = str(user_id)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user_id] = (time.monotonic(), user._state.db, field_names, values, employee_id)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id=None):
+        """Drop one user, or every user when ``user_id`` is None."""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that serves users from ``user_cache`` instead of a
+    primary-key query on every request. Misses load the user's employee id in
+    the same query. Token checks are unchanged.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = user_cache.get(self.user_model, user_id)
+        if user is None:
+            generation = user_cache.generation
+            try:
+                user = self.user_model.objects.annotate(
+                    **{EMPLOYEE_ID_ATTR: F('employee_profile__id')}
+                ).get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            user_cache.put(user_id, user, generation)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,88 @@
+from .authentication import EMPLOYEE_ID_ATTR
+
+# Extra claim carried by access and refresh tokens
+EMPLOYEE_CLAIM = 'employee_id'
+
+_UNRESOLVED = object()
+
+
+def _employee_id_for(user_id):
+    from apps.employees.models import Employee
+    return Employee.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+
+
+class Principal:
+    """
+    Who is making a request, as plain ids.
+
+    Permission checks compare these ids with foreign key columns instead of
+    loading and comparing model instances. ``employee_id`` is looked up on
+    first use, so admin requests that never need it never pay for it.
+    """
+    __slots__ = ('user_id', 'role', 'is_staff', '_employee_id')
+
+    def __init__(self, user_id=None, role='', is_staff=False, employee_id=_UNRESOLVED):
+        self.user_id = user_id
+        self.role = role
+        self.is_staff = is_staff
+        self._employee_id = employee_id if user_id is not None else None
+
+    def __repr__(self):
+        return f"Principal(user_id={self.user_id!r}, role={self.role!r}, is_staff={self.is_staff!r})"
+
+    @property
+    def employee_id(self):
+        if self._employee_id is _UNRESOLVED:
+            self._employee_id = _employee_id_for(self.user_id)
+        return self._employee_id
+
+    @property
+    def is_authenticated(self):
+        return self.user_id is not None
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin' or self.is_staff
+
+
+ANONYMOUS = Principal()
+
+
+def principal_claims(user):
+    """
+    Claims added to tokens issued for ``user``.
+
+    ``employee_id`` is informational for clients; the server never trusts it,
+    since the employee record can be reassigned while the token is valid.
+    """
+    return {
+        EMPLOYEE_CLAIM: _employee_id_for(user.pk),
+    }
+
+
+def get_principal(request):
+    """
+    Resolve the Principal for ``request`` once and cache it on the request.
+
+    Role and staff flag come from the authenticated user, which is already in
+    memory, so demotions apply immediately. The employee id is never taken
+    from the token, which outlives relinks and deletions of employee records.
+    Token-authenticated users carry it from the user cache, loaded in the same
+    query as the user and invalidated by Employee saves and deletes (see
+    ``CachedJWTAuthentication``); otherwise it costs one query the first time
+    it is needed.
+    """
+    principal = getattr(request, '_principal', None)
+    if principal is not None:
+        return principal
+
+    user = request.user
+    if user is None or not user.is_authenticated:
+        principal = ANONYMOUS
+    else:
+        principal = Principal(
+            user_id=user.pk, role=user.role, is_staff=user.is_staff,
+            employee_id=getattr(user, EMPLOYEE_ID_ATTR, _UNRESOLVED),
+        )
+    request._principal = principal
+    return principal
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .principal import principal_claims
 
 User = get_user_model()
 
@@ -38,4 +40,14 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'email', 'username', 'first_name', 'last_name', 'phone', 'role', 'created_at', 'updated_at')
-        read_only_fields = ('created_at', 'updated_at') 
\ No newline at end of file
+        read_only_fields = ('created_at', 'updated_at') 
+
+class PrincipalTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the employee id claim so clients can tell which employee record the token belongs to."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, value in principal_claims(user).items():
+            token[claim] = value
+        return token
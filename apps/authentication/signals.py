@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .authentication import user_cache
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers role, staff flag, activation and password changes. Invalidate
+    # again on commit so a load racing the open transaction is not kept.
+    user_id = instance.pk
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_cached_user_permissions(sender, instance, reverse, **kwargs):
+    # Reverse changes (e.g. group.user_set) can touch many users
+    user_cache.invalidate(None if reverse else instance.pk)
@@ -0,0 +1,82 @@
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..factories import UserFactory
+from apps.employees.tests.factories import EmployeeFactory
+from ...authentication import EMPLOYEE_ID_ATTR, user_cache
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.profile_url = reverse('profile')
+
+    def tearDown(self):
+        user_cache.clear()
+
+    def test_second_request_skips_user_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.profile_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['email'], self.user.email)
+        self.assertEqual(user_cache.stats()['hits'], 1)
+        self.assertEqual(user_cache.stats()['misses'], 1)
+
+    def test_saves_invalidate_cached_user(self):
+        self.client.get(self.profile_url)
+        self.user.role = 'admin'
+        self.user.save()
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['role'], 'admin')
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_group_changes_invalidate_cached_user(self):
+        self.client.get(self.profile_url)
+        self.user.groups.add(Group.objects.create(name='Managers'))
+        self.assertEqual(user_cache.stats()['size'], 0)
+
+    def test_employee_id_is_cached_with_the_user(self):
+        self.client.get(self.profile_url)
+        self.assertIsNone(getattr(user_cache.get(type(self.user), self.user.pk), EMPLOYEE_ID_ATTR))
+
+        employee = EmployeeFactory(user=self.user)
+        self.client.get(self.profile_url)
+        self.assertEqual(getattr(user_cache.get(type(self.user), self.user.pk), EMPLOYEE_ID_ATTR), employee.pk)
+
+        employee.delete()
+        self.assertEqual(user_cache.stats()['size'], 0)
+
+    def test_hits_return_independent_instances(self):
+        self.client.get(self.profile_url)
+        first = user_cache.get(type(self.user), self.user.pk)
+        first.first_name = 'Changed'
+        self.assertNotEqual(user_cache.get(type(self.user), self.user.pk).first_name, 'Changed')
+
+    @override_settings(AUTH_USER_CACHE_SIZE=1)
+    def test_cache_is_bounded(self):
+        other = UserFactory()
+        self.client.get(self.profile_url)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(other).access_token}')
+        self.client.get(self.profile_url)
+        stats = user_cache.stats()
+        self.assertEqual((stats['size'], stats['evictions']), (1, 1))
+
+    def test_stats_endpoint_is_admin_only(self):
+        response = self.client.get(reverse('auth-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('auth-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hit_rate', response.data['data'])
@@ -0,0 +1,67 @@
+from itertools import count
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
+from apps.authentication.authentication import user_cache
+from apps.authentication.views import (
+    AuthCacheStatsView, CustomTokenObtainPairView, RegisterView, UserProfileView,
+)
+from apps.core.testing import QueryBudget, QueryBudgetTestCase
+from ..factories import UserFactory
+
+User = get_user_model()
+sequence = count()
+PASSWORD = 'Testpass123!'
+
+
+def make_users(test, number):
+    User.objects.bulk_create([
+        User(username=f'budget{n}', email=f'budget{n}@example.com')
+        for n in (next(sequence) for _ in range(number))
+    ])
+
+
+def registration():
+    n = next(sequence)
+    return {
+        'email': f'new{n}@example.com',
+        'username': f'new{n}',
+        'password': PASSWORD,
+        'password2': PASSWORD,
+        'first_name': 'New',
+        'last_name': 'User',
+    }
+
+
+def profile(test):
+    return {'email': test.user.email, 'username': test.user.username, 'first_name': 'Budget'}
+
+
+class AuthenticationQueryBudgetTests(QueryBudgetTestCase):
+    views = (RegisterView, CustomTokenObtainPairView, TokenRefreshView, UserProfileView, AuthCacheStatsView)
+    budgets = (
+        QueryBudget(RegisterView, 'post', 4, populate=make_users, status=201,
+                    request=lambda test, _: test.client.post(reverse('register'), registration(), format='json')),
+        QueryBudget(CustomTokenObtainPairView, 'post', 3, populate=make_users,
+                    request=lambda test, _: test.client.post(
+                        '/api/auth/login/', {'email': test.user.email, 'password': PASSWORD}, format='json')),
+        QueryBudget(TokenRefreshView, 'post', 1, populate=make_users,
+                    request=lambda test, _: test.client.post(
+                        reverse('token_refresh'), {'refresh': str(test.refresh)}, format='json')),
+        QueryBudget(UserProfileView, 'get', 0, populate=make_users,
+                    request=lambda test, _: test.client.get(reverse('profile'))),
+        QueryBudget(UserProfileView, 'put', 4, populate=make_users,
+                    request=lambda test, _: test.client.put(reverse('profile'), profile(test), format='json')),
+        QueryBudget(UserProfileView, 'patch', 2, populate=make_users,
+                    request=lambda test, _: test.client.patch(reverse('profile'), {'phone': '555'}, format='json')),
+        QueryBudget(AuthCacheStatsView, 'get', 0, populate=make_users,
+                    request=lambda test, _: test.client.get(reverse('auth-cache-stats'))),
+    )
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = UserFactory(password=PASSWORD, is_staff=True)
+        self.refresh = RefreshToken.for_user(self.user)
+        # Authenticate with a real token so the JWT user lookup is measured too
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
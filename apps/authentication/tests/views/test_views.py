@@ -3,7 +3,8 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from apps.employees.tests.factories import EmployeeFactory
 from ..factories import UserFactory
 
 User = get_user_model()
@@ -89,4 +90,15 @@ class AuthenticationViewsTest(TestCase):
 
     def test_user_profile_unauthorized(self):
         response = self.client.get(self.profile_url)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_carries_principal_claims(self):
+        employee = EmployeeFactory(user=self.existing_user)
+        response = self.client.post(self.token_url, {
+            'email': self.existing_user.email,
+            'password': 'Testpass123!'
+        })
+        token = AccessToken(response.data['access'])
+        self.assertNotIn('role', token)
+        self.assertNotIn('is_staff', token)
+        self.assertEqual(token['employee_id'], employee.id)
@@ -1,10 +1,11 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from .views import RegisterView, UserProfileView, CustomTokenObtainPairView
+from .views import RegisterView, UserProfileView, CustomTokenObtainPairView, AuthCacheStatsView
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('profile/', UserProfileView.as_view(), name='profile'),
+    path('cache-stats/', AuthCacheStatsView.as_view(), name='auth-cache-stats'),
 ] 
\ No newline at end of file
@@ -3,7 +3,8 @@ from rest_framework import generics, permissions
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
-from .serializers import UserRegistrationSerializer, UserSerializer
+from .authentication import user_cache
+from .serializers import PrincipalTokenObtainPairSerializer, UserRegistrationSerializer, UserSerializer
 
 User = get_user_model()
 
@@ -20,6 +21,8 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 class CustomTokenObtainPairView(TokenObtainPairView):
+    serializer_class = PrincipalTokenObtainPairSerializer
+
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
         if response.status_code == 200:
@@ -27,3 +30,13 @@ class CustomTokenObtainPairView(TokenObtainPairView):
             user_data = UserSerializer(user).data
             response.data['user'] = user_data
         return response
+
+class AuthCacheStatsView(generics.GenericAPIView):
+    """Hit/miss counters of this process's authenticated-user cache."""
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            'message': 'Authentication cache statistics retrieved successfully',
+            'data': user_cache.stats()
+        })
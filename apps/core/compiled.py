@@ -0,0 +1,194 @@
+import copy
+import datetime
+from types import SimpleNamespace
+from django.core.exceptions import FieldDoesNotExist
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Serializer field types the compiler understands. Subclasses (custom fields)
+# are deliberately not matched, so anything bespoke keeps the DRF path.
+DELEGATED_FIELDS = (
+    serializers.BooleanField, serializers.ChoiceField, serializers.DateTimeField,
+    serializers.DecimalField, serializers.FloatField,
+)
+SUPPORTED_FIELDS = frozenset((
+    serializers.BigIntegerField, serializers.CharField, serializers.DateField, serializers.EmailField,
+    serializers.IntegerField, serializers.PrimaryKeyRelatedField, serializers.ReadOnlyField, *DELEGATED_FIELDS,
+))
+
+_compiled = {}
+
+
+class CompiledSerializer:
+    """
+    Flat-row renderer equivalent to one serializer's ``to_representation``.
+
+    ``columns`` are fed to ``values_list()`` and ``row_to_dict(row, tz)``
+    turns one of the resulting tuples into the dict DRF would have produced
+    from the model instance, without building the instance or dispatching
+    through every field. ``source`` is the generated code, for debugging.
+    """
+
+    def __init__(self, columns, row_to_dict, source):
+        self.columns = columns
+        self.row_to_dict = row_to_dict
+        self.source = source
+
+    def values(self, queryset, extra=()):
+        """``queryset`` as named rows of ``columns`` followed by ``extra``."""
+        columns = list(self.columns) + [column for column in extra if column not in self.columns]
+        return queryset.values_list(*columns, named=True)
+
+    def many(self, rows):
+        tz = timezone.get_current_timezone()
+        if getattr(tz, 'key', None) == 'UTC':
+            # Database values carry datetime.timezone.utc; using the same
+            # object lets aware UTC values skip astimezone()
+            tz = datetime.timezone.utc
+        row_to_dict = self.row_to_dict
+        return [row_to_dict(row, tz) for row in rows]
+
+
+def _zulu(value):
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def _converter(field, model_field):
+    """
+    Code converting a non-null value, as a template over ``{value}`` and
+    ``{helper}`` (the callable returned alongside), or None for pass-through.
+    """
+    field_type = type(field)
+    if field_type in (serializers.PrimaryKeyRelatedField, serializers.ReadOnlyField):
+        return None, None
+    if field_type is serializers.BigIntegerField and getattr(
+            field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING):
+        return 'str({value})', None
+    if field_type in (serializers.IntegerField, serializers.BigIntegerField):
+        is_integer_column = isinstance(model_field, (models.IntegerField, models.AutoField, models.ForeignKey))
+        return (None if is_integer_column else 'int({value})'), None
+    if field_type in (serializers.CharField, serializers.EmailField):
+        return (None if isinstance(model_field, (models.CharField, models.TextField)) else 'str({value})'), None
+    if field_type is serializers.DateField and isinstance(model_field, models.DateField) \
+            and not isinstance(model_field, models.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format is not None and output_format.lower() == ISO_8601:
+            return '{value}.isoformat()', None
+    # A detached copy, so the cached function holds no request or parent
+    delegate = copy.deepcopy(field).to_representation
+    if field_type is serializers.DateTimeField and settings.USE_TZ and not hasattr(field, 'timezone'):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is not None and output_format.lower() == ISO_8601:
+            # DateTimeField.to_representation inlined for aware values,
+            # converting to the timezone current when the list is rendered
+            return ('zulu({value}.isoformat()) if {value}.tzinfo is tz '
+                    'else {helper}({value}) if {value}.utcoffset() is None '
+                    'else zulu({value}.astimezone(tz).isoformat())'), delegate
+    return '{helper}({value})', delegate
+
+
+def _compile(serializer):
+    model = serializer.Meta.model
+    dependencies = getattr(serializer.Meta, 'field_dependencies', {})
+    columns, namespace = [], {'computed_row': SimpleNamespace, 'zulu': _zulu}
+    statements, entries = [], []
+
+    def column(name):
+        if name not in columns:
+            columns.append(name)
+        return f'row[{columns.index(name)}]'
+
+    for index, field in enumerate(serializer._readable_fields):
+        if type(field) not in SUPPORTED_FIELDS or field.source == '*' or '.' in field.source:
+            return None
+        if type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is not None:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            model_field = None
+
+        if model_field is not None:
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+            if model_field.is_relation != (type(field) is serializers.PrimaryKeyRelatedField):
+                return None
+            expression, nullable = column(model_field.attname), model_field.null
+        elif field.field_name in dependencies and isinstance(getattr(model, field.source, None), property):
+            # Model properties run against just the columns they declare
+            namespace[f'p{index}'] = getattr(model, field.source).fget
+            arguments = ', '.join(f'{name}={column(name)}' for name in dependencies[field.field_name])
+            expression, nullable = f'p{index}(computed_row({arguments}))', True
+        else:
+            return None
+
+        template, helper = _converter(field, model_field)
+        if template is not None:
+            # Serializer.to_representation renders None without the field
+            value = f'v{index}'
+            namespace[f'c{index}'] = helper
+            converted = template.format(value=value, helper=f'c{index}')
+            statements.append(f'    {value} = {expression}')
+            if nullable:
+                statements.append(f'    if {value} is not None:\n        {value} = {converted}')
+            else:
+                statements.append(f'    {value} = {converted}')
+            expression = value
+        entries.append(f'        {field.field_name!r}: {expression},')
+
+    source = '\n'.join([
+        'def row_to_dict(row, tz):', *statements, '    return {', *entries, '    }', '',
+    ])
+    exec(compile(source, f'<compiled {type(serializer).__name__}>', 'exec'), namespace)
+    return CompiledSerializer(tuple(columns), namespace['row_to_dict'], source)
+
+
+def compile_serializer(serializer):
+    """
+    The CompiledSerializer for ``serializer``'s current field set, or None if
+    any field needs the regular DRF path (nested serializers, method fields,
+    custom field classes, dotted sources, undeclared computed attributes).
+
+    Compiled functions are cached per serializer class and field set; field
+    options other than the class and source must not vary between requests.
+    """
+    if not isinstance(serializer, serializers.ModelSerializer):
+        return None
+    key = (type(serializer), settings.USE_TZ, tuple(
+        (name, type(field), field.source) for name, field in serializer.fields.items() if not field.write_only
+    ))
+    if key not in _compiled:
+        _compiled[key] = _compile(serializer)
+    return _compiled[key]
+
+
+class CompiledListMixin:
+    """
+    Renders list data through ``compile_serializer`` when the requested field
+    set allows it, falling back to the serializer otherwise. The browsable API
+    keeps the serializer so its forms still work.
+    """
+
+    def get_compiled_serializer(self):
+        if self.request.accepted_renderer.format in ('api', 'html'):
+            return None
+        return compile_serializer(self.get_serializer())
+
+    def serialize_many(self, queryset):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return self.get_serializer(queryset, many=True).data
+        return compiled.many(compiled.values(queryset))
+
+    def serialize_page(self, queryset, extra=()):
+        """
+        Paginate ``queryset`` and render the page. ``extra`` names columns the
+        paginator reads from each row, i.e. its ordering.
+        """
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return self.get_serializer(self.paginate_queryset(queryset), many=True).data
+        return compiled.many(self.paginate_queryset(compiled.values(queryset, extra)))
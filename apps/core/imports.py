@@ -0,0 +1,73 @@
+import codecs
+import csv
+import json
+
+# Mirrors EXPORT_FORMAT_PARAM: DRF reserves ?format= for renderer selection
+IMPORT_FORMAT_PARAM = 'input'
+
+IMPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(name='', content_type=''):
+    """Import format from a file name or content type, or None."""
+    for output, expected in IMPORT_CONTENT_TYPES.items():
+        if name.lower().endswith(f'.{output}') or content_type.split(';')[0].strip() == expected:
+            return output
+    if name.lower().endswith('.jsonl'):
+        return 'ndjson'
+    return None
+
+
+def _lines(stream):
+    """Decoded text lines of a binary stream, read incrementally."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    pending = ''
+    for chunk in iter(lambda: stream.read(64 * 1024), b''):
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line + '\n'
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def iter_csv(stream):
+    reader = csv.DictReader(_lines(stream))
+    try:
+        for row in reader:
+            yield {column: value for column, value in row.items() if column is not None}
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ImportFormatError(f'Line {reader.line_num}: {e}')
+
+
+def iter_ndjson(stream):
+    for number, line in enumerate(_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise ImportFormatError(f'Line {number} is not valid JSON')
+        if not isinstance(row, dict):
+            raise ImportFormatError(f'Line {number} is not a JSON object')
+        yield row
+
+
+def iter_rows(stream, input_format):
+    """
+    Dicts read lazily from a binary ``stream`` of CSV (header row first) or
+    NDJSON, so arbitrarily large files are never held in memory.
+    """
+    if input_format == 'csv':
+        return iter_csv(stream)
+    if input_format == 'ndjson':
+        return iter_ndjson(stream)
+    raise ImportFormatError(f"Unsupported import format '{input_format}'")
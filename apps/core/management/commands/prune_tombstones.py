@@ -0,0 +1,20 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.core.models import Tombstone
+from apps.core.sync import retention
+
+
+class Command(BaseCommand):
+    help = 'Delete deletion tombstones older than the delta-sync retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            help='Retention in days (defaults to DELTA_SYNC_RETENTION_DAYS, 90)',
+        )
+
+    def handle(self, *args, **options):
+        window = timedelta(days=options['days']) if options['days'] is not None else retention()
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - window).delete()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} tombstones'))
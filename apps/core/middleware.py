@@ -0,0 +1,109 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from apps.authentication.principal import get_principal
+
+logger = logging.getLogger('apps.core.sql')
+
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    Normalize ``sql`` so statements differing only in parameters compare
+    equal: literals become ``?`` and ``IN (%s, %s, ...)`` lists collapse.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` callable counting and timing statements."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        """Fingerprints executed at least ``threshold`` times, most frequent first."""
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records the SQL issued while handling each request.
+
+    Logs one structured ``apps.core.sql`` record per request, warns when a
+    statement repeats ``SQL_N_PLUS_ONE_THRESHOLD`` times or more, the usual
+    signature of an N+1 query, and adds
+    ``Server-Timing: db;dur=..;desc="N queries", app;dur=..`` to responses
+    for admins only (``Principal.is_admin``), so other clients learn nothing
+    about the queries.
+    Enabled by ``SQL_INSTRUMENTATION``, which defaults to ``DEBUG``. Queries
+    run while a streaming response is consumed are not included.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_INSTRUMENTATION', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'SQL_N_PLUS_ONE_THRESHOLD', 5)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        db_ms, app_ms = recorder.duration * 1000, elapsed * 1000
+        # request.user is set by AuthenticationMiddleware, and by DRF for
+        # token-authenticated requests; the principal is cached on the request
+        if hasattr(request, 'user') and get_principal(request).is_admin:
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries", app;dur={app_ms:.1f}'
+            )
+
+        repeated = recorder.repeated(self.threshold)
+        details = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(db_ms, 1),
+            'duration_ms': round(app_ms, 1),
+            'repeated_queries': [{'sql': sql, 'count': count} for sql, count in repeated],
+        }
+        logger.info(
+            f"{request.method} {request.path} {response.status_code}: "
+            f"{recorder.count} queries in {db_ms:.1f}ms",
+            extra={'sql': details},
+        )
+        for sql, count in repeated:
+            logger.warning(
+                f"Possible N+1 in {request.method} {request.path}: statement ran {count} times: {sql}",
+                extra={'sql': details},
+            )
+        return response
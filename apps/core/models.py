@@ -0,0 +1,22 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Compact record of a deleted row, served to delta-sync clients so they can
+    drop their local copy. Pruned with ``manage.py prune_tombstones``.
+    """
+    model = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    # Owner used to scope tombstones for non-admin clients (e.g. employee id)
+    scope_id = models.PositiveBigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.model}#{self.object_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_model_deleted_idx'),
+        ]
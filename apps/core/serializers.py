@@ -0,0 +1,88 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _split(value):
+    return {item.strip() for item in (value or '').split(',') if item.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Lets API clients choose which fields a ModelSerializer renders.
+
+    - ``?fields=id,start_date`` renders only the listed fields.
+    - Nested representations named in ``Meta.expandable_fields`` (expand key ->
+      serializer field name) are left out unless requested with
+      ``?expand=employee,leave_type``; the plain foreign key field still
+      carries the related id.
+    - ``Meta.field_dependencies`` lists the model columns that computed fields
+      (e.g. properties) read, so ``optimize_queryset`` can restrict the SELECT.
+
+    Only the top-level serializer (or the child of a top-level ``many=True``
+    list) reacts to the query parameters; nested serializers render in full.
+    """
+
+    def _is_top_level(self):
+        parent = getattr(self, 'parent', None)
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def _requested(self):
+        request = self.context.get('request')
+        if request is None or not self._is_top_level():
+            return None, set()
+        params = getattr(request, 'query_params', request.GET)
+        # Field selection never applies to writes, where it would drop inputs
+        only = (_split(params.get(FIELDS_PARAM)) or None) if request.method in SAFE_METHODS else None
+        return only, _split(params.get(EXPAND_PARAM))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        only, expand = self._requested()
+
+        for key, field_name in expandable.items():
+            if key not in expand:
+                fields.pop(field_name, None)
+        if only is not None:
+            keep = only | {expandable[key] for key in expand if key in expandable}
+            for field_name in list(fields):
+                if field_name not in keep:
+                    fields.pop(field_name)
+        return fields
+
+    def optimize_queryset(self, queryset, extra=()):
+        """
+        Restrict ``queryset`` to the columns and joins the rendered fields need:
+        ``select_related`` for expanded relations and ``only()`` for the rest.
+        ``extra`` names additional columns the caller needs (e.g. the
+        pagination ordering).
+        """
+        model = queryset.model
+        dependencies = getattr(self.Meta, 'field_dependencies', {})
+        columns, relations = {model._meta.pk.name, *extra}, set()
+
+        for field_name, field in self.fields.items():
+            if field.source == '*':
+                return queryset
+            source = field.source.split('.')[0]
+            if field_name in dependencies:
+                columns.update(dependencies[field_name])
+                continue
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                # Unknown computed value; keep every column to be safe
+                return queryset
+            if model_field.many_to_many or model_field.one_to_many or (model_field.one_to_one and not model_field.concrete):
+                return queryset
+            columns.add(source)
+            if isinstance(field, serializers.BaseSerializer):
+                relations.add(source)
+
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
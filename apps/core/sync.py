@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from .models import Tombstone
+
+SYNC_PARAM = 'since'
+# Position inside a paged delta: '<timestamp token>.<pk>' of the last row sent
+SYNC_CURSOR_PARAM = 'after'
+
+# Tokens are microseconds since the Unix epoch; '0' requests a full initial sync
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def make_sync_token(moment):
+    return str((moment - _EPOCH) // _MICROSECOND)
+
+
+def parse_sync_token(token):
+    """Return the datetime encoded in ``token``; raises ValueError if malformed."""
+    value = int(token)
+    if value < 0:
+        raise ValueError(token)
+    return _EPOCH + value * _MICROSECOND
+
+
+def make_sync_cursor(moment, pk):
+    return f'{make_sync_token(moment)}.{pk}'
+
+
+def parse_sync_cursor(cursor):
+    """Return the (datetime, pk) encoded in ``cursor``; raises ValueError if malformed."""
+    token, pk = cursor.split('.')
+    return parse_sync_token(token), int(pk)
+
+
+def retention():
+    return timedelta(days=getattr(settings, 'DELTA_SYNC_RETENTION_DAYS', 90))
+
+
+def track_deletions(model, scope=None):
+    """
+    Record a Tombstone whenever a ``model`` row is deleted, including cascades.
+    ``scope`` maps the deleted instance to the owner id non-admin clients are
+    filtered on.
+    """
+    label = model._meta.label_lower
+
+    def record(sender, instance, **kwargs):
+        Tombstone.objects.create(
+            model=label,
+            object_id=instance.pk,
+            scope_id=scope(instance) if scope is not None else None,
+        )
+
+    post_delete.connect(record, sender=model, weak=False, dispatch_uid=f'tombstone:{label}')
+
+
+class DeltaSyncMixin:
+    """
+    ``?since=<token>`` mode for list endpoints.
+
+    Returns the rows whose ``updated_at`` is after the token, the ids of rows
+    deleted since then and a ``sync_token`` for the next call, so sync traffic
+    follows churn rather than history size. Rows come in pages of
+    ``DELTA_SYNC_PAGE_SIZE``, keyed on (``updated_at``, pk): every page but the
+    last carries a ``next`` link instead of the token, and the deleted ids
+    come with the last one. A row updated while a client pages moves ahead of
+    its cursor and is sent again on a later page. The next token is taken
+    slightly before the request started (``DELTA_SYNC_OVERLAP_SECONDS``) so rows
+    committed by transactions that were still open are not missed; clients
+    upsert by id, so the overlap is harmless. Tokens older than the tombstone
+    retention, or issued before the set of visible rows changed under the
+    client (see ``sync_is_stale``), get a 410 and must fall back to a full
+    sync.
+    """
+    sync_timestamp_field = 'updated_at'
+
+    def is_sync_request(self, request):
+        return SYNC_PARAM in request.query_params
+
+    def scope_tombstones(self, tombstones):
+        """The deletion tombstones the caller may see; all of them by default."""
+        return tombstones
+
+    def sync_is_stale(self, since):
+        """Whether rows became visible or hidden after ``since`` without being updated."""
+        return False
+
+    def serialize_many(self, queryset):
+        return self.get_serializer(queryset, many=True).data
+
+    def sync_list(self, request, queryset):
+        now = timezone.now()
+        try:
+            since = parse_sync_token(request.query_params[SYNC_PARAM])
+        except (TypeError, ValueError, OverflowError):
+            return Response({
+                'message': 'Invalid sync token'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        full_sync = since == _EPOCH
+        if not full_sync and since < now - retention():
+            return Response({
+                'message': 'Sync token has expired; perform a full sync'
+            }, status=status.HTTP_410_GONE)
+        if not full_sync and self.sync_is_stale(since):
+            return Response({
+                'message': 'Visible rows changed since this token; perform a full sync'
+            }, status=status.HTTP_410_GONE)
+
+        field = self.sync_timestamp_field
+        changed = queryset.filter(**{f'{field}__gt': since}).order_by(field, 'pk')
+        cursor = request.query_params.get(SYNC_CURSOR_PARAM)
+        if cursor is not None:
+            try:
+                after, after_pk = parse_sync_cursor(cursor)
+            except (TypeError, ValueError, OverflowError):
+                return Response({
+                    'message': 'Invalid sync cursor'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            changed = changed.filter(Q(**{f'{field}__gt': after}) | Q(**{field: after, 'pk__gt': after_pk}))
+
+        page_size = getattr(settings, 'DELTA_SYNC_PAGE_SIZE', 500)
+        keys = list(changed.values_list(field, 'pk')[:page_size + 1])
+        data = self.serialize_many(changed[:page_size])
+        if len(keys) > page_size:
+            return Response({
+                'message': 'Changes retrieved successfully',
+                'data': data,
+                'deleted': [],
+                'next': replace_query_param(
+                    request.build_absolute_uri(), SYNC_CURSOR_PARAM, make_sync_cursor(*keys[page_size - 1])
+                ),
+            })
+
+        deleted = []
+        if not full_sync:
+            tombstones = self.scope_tombstones(Tombstone.objects.filter(
+                model=queryset.model._meta.label_lower, deleted_at__gt=since
+            ))
+            deleted = list(dict.fromkeys(tombstones.order_by('deleted_at').values_list('object_id', flat=True)))
+
+        overlap = timedelta(seconds=getattr(settings, 'DELTA_SYNC_OVERLAP_SECONDS', 5))
+        return Response({
+            'message': 'Changes retrieved successfully',
+            'data': data,
+            'deleted': deleted,
+            'next': None,
+            'sync_token': make_sync_token(max(now - overlap, since)),
+        })
@@ -0,0 +1,105 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework.viewsets import ViewSetMixin
+
+# Row counts each budget is measured at
+BUDGET_SIZES = (1, 10, 100)
+
+VIEWSET_ACTIONS = ('list', 'retrieve', 'create', 'update', 'partial_update', 'destroy')
+
+
+class QueryBudget:
+    """
+    The most queries ``view``'s ``action`` may issue, at any number of rows.
+
+    ``populate(test, count)`` adds ``count`` rows of the data the endpoint
+    reads; ``target(test)`` prepares whatever one call consumes (e.g. a leave
+    to approve) outside the measurement; ``request(test, target)`` makes the
+    call and returns the response. ``action`` is the viewset action, or the
+    lower-case HTTP method for plain API views.
+    """
+
+    def __init__(self, view, action, max_queries, request, populate=None, target=None, status=200):
+        self.view = view
+        self.action = action
+        self.max_queries = max_queries
+        self.request = request
+        self.populate = populate
+        self.target = target
+        self.status = status
+
+    @property
+    def name(self):
+        return f'{self.view.__name__}.{self.action}'
+
+
+def view_actions(view):
+    """The actions of ``view`` that need a budget."""
+    if issubclass(view, ViewSetMixin):
+        actions = {action for action in VIEWSET_ACTIONS if hasattr(view, action)}
+        return actions | {extra.__name__ for extra in view.get_extra_actions()}
+    return {method for method in view.http_method_names if method != 'options' and hasattr(view, method)}
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    Generates one ``test_budget_<View>_<action>`` per entry in ``budgets``.
+
+    Each endpoint is called once to warm process-local caches, then measured
+    after growing its data to every size in ``BUDGET_SIZES``. A test fails if
+    any call exceeds the budget or if the count changes with the number of
+    rows, the signature of an N+1 query. ``test_every_action_has_a_budget``
+    fails when an action of a view in ``views`` has no budget, so new
+    endpoints cannot skip the guard.
+    """
+
+    # Only subclasses hold budgets; keep pytest from collecting this one
+    __test__ = False
+
+    views = ()
+    budgets = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__test__ = True
+        for budget in cls.budgets:
+            name = f'test_budget_{budget.view.__name__}_{budget.action}'
+            setattr(cls, name, lambda self, budget=budget: self.assertWithinBudget(budget))
+
+    def test_every_action_has_a_budget(self):
+        budgeted = {(budget.view, budget.action) for budget in self.budgets}
+        missing = sorted(
+            f'{view.__name__}.{action}'
+            for view in self.views for action in view_actions(view)
+            if (view, action) not in budgeted
+        )
+        self.assertEqual(missing, [], 'Endpoints without a query budget')
+
+    def call(self, budget):
+        target = budget.target(self) if budget.target else None
+        with CaptureQueriesContext(connection) as captured:
+            response = budget.request(self, target)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, budget.status, f'{budget.name}: {getattr(response, "data", "")}')
+        return len(captured), captured
+
+    def assertWithinBudget(self, budget):
+        self.call(budget)
+        counts, previous = {}, 0
+        for size in BUDGET_SIZES:
+            if budget.populate:
+                budget.populate(self, size - previous)
+            previous = size
+            counts[size], captured = self.call(budget)
+            self.assertLessEqual(
+                counts[size], budget.max_queries,
+                f'{budget.name} ran {counts[size]} queries with {size} rows '
+                f'(budget {budget.max_queries}):\n'
+                + '\n'.join(query['sql'] for query in captured.captured_queries),
+            )
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f'{budget.name} query count grows with the number of rows: {counts}',
+        )
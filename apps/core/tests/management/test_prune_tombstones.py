@@ -0,0 +1,19 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from apps.core.models import Tombstone
+
+
+class PruneTombstonesCommandTests(TestCase):
+    def test_prunes_only_expired_tombstones(self):
+        Tombstone.objects.create(model='leaves.leave', object_id=1, deleted_at=timezone.now() - timedelta(days=100))
+        recent = Tombstone.objects.create(model='leaves.leave', object_id=2)
+        out = StringIO()
+        call_command('prune_tombstones', stdout=out)
+        self.assertIn('Pruned 1 tombstones', out.getvalue())
+        self.assertEqual(list(Tombstone.objects.all()), [recent])
+
+        call_command('prune_tombstones', days=0, stdout=out)
+        self.assertFalse(Tombstone.objects.exists())
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.authentication.tests.factories import UserFactory
+from apps.employees.tests.factories import EmployeeFactory
+from apps.employees.models import Employee
+from apps.core.middleware import QueryRecorder, fingerprint
+
+
+class FingerprintTests(TestCase):
+    def test_parameters_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s,%s) AND "n" = 3'),
+            fingerprint('SELECT *  FROM "t" WHERE "id" IN (%s) AND "n" = 42'),
+        )
+        self.assertEqual(fingerprint("SELECT 'a''b', t1.x FROM t1"), "SELECT ?, t1.x FROM t1")
+
+
+class QueryRecorderTests(TestCase):
+    def test_records_repeated_statements(self):
+        employees = [EmployeeFactory() for _ in range(3)]
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for employee in employees:
+                Employee.objects.get(pk=employee.pk)
+        self.assertEqual(recorder.count, 3)
+        self.assertEqual(len(recorder.repeated(3)), 1)
+        self.assertEqual(recorder.repeated(4), [])
+
+
+@override_settings(SQL_INSTRUMENTATION=True)
+class QueryInstrumentationMiddlewareTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserFactory(is_staff=True))
+
+    def test_server_timing_header(self):
+        EmployeeFactory()
+        with self.assertLogs('apps.core.sql', 'INFO') as logs:
+            response = self.client.get(reverse('employee-list'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+        self.assertEqual(logs.records[0].sql['path'], reverse('employee-list'))
+
+    def test_server_timing_is_admin_only(self):
+        self.client.force_authenticate(user=UserFactory())
+        with self.assertLogs('apps.core.sql', 'INFO'):
+            response = self.client.get(reverse('employee-list'))
+        self.assertNotIn('Server-Timing', response)
+
+        self.client.force_authenticate(user=UserFactory(role='admin'))
+        with self.assertLogs('apps.core.sql', 'INFO'):
+            response = self.client.get(reverse('leave-list'))
+        self.assertIn('Server-Timing', response)
+
+    @override_settings(SQL_N_PLUS_ONE_THRESHOLD=1)
+    def test_repeated_statements_are_flagged(self):
+        with self.assertLogs('apps.core.sql', 'WARNING') as logs:
+            self.client.get(reverse('employee-list'))
+        self.assertIn('Possible N+1', logs.output[0])
+
+    @override_settings(SQL_INSTRUMENTATION=False)
+    def test_can_be_disabled(self):
+        response = self.client.get(reverse('employee-list'))
+        self.assertNotIn('Server-Timing', response)
@@ -0,0 +1,70 @@
+from unittest import mock
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from apps.authentication.tests.factories import UserFactory
+from apps.core.compiled import CompiledSerializer, compile_serializer
+from apps.employees.models import Employee
+from apps.employees.serializers import EmployeeSerializer
+from apps.employees.tests.factories import EmployeeFactory
+from apps.leaves.models import Leave, LeaveApproval
+from apps.leaves.serializers import LeaveApprovalSerializer, LeaveSerializer
+from apps.leaves.services import decide
+from apps.leaves.tests.factories import LeaveFactory
+
+
+class CompiledSerializerTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        employees = [EmployeeFactory(created_by=self.user), EmployeeFactory(created_by=None, phone='')]
+        for employee in employees:
+            LeaveFactory(employee=employee)
+        decide(LeaveFactory(employee=employees[0], status='pending'), 'approve', self.user, 'Enjoy')
+
+    def context(self, query=''):
+        return {'request': Request(RequestFactory().get(f'/{query}'))}
+
+    def assertIdentical(self, serializer_class, queryset, query=''):
+        serializer = serializer_class(context=self.context(query))
+        compiled = compile_serializer(serializer)
+        self.assertIsNotNone(compiled)
+        expected = serializer_class(list(queryset), many=True, context=self.context(query)).data
+        self.assertEqual(
+            JSONRenderer().render(compiled.many(compiled.values(queryset))),
+            JSONRenderer().render(expected),
+        )
+
+    def test_output_is_byte_identical(self):
+        self.assertIdentical(EmployeeSerializer, Employee.objects.order_by('id'))
+        self.assertIdentical(EmployeeSerializer, Employee.objects.order_by('id'), '?fields=id,salary,hire_date')
+        self.assertIdentical(LeaveSerializer, Leave.objects.order_by('id'))
+        self.assertIdentical(LeaveSerializer, Leave.objects.order_by('id'), '?fields=duration,status')
+        self.assertIdentical(LeaveSerializer, Leave.objects.order_by('id'), '?duration=working')
+        self.assertIdentical(LeaveApprovalSerializer, LeaveApproval.objects.order_by('id'))
+        with timezone.override('Asia/Kolkata'):
+            self.assertIdentical(EmployeeSerializer, Employee.objects.order_by('id'))
+
+    def test_custom_fields_use_the_serializer(self):
+        for query in ('?expand=employee', '?expand=leave_type'):
+            with self.subTest(query=query):
+                self.assertIsNone(compile_serializer(LeaveSerializer(context=self.context(query))))
+
+    def test_compiled_once_per_field_set(self):
+        first = compile_serializer(LeaveSerializer(context=self.context('?fields=id')))
+        self.assertIs(compile_serializer(LeaveSerializer(context=self.context('?fields=id'))), first)
+        self.assertIsNot(compile_serializer(LeaveSerializer(context=self.context())), first)
+
+    def test_list_views_use_compiled_path(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with mock.patch.object(CompiledSerializer, 'many', autospec=True, side_effect=CompiledSerializer.many) as many:
+            leaves = client.get(reverse('leave-list'))
+            client.get(reverse('employee-list'))
+            client.get(reverse('leaveapproval-list'))
+            self.assertEqual(many.call_count, 3)
+            client.get(reverse('leave-list'), {'expand': 'employee'})
+            self.assertEqual(many.call_count, 3)
+        self.assertEqual(len(leaves.data['data']), Leave.objects.count())
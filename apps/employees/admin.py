@@ -1,8 +1,14 @@
 from django.contrib import admin
-from .models import Employee
+from .models import Department, Employee
 
 @admin.register(Employee)
 class EmployeeAdmin(admin.ModelAdmin):
     list_display = ('first_name', 'last_name', 'email', 'department', 'position', 'hire_date')
     search_fields = ('first_name', 'last_name', 'email', 'department')
-    list_filter = ('department', 'position', 'hire_date')
+    list_filter = ('department_ref', 'position', 'hire_date')
+
+
+@admin.register(Department)
+class DepartmentAdmin(admin.ModelAdmin):
+    list_display = ('name', 'created_at')
+    search_fields = ('name',)
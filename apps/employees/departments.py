@@ -0,0 +1,25 @@
+from .models import Department
+
+
+def resolve_departments(names, create=True):
+    """
+    Map each of ``names`` to its Department, matching case- and
+    whitespace-insensitively. One query finds the existing departments; with
+    ``create`` the missing ones are inserted (two more queries), otherwise
+    they map to None.
+    """
+    names = set(names)
+    keys = {Department.key_for(name) for name in names}
+    found = {department.key: department for department in Department.objects.filter(key__in=keys).order_by()}
+    missing = {}
+    for name in names:
+        key = Department.key_for(name)
+        if key not in found and key not in missing:
+            missing[key] = Department(name=Department.normalize(name), key=key)
+    if missing and create:
+        # ignore_conflicts: a concurrent request may create the same department
+        Department.objects.bulk_create(missing.values(), ignore_conflicts=True)
+        found.update({
+            department.key: department for department in Department.objects.filter(key__in=missing).order_by()
+        })
+    return {name: found.get(Department.key_for(name)) for name in names}
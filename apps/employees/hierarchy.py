@@ -0,0 +1,105 @@
+from django.db.models import Count, Max, Q
+from apps.core.models import Tombstone
+from .models import Employee, ReportingLine
+
+# Tombstone model label marking that a manager's subtree gained or lost
+# people; object_id and scope_id are the manager's employee id
+LINES_CHANGED = ReportingLine._meta.label_lower
+
+
+def subtree(employee_id):
+    """Subquery of the ids of everyone reporting to ``employee_id``, at any depth."""
+    return ReportingLine.objects.filter(ancestor_id=employee_id).values('descendant_id')
+
+
+def subtree_version(employee_id):
+    """
+    (size, latest ``updated_at``) of the subtree under ``employee_id``, for
+    validators of data scoped to it. Changing ``reports_to`` saves the
+    employee, so a report joining moves the timestamp and one leaving
+    shrinks the size.
+    """
+    state = Employee.objects.filter(id__in=subtree(employee_id)).aggregate(size=Count('id'), latest=Max('updated_at'))
+    return state['size'], state['latest']
+
+
+def would_cycle(employee_id, manager_id):
+    """Whether ``manager_id`` is ``employee_id`` or one of their reports."""
+    return manager_id == employee_id or ReportingLine.objects.filter(
+        ancestor_id=employee_id, descendant_id=manager_id
+    ).exists()
+
+
+def record_line_changes(manager_ids):
+    """Mark the subtrees of ``manager_ids`` as changed, for delta-sync clients."""
+    Tombstone.objects.bulk_create([
+        Tombstone(model=LINES_CHANGED, object_id=manager_id, scope_id=manager_id)
+        for manager_id in set(manager_ids)
+    ])
+
+
+def lines_changed_since(employee_id, since):
+    """Whether anyone joined or left the subtree under ``employee_id`` after ``since``."""
+    return Tombstone.objects.filter(model=LINES_CHANGED, scope_id=employee_id, deleted_at__gt=since).exists()
+
+
+def detach(employee_id):
+    """
+    Remove the lines from ``employee_id`` and their reports up to the
+    employee's managers. Returns the ids of those managers.
+    """
+    managers = list(ReportingLine.objects.filter(descendant_id=employee_id).values_list('ancestor_id', flat=True))
+    if managers:
+        ReportingLine.objects.filter(
+            ancestor_id__in=managers,
+        ).filter(
+            Q(descendant_id=employee_id) | Q(descendant_id__in=subtree(employee_id))
+        ).delete()
+    return managers
+
+
+def attach(employee_id, manager_id, has_reports=True):
+    """
+    Add lines from ``employee_id`` and (with ``has_reports``) everyone below
+    them to ``manager_id`` and everyone above. The employee must be detached.
+    Returns the ids of the managers whose subtree grew.
+    """
+    managers = [(manager_id, 0), *ReportingLine.objects.filter(descendant_id=manager_id).values_list('ancestor_id', 'depth')]
+    reports = [(employee_id, 0)]
+    if has_reports:
+        reports += ReportingLine.objects.filter(ancestor_id=employee_id).values_list('descendant_id', 'depth')
+    ReportingLine.objects.bulk_create([
+        ReportingLine(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=up + down + 1)
+        for ancestor_id, up in managers
+        for descendant_id, down in reports
+    ], batch_size=1000)
+    return [ancestor_id for ancestor_id, _ in managers]
+
+
+def rebuild(batch_size=1000):
+    """Recompute every line from ``reports_to``; returns the number of lines."""
+    managers = dict(Employee.objects.filter(reports_to__isnull=False).values_list('id', 'reports_to_id'))
+    chains = {}  # employee id -> managers above them, nearest first
+
+    def chain(employee_id):
+        path, seen, node = [], set(), employee_id
+        while node not in chains and node in managers and node not in seen:
+            path.append(node)
+            seen.add(node)
+            node = managers[node]
+        if not path:
+            return chains.get(employee_id, [])
+        # node is a top-level employee, already resolved, or closes a cycle
+        above = [] if node in seen else [node, *chains.get(node, [])]
+        for member in reversed(path):
+            chains[member] = above
+            above = [member, *above]
+        return chains[employee_id]
+
+    ReportingLine.objects.all().delete()
+    lines = ReportingLine.objects.bulk_create((
+        ReportingLine(ancestor_id=ancestor_id, descendant_id=employee_id, depth=depth)
+        for employee_id in managers
+        for depth, ancestor_id in enumerate(chain(employee_id), start=1)
+    ), batch_size=batch_size)
+    return len(lines)
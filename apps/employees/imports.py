@@ -0,0 +1,239 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import CharField, Q, Value
+from apps.core.imports import ImportFormatError
+from .departments import resolve_departments
+from .models import Employee
+from .serializers import EmployeeSerializer
+from .usernames import allocate_usernames, username_base
+
+User = get_user_model()
+
+# Upper bound on hashing processes for imports run inside a request, whatever
+# EMPLOYEE_IMPORT_HASH_WORKERS says; each one is a full Django process
+MAX_REQUEST_HASH_WORKERS = 4
+
+
+class ImportReport:
+    """Running totals of an import plus one entry per rejected row."""
+
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.errors = []
+
+    def fail(self, row, errors, email=None):
+        self.errors.append({
+            'row': row,
+            'email': email,
+            'errors': {field: [str(error) for error in messages] for field, messages in errors.items()},
+        })
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': self.errors,
+        }
+
+
+def default_password(last_name):
+    # Same initial password as Employee.save
+    return f"{last_name.lower()}123"
+
+
+def _setup_worker():
+    # Spawned (rather than forked) workers start without Django configured
+    import django
+    django.setup()
+
+
+@contextmanager
+def password_hasher(workers, inline_below=0):
+    """
+    Yields a function hashing a list of passwords, on a process pool when
+    ``workers`` > 1 so PBKDF2 runs on every core instead of one. Lists
+    shorter than ``inline_below`` are hashed in this process, and the pool is
+    only started for the first list that is not.
+    """
+    def hash_inline(passwords):
+        return [make_password(password) for password in passwords]
+
+    if workers <= 1:
+        yield hash_inline
+        return
+    executor = None
+
+    def hash_passwords(passwords):
+        nonlocal executor
+        if len(passwords) < inline_below:
+            return hash_inline(passwords)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker)
+        return list(executor.map(
+            make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))
+        ))
+
+    try:
+        yield hash_passwords
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _batches(rows, batch_size, report):
+    """(row number, row) batches; a malformed line ends the import after the rows before it."""
+    batch, number, rows = [], 0, iter(rows)
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            break
+        except ImportFormatError as e:
+            report.fail(number + 1, {'non_field_errors': [str(e)]})
+            break
+        number += 1
+        batch.append((number, row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _taken(emails, usernames):
+    """Emails and usernames already used by a User or Employee, in one query."""
+    users = User.objects.filter(
+        Q(email__in=emails) | Q(username__in=usernames)
+    ).order_by().values_list('email', 'username')
+    employees = Employee.objects.filter(
+        email__in=emails
+    ).order_by().values_list('email', Value(None, output_field=CharField()))
+    taken_emails, taken_usernames = set(), set()
+    for email, username in users.union(employees, all=True):
+        taken_emails.add(email)
+        taken_usernames.add(username)
+    return taken_emails, taken_usernames
+
+
+def _import_batch(batch, created_by, hash_passwords, seen_emails, seen_usernames, report):
+    candidates = []
+    for number, row in batch:
+        if row.get('reports_to') not in (None, ''):
+            # Managers are set afterwards through the API so the reporting lines are kept
+            report.fail(number, {'reports_to': ['Managers cannot be set by an import.']}, row.get('email'))
+            continue
+        serializer = EmployeeSerializer(data={key: value for key, value in row.items() if key != 'reports_to'})
+        if not serializer.is_valid():
+            report.fail(number, serializer.errors, row.get('email'))
+            continue
+        data = dict(serializer.validated_data)
+        # Explicit usernames must be free; derived ones are allocated below
+        username = str(row.get('username') or '').strip() or None
+        if username is not None:
+            try:
+                User._meta.get_field('username').clean(username, None)
+            except ValidationError as e:
+                report.fail(number, {'username': e.messages}, data['email'])
+                continue
+        if data['email'] in seen_emails:
+            report.fail(number, {'email': ['Duplicate email in this import.']}, data['email'])
+        elif username in seen_usernames:
+            report.fail(number, {'username': ['Duplicate username in this import.']}, data['email'])
+        else:
+            seen_emails.add(data['email'])
+            if username is not None:
+                seen_usernames.add(username)
+            password = str(row.get('password') or '') or default_password(data['last_name'])
+            candidates.append((number, data, username, password))
+    if not candidates:
+        return
+
+    taken_emails, taken_usernames = _taken(
+        [data['email'] for _, data, _, _ in candidates],
+        [username for _, _, username, _ in candidates if username is not None],
+    )
+    derived = [index for index, (_, _, username, _) in enumerate(candidates) if username is None]
+    allocated = allocate_usernames(
+        [username_base(candidates[index][1]['first_name'], candidates[index][1]['last_name']) for index in derived],
+        reserved=seen_usernames,
+    )
+    for index, username in zip(derived, allocated):
+        number, data, _, password = candidates[index]
+        candidates[index] = (number, data, username, password)
+    accepted = []
+    for number, data, username, password in candidates:
+        if data['email'] in taken_emails:
+            report.fail(number, {'email': ['An employee or user with this email already exists.']}, data['email'])
+        elif username in taken_usernames:
+            report.fail(number, {'username': ['A user with this username already exists.']}, data['email'])
+        else:
+            accepted.append((number, data, username, password))
+    if not accepted:
+        return
+
+    hashes = hash_passwords([password for _, _, _, password in accepted])
+    try:
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    username=username, email=data['email'], password=hashed,
+                    first_name=data['first_name'], last_name=data['last_name'],
+                    phone=data.get('phone', ''), role='employee',
+                )
+                for (_, data, username, _), hashed in zip(accepted, hashes)
+            ])
+            departments = resolve_departments({data['department'] for _, data, _, _ in accepted})
+            Employee.objects.bulk_create([
+                Employee(
+                    user=user, created_by=created_by,
+                    **{**data, 'department': departments[data['department']].name},
+                    department_ref=departments[data['department']],
+                )
+                for (_, data, _, _), user in zip(accepted, users)
+            ])
+    except DatabaseError as e:
+        # e.g. a concurrent insert took one of the emails after the check
+        for number, data, _, _ in accepted:
+            report.fail(number, {'non_field_errors': [f'Batch rejected by the database: {e}']}, data['email'])
+        return
+    report.created += len(accepted)
+
+
+def import_employees(rows, created_by=None, batch_size=None, workers=None, inline_below=None):
+    """
+    Create employees and their user accounts from an iterable of row dicts.
+
+    Rows are validated with EmployeeSerializer and processed in batches of
+    ``EMPLOYEE_IMPORT_BATCH_SIZE``: one query finds email/username
+    collisions for the whole batch, one more allocates usernames for rows
+    without one (see ``allocate_usernames``), departments are resolved per
+    batch (see ``resolve_departments``), passwords are hashed on
+    ``EMPLOYEE_IMPORT_HASH_WORKERS`` processes (at most one per CPU, none for
+    batches under ``EMPLOYEE_IMPORT_INLINE_HASH_ROWS`` rows) and users and
+    employees are inserted with ``bulk_create`` in one transaction per batch.
+    Rejected rows are reported and skipped; bulk_create sends no post_save
+    signals.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'EMPLOYEE_IMPORT_BATCH_SIZE', 1000)
+    if workers is None:
+        workers = getattr(settings, 'EMPLOYEE_IMPORT_HASH_WORKERS', 2)
+    workers = min(workers, os.cpu_count() or 1)
+    if inline_below is None:
+        inline_below = getattr(settings, 'EMPLOYEE_IMPORT_INLINE_HASH_ROWS', 100)
+
+    report = ImportReport()
+    seen_emails, seen_usernames = set(), set()
+    with password_hasher(workers, inline_below) as hash_passwords:
+        for batch in _batches(rows, batch_size, report):
+            report.total += len(batch)
+            _import_batch(batch, created_by, hash_passwords, seen_emails, seen_usernames, report)
+    return report
@@ -0,0 +1,51 @@
+import time
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from apps.employees.departments import resolve_departments
+from apps.employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = 'Link employees without a department_ref to the Department named by their department text'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0,
+                            help='Seconds to pause between batches to leave room for other writers')
+
+    def handle(self, *args, **options):
+        """
+        Walks the unlinked employees in primary key order, one short
+        transaction per batch, so no table lock is held and an interrupted
+        run simply continues where it stopped when started again.
+        """
+        pending = Employee.objects.filter(department_ref__isnull=True).order_by('id')
+        last_id, linked = 0, 0
+        while True:
+            rows = list(pending.filter(id__gt=last_id).values_list('id', 'department')[:options['batch_size']])
+            if not rows:
+                break
+            departments = resolve_departments({department for _, department in rows})
+            unchanged, renamed = defaultdict(list), defaultdict(list)
+            for employee_id, name in rows:
+                department = departments[name]
+                (unchanged if department.name == name else renamed)[department].append(employee_id)
+
+            with transaction.atomic():
+                for department, ids in unchanged.items():
+                    linked += pending.filter(id__in=ids).update(department_ref=department)
+                # Names normalised to the department's spelling count as an edit for delta sync
+                now = timezone.now()
+                for department, ids in renamed.items():
+                    linked += pending.filter(id__in=ids).update(
+                        department_ref=department, department=department.name, updated_at=now
+                    )
+
+            last_id = rows[-1][0]
+            self.stdout.write(f'Linked {linked} employees (up to id {last_id})')
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled departments for {linked} employees'))
@@ -0,0 +1,49 @@
+import json
+import os
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.imports import IMPORT_CONTENT_TYPES, detect_format, iter_rows
+from apps.employees.imports import import_employees
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create employees and their user accounts from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--input', choices=list(IMPORT_CONTENT_TYPES),
+                            help='File format; detected from the extension by default')
+        parser.add_argument('--created-by', help='Email of the user recorded as creator')
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: CPU count)')
+        parser.add_argument('--report', help='Write the full JSON report to this file')
+
+    def handle(self, *args, **options):
+        input_format = options['input'] or detect_format(options['path'])
+        if input_format is None:
+            raise CommandError('Cannot tell the file format; pass --input csv or --input ndjson')
+
+        created_by = None
+        if options['created_by']:
+            try:
+                created_by = User.objects.get(email=options['created_by'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {options['created_by']}")
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = import_employees(
+                    iter_rows(stream, input_format), created_by=created_by,
+                    batch_size=options['batch_size'], workers=options['workers'] or os.cpu_count() or 1,
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as output:
+                json.dump(report.as_dict(), output, indent=2)
+        for error in report.errors:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(f'Imported {report.created} of {report.total} employees'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.employees import hierarchy
+
+
+class Command(BaseCommand):
+    help = 'Recompute the reporting line closure table from Employee.reports_to'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            lines = hierarchy.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {lines} reporting lines'))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employee_updated_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('key', models.CharField(editable=False, help_text='Case- and whitespace-insensitive form of the name, so typo variants resolve to one department', max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='department_ref',
+            field=models.ForeignKey(blank=True, help_text='Set from department on save; filter and group by this rather than the name', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='employees', to='employees.department'),
+        ),
+    ]
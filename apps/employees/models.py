@@ -1,11 +1,41 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
-from django.utils.text import slugify
+from .usernames import allocate_usernames, username_base
 
 # Create your models here.
 
+class Department(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    key = models.CharField(
+        max_length=100,
+        unique=True,
+        editable=False,
+        help_text="Case- and whitespace-insensitive form of the name, so typo variants resolve to one department"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        return ' '.join(str(name).split())
+
+    @classmethod
+    def key_for(cls, name):
+        return cls.normalize(name).casefold()
+
+    def save(self, *args, **kwargs):
+        self.name = self.normalize(self.name)
+        self.key = self.key_for(self.name)
+        super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ['name']
+
+
 class Employee(models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
@@ -27,6 +57,22 @@ class Employee(models.Model):
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=15, blank=True)
     department = models.CharField(max_length=100)
+    reports_to = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        related_name='direct_reports',
+        help_text="The employee's manager",
+        null=True,
+        blank=True
+    )
+    department_ref = models.ForeignKey(
+        Department,
+        on_delete=models.PROTECT,
+        related_name='employees',
+        help_text="Set from department on save; filter and group by this rather than the name",
+        null=True,
+        blank=True
+    )
     position = models.CharField(max_length=100)
     salary = models.DecimalField(max_digits=10, decimal_places=2)
     hire_date = models.DateField()
@@ -36,16 +82,39 @@ class Employee(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_department = instance.__dict__.get('department')
+        instance._loaded_reports_to = instance.__dict__.get('reports_to_id')
+        instance._loaded_user = instance.__dict__.get('user_id')
+        return instance
+
     def clean(self):
         super().clean()
+        if self.reports_to_id is not None and self.reports_to_id != getattr(self, '_loaded_reports_to', None):
+            from .hierarchy import would_cycle
+            if self.pk is not None and would_cycle(self.pk, self.reports_to_id):
+                raise ValidationError({
+                    'reports_to': "An employee cannot report to themselves or to someone who reports to them."
+                })
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        # department_ref is derived from department below
+        self.full_clean(exclude=['department_ref'])
+
+        if self.department_ref_id is None or self.department != getattr(self, '_loaded_department', None):
+            from .departments import resolve_departments
+            self.department_ref = resolve_departments([self.department])[self.department]
+            self.department = self.department_ref.name
+            self._loaded_department = self.department
+            if kwargs.get('update_fields') is not None and 'department' in kwargs['update_fields']:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'department_ref'}
         
         # Create user account if it doesn't exist
         if not self.user:
             User = get_user_model()
-            username = slugify(f"{self.first_name}{self.last_name}")
+            [username] = allocate_usernames([username_base(self.first_name, self.last_name)])
             password = f"{self.last_name.lower()}123"
             
             # Create the user
@@ -59,8 +128,60 @@ class Employee(models.Model):
                 role='employee'
             )
             self.user = user
-            
-        super().save(*args, **kwargs)
+
+        previous_manager = getattr(self, '_loaded_reports_to', None)
+        if self.reports_to_id == previous_manager:
+            super().save(*args, **kwargs)
+            return
+
+        # Keep the ReportingLine closure in step with the new manager
+        from . import hierarchy
+        with transaction.atomic():
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+            lost = set() if adding else set(hierarchy.detach(self.pk))
+            gained = set()
+            if self.reports_to_id is not None:
+                gained = set(hierarchy.attach(self.pk, self.reports_to_id, has_reports=not adding))
+            # Managers above both the old and the new position see the same
+            # people; a new employee brings no existing rows
+            changed = lost ^ gained if not adding else set()
+            if changed:
+                hierarchy.record_line_changes(changed)
+        self._loaded_reports_to = self.reports_to_id
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Delta sync (?since=) range scans
+            models.Index(fields=['updated_at'], name='employee_updated_at_idx'),
+        ]
+
+
+class ReportingLine(models.Model):
+    """
+    Closure table of ``Employee.reports_to``: one row per (manager, report)
+    pair at every distance, so a whole subtree is one indexed lookup on
+    ``ancestor``. Maintained by Employee.save (see ``hierarchy``).
+    """
+    ancestor = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='report_lines',
+        # Covered by the unique (ancestor, descendant) index
+        db_index=False
+    )
+    descendant = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='manager_lines'
+    )
+    depth = models.PositiveSmallIntegerField(help_text="1 for a direct report, 2 for their reports, ...")
+
+    def __str__(self):
+        return f"{self.descendant_id} reports to {self.ancestor_id} (depth {self.depth})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='reporting_line_unique'),
+        ]
@@ -1,7 +1,10 @@
 from rest_framework import serializers
+from rest_framework.fields import empty
+from apps.core.serializers import SparseFieldsetMixin
+from .hierarchy import would_cycle
 from .models import Employee
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     first_name = serializers.CharField(max_length=100)
     last_name = serializers.CharField(max_length=100)
     email = serializers.EmailField()
@@ -10,6 +13,9 @@ class EmployeeSerializer(serializers.ModelSerializer):
     position = serializers.CharField(max_length=100)
     salary = serializers.DecimalField(max_digits=10, decimal_places=2)
     hire_date = serializers.DateField()
+    reports_to = serializers.PrimaryKeyRelatedField(
+        queryset=Employee.objects.all(), required=False, allow_null=True
+    )
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
@@ -17,7 +23,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = ('id', 'first_name', 'last_name', 'email', 'phone', 'department', 
-                 'position', 'salary', 'hire_date', 'created_by', 'created_at', 'updated_at')
+                 'position', 'salary', 'hire_date', 'reports_to', 'created_by', 'created_at', 'updated_at')
         read_only_fields = ('created_at', 'updated_at', 'created_by')
 
     def validate_email(self, value):
@@ -25,6 +31,13 @@ class EmployeeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Enter a valid email address.")
         return value
 
+    def validate_reports_to(self, value):
+        if value is not None and isinstance(self.instance, Employee) and would_cycle(self.instance.pk, value.pk):
+            raise serializers.ValidationError(
+                "An employee cannot report to themselves or to someone who reports to them."
+            )
+        return value
+
     def validate_salary(self, value):
         if value < 0:
             raise serializers.ValidationError("Salary cannot be negative.")
@@ -32,4 +45,104 @@ class EmployeeSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
-        return super().create(validated_data) 
\ No newline at end of file
+        return super().create(validated_data) 
+
+# Columns the bulk update endpoint may write. Email stays out: it is unique
+# and mirrored on the user account.
+BULK_UPDATE_FIELDS = ('first_name', 'last_name', 'phone', 'department', 'position', 'salary', 'hire_date')
+
+SALARY_OPERATIONS = ('multiply', 'add')
+
+
+def _reject_unknown(data, allowed):
+    if isinstance(data, dict):
+        unknown = sorted(set(data) - set(allowed))
+        if unknown:
+            raise serializers.ValidationError({name: ['This field cannot be used here.'] for name in unknown})
+
+
+def _validate_values(data, extra=()):
+    """Field values checked by EmployeeSerializer's own field validation."""
+    if not isinstance(data, dict):
+        raise serializers.ValidationError('Expected an object of field values.')
+    _reject_unknown(data, (*BULK_UPDATE_FIELDS, *extra))
+    serializer = EmployeeSerializer(data={k: v for k, v in data.items() if k not in extra}, partial=True)
+    serializer.is_valid(raise_exception=True)
+    return dict(serializer.validated_data)
+
+
+class EmployeeFilterSerializer(serializers.Serializer):
+    id__in = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, required=False)
+    department = serializers.CharField(max_length=100, required=False)
+    position = serializers.CharField(max_length=100, required=False)
+    hire_date__gte = serializers.DateField(required=False)
+    hire_date__lte = serializers.DateField(required=False)
+    salary__gte = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    salary__lte = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+
+    def to_internal_value(self, data):
+        _reject_unknown(data, self.fields)
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('Give at least one filter.')
+        return attrs
+
+
+class SalaryAdjustmentSerializer(serializers.Serializer):
+    operation = serializers.ChoiceField(choices=SALARY_OPERATIONS)
+    value = serializers.DecimalField(max_digits=10, decimal_places=4)
+
+    def validate(self, attrs):
+        if attrs['operation'] == 'multiply' and attrs['value'] < 0:
+            raise serializers.ValidationError({'value': ['A salary multiplier cannot be negative.']})
+        return attrs
+
+
+class BulkUpdateSerializer(serializers.Serializer):
+    """
+    Either ``changes``, a list of ``{"id": ..., <field>: <value>}`` objects,
+    or a ``filter`` with ``set`` constants and/or a ``salary`` adjustment.
+    """
+    changes = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=5000, required=False)
+    filter = EmployeeFilterSerializer(required=False)
+    set = serializers.DictField(required=False)
+    salary = SalaryAdjustmentSerializer(required=False)
+
+    def validate_changes(self, changes):
+        validated, errors = {}, {}
+        for index, change in enumerate(changes):
+            try:
+                pk = serializers.IntegerField(min_value=1).run_validation(change.get('id', empty))
+            except serializers.ValidationError as e:
+                errors[index] = {'id': e.detail}
+                continue
+            try:
+                values = _validate_values(change, extra=('id',))
+                if not values:
+                    raise serializers.ValidationError('No fields to update.')
+                if pk in validated:
+                    raise serializers.ValidationError({'id': ['Duplicate id in this request.']})
+            except serializers.ValidationError as e:
+                errors[index] = e.detail
+                continue
+            validated[pk] = values
+        if errors:
+            raise serializers.ValidationError(errors)
+        return validated
+
+    def validate_set(self, values):
+        return _validate_values(values)
+
+    def validate(self, attrs):
+        if 'changes' in attrs:
+            if {'filter', 'set', 'salary'} & set(attrs):
+                raise serializers.ValidationError('Send either changes or a filter, not both.')
+        elif 'filter' not in attrs:
+            raise serializers.ValidationError('Send changes or a filter.')
+        elif not attrs.get('set') and 'salary' not in attrs:
+            raise serializers.ValidationError('Send set values or a salary adjustment with the filter.')
+        elif 'salary' in attrs and 'salary' in attrs.get('set', {}):
+            raise serializers.ValidationError({'set': {'salary': ['Use either set or a salary adjustment.']}})
+        return attrs
@@ -0,0 +1,92 @@
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import DecimalField, F, Q, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+from .departments import resolve_departments
+from .models import Employee
+from .signals import employees_updated
+
+
+def salary_expression(operation, operand):
+    """``F('salary')`` multiplied by or increased by ``operand``, rounded to cents."""
+    salary_field = Employee._meta.get_field('salary')
+    output_field = DecimalField(max_digits=salary_field.max_digits, decimal_places=salary_field.decimal_places)
+    operand = Value(operand, output_field=output_field)
+    if operation == 'multiply':
+        expression = F('salary') * operand
+    elif operation == 'add':
+        expression = F('salary') + operand
+    else:
+        raise ValueError(f"Unknown salary operation '{operation}'")
+    return Round(expression, salary_field.decimal_places, output_field=output_field)
+
+
+def update_employees(changes, batch_size=500):
+    """
+    Apply per-employee field changes, given as ``{id: {field: value}}``.
+
+    One locking read fetches the employees and ``bulk_update`` writes every
+    changed column (plus ``updated_at``) with one ``UPDATE ... CASE`` per
+    ``batch_size`` rows, in a single transaction. Values must already be
+    validated: neither ``full_clean()`` nor ``save()`` runs. Returns the
+    updated employees and the ids that do not exist.
+    """
+    with transaction.atomic():
+        employees = Employee.objects.select_for_update().order_by().in_bulk(list(changes))
+        departments = resolve_departments({
+            changes[pk]['department'] for pk in employees if 'department' in changes[pk]
+        })
+        fields, now = set(), timezone.now()
+        for pk, employee in employees.items():
+            for field, value in changes[pk].items():
+                setattr(employee, field, value)
+            if 'department' in changes[pk]:
+                employee.department_ref = departments[employee.department]
+                employee.department = employee.department_ref.name
+                fields.add('department_ref')
+            employee.updated_at = now
+            fields.update(changes[pk])
+        if employees:
+            Employee.objects.bulk_update(employees.values(), [*sorted(fields), 'updated_at'], batch_size=batch_size)
+            employees_updated.send(sender=Employee, employees=list(employees.values()), fields=fields)
+    return list(employees.values()), [pk for pk in changes if pk not in employees]
+
+
+def update_matching(filters, values=None, salary=None):
+    """
+    Update every employee matching ``filters`` with a single ``UPDATE``.
+
+    ``values`` sets columns to constants and ``salary`` is an
+    ``(operation, operand)`` pair applied as an ``F()`` expression (see
+    ``salary_expression``), e.g. ``('multiply', Decimal('1.03'))`` for a 3%
+    raise. Raises ValidationError, changing nothing, if the expression would
+    take any matching salary below zero or past the column's precision.
+    A ``department`` filter matches the department case-insensitively.
+    Returns the number of updated rows.
+    """
+    updates, filters = dict(values or {}), dict(filters)
+    with transaction.atomic():
+        if 'department' in filters:
+            # An integer match on the foreign key instead of comparing names
+            department = resolve_departments([filters['department']], create=False)[filters.pop('department')]
+            if department is None:
+                return 0
+            filters['department_ref'] = department.pk
+        if 'department' in updates:
+            updates['department_ref'] = resolve_departments([updates['department']])[updates['department']]
+            updates['department'] = updates['department_ref'].name
+        matching = Employee.objects.filter(**filters)
+        if salary is not None:
+            updates['salary'] = salary_expression(*salary)
+            salary_field = Employee._meta.get_field('salary')
+            limit = Decimal(10) ** (salary_field.max_digits - salary_field.decimal_places)
+            out_of_range = matching.annotate(new_salary=updates['salary']).filter(
+                Q(new_salary__lt=0) | Q(new_salary__gte=limit)
+            )
+            if out_of_range.exists():
+                raise ValidationError({'salary': ['The adjustment takes some salaries out of range.']})
+        updated = matching.update(**updates, updated_at=timezone.now())
+        employees_updated.send(sender=Employee, employees=None, fields=set(updates))
+    return updated
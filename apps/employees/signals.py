@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from apps.authentication.authentication import user_cache
+from apps.core.sync import track_deletions
+from . import hierarchy
+from .models import Employee
+
+# Sent by the bulk update services, which bypass post_save. Receives
+# ``employees`` (instances carrying id and every updated field, or None when
+# the rows were updated by filter without being read) and ``fields``, the
+# names of the updated columns.
+employees_updated = Signal()
+
+# Deletion tombstones for ?since= delta sync
+track_deletions(Employee, scope=lambda employee: employee.pk)
+
+
+@receiver(pre_delete, sender=Employee)
+def detach_reports_on_delete(sender, instance, **kwargs):
+    # Direct reports lose their manager (SET_NULL); their subtrees must lose
+    # the lines to the managers above too. Lines through instance cascade.
+    managers = hierarchy.detach(instance.pk)
+    if managers:
+        hierarchy.record_line_changes(managers)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_cached_employee_id(sender, instance, **kwargs):
+    # Cached users carry their employee id; drop both ends of a relink, and
+    # again on commit so a load racing the open transaction is not kept
+    user_ids = {instance.user_id, getattr(instance, '_loaded_user', None)} - {None}
+    instance._loaded_user = instance.user_id
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: [user_cache.invalidate(user_id) for user_id in user_ids])
@@ -0,0 +1,45 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from apps.employees.models import Department, Employee
+from ..factories import EmployeeFactory
+
+
+class BackfillDepartmentsCommandTests(TestCase):
+    def setUp(self):
+        self.employees = [
+            EmployeeFactory(department=department)
+            for department in ('Engineering', 'Sales', 'Engineering', 'Sales')
+        ]
+        # Rows written before department_ref existed, including a typo variant
+        Employee.objects.update(department_ref=None)
+        Employee.objects.filter(pk=self.employees[2].pk).update(department='engineering ')
+        Department.objects.filter(name='Sales').delete()
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('backfill_departments', *args, stdout=out)
+        return out.getvalue()
+
+    def test_links_every_employee_in_batches(self):
+        engineering = Department.objects.get(name='Engineering')
+        before = Employee.objects.get(pk=self.employees[0].pk).updated_at
+
+        output = self.run_command('--batch-size', '3')
+
+        self.assertIn('up to id', output)
+        self.assertIn('Backfilled departments for 4 employees', output)
+        self.assertFalse(Employee.objects.filter(department_ref__isnull=True).exists())
+        self.assertEqual(
+            set(engineering.employees.values_list('department', flat=True)), {'Engineering'}
+        )
+        self.assertEqual(Department.objects.get(name='Sales').employees.count(), 2)
+        # Only the normalised row counts as changed
+        self.assertEqual(Employee.objects.get(pk=self.employees[0].pk).updated_at, before)
+        self.assertGreater(Employee.objects.get(pk=self.employees[2].pk).updated_at, before)
+
+    def test_resumes_with_the_unlinked_rows(self):
+        self.run_command('--batch-size', '2')
+        Employee.objects.filter(pk=self.employees[3].pk).update(department_ref=None)
+
+        self.assertIn('Backfilled departments for 1 employees', self.run_command())
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from apps.authentication.tests.factories import UserFactory
+from apps.employees.models import Employee
+
+
+class ImportEmployeesCommandTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(content)
+        return path
+
+    def run_command(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_employees', *args, '--workers', '1', stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_ndjson_and_writes_report(self):
+        admin = UserFactory(is_staff=True)
+        rows = [
+            {'first_name': 'Ada', 'last_name': 'Lovelace', 'email': 'ada@example.com', 'phone': '555-0100',
+             'department': 'Engineering', 'position': 'Developer', 'salary': 90000, 'hire_date': '2024-01-15'},
+            {'first_name': 'No', 'last_name': 'Email'},
+        ]
+        path = self.write('staff.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        report_path = os.path.join(self.directory.name, 'report.json')
+
+        out, err = self.run_command(path, '--created-by', admin.email, '--report', report_path)
+
+        self.assertIn('Imported 1 of 2 employees', out)
+        self.assertIn('Row 2:', err)
+        self.assertEqual(Employee.objects.get(email='ada@example.com').created_by, admin)
+        with open(report_path, encoding='utf-8') as report:
+            self.assertEqual(json.load(report)['failed'], 1)
+
+    def test_unknown_format(self):
+        path = self.write('staff.txt', '')
+        with self.assertRaises(CommandError):
+            self.run_command(path)
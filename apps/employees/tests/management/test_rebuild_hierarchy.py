@@ -0,0 +1,24 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from apps.employees.models import Employee, ReportingLine
+from ..factories import EmployeeFactory
+
+
+class RebuildHierarchyCommandTests(TestCase):
+    def test_rebuilds_lines_from_reports_to(self):
+        manager = EmployeeFactory()
+        report = EmployeeFactory(reports_to=manager)
+        intern = EmployeeFactory(reports_to=report)
+        # Rows written around Employee.save leave the table stale
+        Employee.objects.filter(pk=report.pk).update(reports_to=None)
+        ReportingLine.objects.create(ancestor=intern, descendant=manager, depth=1)
+
+        out = StringIO()
+        call_command('rebuild_hierarchy', stdout=out)
+
+        self.assertIn('Rebuilt 1 reporting lines', out.getvalue())
+        self.assertEqual(
+            list(ReportingLine.objects.values_list('ancestor_id', 'descendant_id', 'depth')),
+            [(report.pk, intern.pk, 1)],
+        )
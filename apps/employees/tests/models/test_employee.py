@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from apps.employees.models import Employee
+from apps.employees.models import Department, Employee
 from datetime import date
 from ..factories import EmployeeFactory
 from apps.authentication.tests.factories import UserFactory
@@ -53,4 +53,25 @@ class EmployeeModelTest(TestCase):
         # Check ordering
         employees = list(Employee.objects.all())
         self.assertEqual(employees[0], employee2)  # Should be ordered by -created_at
-        self.assertEqual(employees[1], employee1) 
\ No newline at end of file
+        self.assertEqual(employees[1], employee1) 
+
+    def test_same_name_gets_a_free_username(self):
+        first = EmployeeFactory(first_name='John', last_name='Smith', created_by=self.user)
+        second = EmployeeFactory(first_name='John', last_name='Smith', created_by=self.user)
+
+        self.assertEqual(first.user.username, 'johnsmith')
+        self.assertEqual(second.user.username, 'johnsmith2')
+
+    def test_department_is_linked_on_save(self):
+        first = EmployeeFactory(department='Customer Success', created_by=self.user)
+        second = EmployeeFactory(department='  customer   success ', created_by=self.user)
+
+        self.assertEqual(first.department_ref, second.department_ref)
+        self.assertEqual(second.department, 'Customer Success')
+        self.assertEqual(Department.objects.filter(key='customer success').count(), 1)
+
+        second = Employee.objects.get(pk=second.pk)
+        second.department = 'Finance'
+        second.save()
+        self.assertEqual(second.department_ref.name, 'Finance')
+        self.assertEqual(list(first.department_ref.employees.all()), [first])
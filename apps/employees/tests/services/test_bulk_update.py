@@ -0,0 +1,90 @@
+from datetime import date
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from apps.employees.models import Department, Employee
+from apps.employees.services import update_employees, update_matching
+from apps.leaves.intervals import leave_index
+from apps.leaves.tests.factories import LeaveFactory
+from ..factories import EmployeeFactory
+
+
+class UpdateEmployeesTests(TestCase):
+    def setUp(self):
+        self.engineers = [
+            EmployeeFactory(department='Engineering', salary=Decimal('12345.67')),
+            EmployeeFactory(department='Engineering', salary=Decimal('85000.00')),
+        ]
+        self.designer = EmployeeFactory(department='Design', salary=Decimal('70000.00'))
+
+    def test_per_id_changes_in_one_update(self):
+        first, second = self.engineers
+        before = first.updated_at
+        with self.assertNumQueries(7):
+            # savepoint, locking read, department lookup (plus insert and
+            # re-read, as Platform is new), one bulk UPDATE, release
+            employees, not_found = update_employees({
+                first.pk: {'salary': Decimal('90000.00')},
+                second.pk: {'position': 'Lead', 'department': 'Platform'},
+                999999: {'position': 'Ghost'},
+            })
+
+        self.assertEqual(len(employees), 2)
+        self.assertEqual(not_found, [999999])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.salary, Decimal('90000.00'))
+        self.assertGreater(first.updated_at, before)
+        self.assertEqual((second.position, second.department), ('Lead', 'Platform'))
+        self.assertEqual(second.department_ref.name, 'Platform')
+        self.assertEqual(second.salary, Decimal('85000.00'))
+
+    def test_filter_with_salary_expression(self):
+        with self.assertNumQueries(5):
+            # savepoint, department lookup, range check, one UPDATE, release
+            updated = update_matching({'department': 'Engineering'}, salary=('multiply', Decimal('1.03')))
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            sorted(Employee.objects.filter(department='Engineering').values_list('salary', flat=True)),
+            [Decimal('12716.04'), Decimal('87550.00')],
+        )
+        self.designer.refresh_from_db()
+        self.assertEqual(self.designer.salary, Decimal('70000.00'))
+
+    def test_department_filter_and_set_use_the_foreign_key(self):
+        updated = update_matching({'department': ' engineering'}, {'department': 'research  and development'})
+
+        self.assertEqual(updated, 2)
+        research = Department.objects.get(key='research and development')
+        self.assertEqual(set(research.employees.all()), set(self.engineers))
+        self.assertEqual(update_matching({'department': 'Nowhere'}, {'position': 'Ghost'}), 0)
+
+    def test_filter_with_constants(self):
+        updated = update_matching({'department': 'Engineering', 'salary__gte': 50000}, {'position': 'Senior'})
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(Employee.objects.get(position='Senior'), self.engineers[1])
+
+    def test_out_of_range_adjustment_changes_nothing(self):
+        with self.assertRaises(ValidationError):
+            update_matching({'department': 'Engineering'}, salary=('add', Decimal('-20000')))
+
+        self.assertFalse(Employee.objects.filter(salary__lt=0).exists())
+        self.engineers[1].refresh_from_db()
+        self.assertEqual(self.engineers[1].salary, Decimal('85000.00'))
+
+    def test_department_moves_reach_the_leave_index(self):
+        employee = self.engineers[0]
+        LeaveFactory(employee=employee, start_date=date(2024, 1, 1), end_date=date(2024, 1, 2), status='approved')
+        leave_index.rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_employees({employee.pk: {'department': 'Platform'}})
+        platform = Department.objects.get(name='Platform')
+        self.assertEqual(len(leave_index.overlapping(date(2024, 1, 1), date(2024, 1, 2), platform.pk)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_matching({'id__in': [employee.pk]}, {'department': 'Research'})
+        research = Department.objects.get(name='Research')
+        self.assertEqual(len(leave_index.overlapping(date(2024, 1, 1), date(2024, 1, 2), research.pk)), 1)
@@ -0,0 +1,75 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from apps.employees import hierarchy
+from apps.employees.models import Employee, ReportingLine
+from apps.employees.serializers import EmployeeSerializer
+from ..factories import EmployeeFactory
+
+
+def lines():
+    return set(ReportingLine.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+
+
+class ReportingLineTests(TestCase):
+    def setUp(self):
+        # ceo > cto > lead > dev, ceo > cfo
+        self.ceo = EmployeeFactory()
+        self.cto = EmployeeFactory(reports_to=self.ceo)
+        self.cfo = EmployeeFactory(reports_to=self.ceo)
+        self.lead = EmployeeFactory(reports_to=self.cto)
+        self.dev = EmployeeFactory(reports_to=self.lead)
+
+    def assertConsistent(self):
+        maintained = lines()
+        hierarchy.rebuild()
+        self.assertEqual(maintained, lines())
+
+    def org(self, manager):
+        return set(Employee.objects.filter(id__in=hierarchy.subtree(manager.pk)))
+
+    def test_lines_cover_every_depth(self):
+        self.assertEqual(self.org(self.ceo), {self.cto, self.cfo, self.lead, self.dev})
+        self.assertEqual(self.org(self.cto), {self.lead, self.dev})
+        self.assertEqual(ReportingLine.objects.get(ancestor=self.ceo, descendant=self.dev).depth, 3)
+        self.assertConsistent()
+
+    def test_moving_a_manager_moves_their_subtree(self):
+        lead = Employee.objects.get(pk=self.lead.pk)
+        lead.reports_to = self.cfo
+        with self.assertNumQueries(16):
+            # full_clean (including the cycle check) and the user lookup, then
+            # savepoint, update, detach (read, delete), two reads, one insert,
+            # the delta-sync marker insert and release; none of these grow
+            # with the depth of the tree
+            lead.save()
+
+        self.assertEqual(self.org(self.cto), set())
+        self.assertEqual(self.org(self.cfo), {self.lead, self.dev})
+        self.assertEqual(self.org(self.ceo), {self.cto, self.cfo, self.lead, self.dev})
+        self.assertConsistent()
+
+        lead.reports_to = None
+        lead.save()
+        self.assertEqual(self.org(self.ceo), {self.cto, self.cfo})
+        self.assertEqual(self.org(self.lead), {self.dev})
+        self.assertConsistent()
+
+    def test_cycles_are_rejected(self):
+        cto = Employee.objects.get(pk=self.cto.pk)
+        for manager in (self.cto, self.dev):
+            cto.reports_to = manager
+            with self.assertRaises(ValidationError):
+                cto.save()
+
+        serializer = EmployeeSerializer(cto, data={'reports_to': self.dev.pk}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('reports_to', serializer.errors)
+
+    def test_deleting_a_manager_detaches_their_reports(self):
+        self.cto.delete()
+
+        self.lead.refresh_from_db()
+        self.assertIsNone(self.lead.reports_to)
+        self.assertEqual(self.org(self.ceo), {self.cfo})
+        self.assertEqual(self.org(self.lead), {self.dev})
+        self.assertConsistent()
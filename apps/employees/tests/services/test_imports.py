@@ -0,0 +1,115 @@
+import io
+import json
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from apps.authentication.tests.factories import UserFactory
+from apps.core.imports import iter_rows
+from apps.employees.imports import import_employees
+from apps.employees.models import Department, Employee
+from ..factories import EmployeeFactory
+
+User = get_user_model()
+
+HEADER = 'first_name,last_name,email,phone,department,position,salary,hire_date,password,username\n'
+
+
+def row(n, **overrides):
+    values = {
+        'first_name': 'Ada', 'last_name': f'Import{n}', 'email': f'ada{n}@example.com', 'phone': '555-0100',
+        'department': 'Engineering', 'position': 'Developer', 'salary': '90000', 'hire_date': '2024-01-15',
+        'password': '', 'username': '',
+    }
+    values.update(overrides)
+    return values
+
+
+def csv_stream(rows):
+    lines = [HEADER] + [','.join(str(value) for value in r.values()) + '\n' for r in rows]
+    return io.BytesIO(''.join(lines).encode())
+
+
+class ImportEmployeesTests(TestCase):
+    def setUp(self):
+        self.admin = UserFactory(is_staff=True)
+
+    def test_creates_users_and_employees(self):
+        report = import_employees(
+            iter_rows(csv_stream([row(1), row(2, password='Chosen-pass1')]), 'csv'),
+            created_by=self.admin, workers=1,
+        )
+
+        self.assertEqual(report.as_dict(), {'total': 2, 'created': 2, 'failed': 0, 'errors': []})
+        employee = Employee.objects.select_related('user').get(email='ada1@example.com')
+        self.assertEqual(employee.created_by, self.admin)
+        self.assertEqual(employee.user.username, 'adaimport1')
+        self.assertEqual(employee.user.role, 'employee')
+        self.assertEqual(employee.department_ref.name, 'Engineering')
+        self.assertTrue(employee.user.check_password('import1123'))
+        self.assertTrue(User.objects.get(email='ada2@example.com').check_password('Chosen-pass1'))
+
+    def test_reports_rejected_rows(self):
+        EmployeeFactory(email='taken@example.com')
+        UserFactory(username='taken')
+        rows = [
+            row(1),
+            row(2, salary='-5'),
+            row(3, email='ada1@example.com', last_name='Other'),
+            row(4, email='new4@example.com', username='taken'),
+            row(5, email='taken@example.com'),
+            row(6),
+        ]
+        report = import_employees(iter_rows(csv_stream(rows), 'csv'), workers=1)
+
+        self.assertEqual((report.total, report.created), (6, 2))
+        errors = {error['row']: error['errors'] for error in report.errors}
+        self.assertEqual(set(errors), {2, 3, 4, 5})
+        self.assertIn('salary', errors[2])
+        self.assertEqual(errors[3], {'email': ['Duplicate email in this import.']})
+        self.assertIn('username', errors[4])
+        self.assertIn('email', errors[5])
+        self.assertTrue(Employee.objects.filter(email='ada6@example.com').exists())
+
+    def test_derived_usernames_get_numeric_suffixes(self):
+        UserFactory(username='adaimport')
+        EmployeeFactory(first_name='Ada', last_name='Import')
+        rows = [row(n, last_name='Import') for n in range(3)] + [row(3, last_name='Import', username='adaimport5')]
+        report = import_employees(iter_rows(csv_stream(rows), 'csv'), workers=1)
+
+        self.assertEqual(report.created, 4)
+        self.assertEqual(
+            [User.objects.get(email=f'ada{n}@example.com').username for n in range(4)],
+            ['adaimport3', 'adaimport4', 'adaimport6', 'adaimport5'],
+        )
+
+    def test_queries_per_batch_do_not_grow_with_rows(self):
+        Department.objects.create(name='Engineering')
+        with self.assertNumQueries(7):
+            # collision check, username allocation, then atomic: savepoint,
+            # users, department lookup, employees, release
+            report = import_employees(
+                iter_rows(csv_stream([row(n) for n in range(50)]), 'csv'), batch_size=50, workers=1,
+            )
+        self.assertEqual(report.created, 50)
+
+    def test_hashes_on_a_process_pool(self):
+        report = import_employees(iter_rows(csv_stream([row(1), row(2)]), 'csv'), workers=2, inline_below=0)
+
+        self.assertEqual(report.created, 2)
+        self.assertTrue(User.objects.get(email='ada2@example.com').check_password('import2123'))
+
+    def test_small_batches_hash_inline(self):
+        with mock.patch('apps.employees.imports.ProcessPoolExecutor') as pool:
+            report = import_employees(iter_rows(csv_stream([row(1), row(2)]), 'csv'), workers=2, inline_below=3)
+
+        pool.assert_not_called()
+        self.assertEqual(report.created, 2)
+        self.assertTrue(User.objects.get(email='ada2@example.com').check_password('import2123'))
+
+    def test_ndjson_and_malformed_lines(self):
+        lines = json.dumps(row(1)) + '\n\n' + json.dumps(row(2)) + '\nnot json\n' + json.dumps(row(3)) + '\n'
+        report = import_employees(iter_rows(io.BytesIO(lines.encode()), 'ndjson'), workers=1)
+
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.errors[0]['row'], 3)
+        self.assertFalse(Employee.objects.filter(email='ada3@example.com').exists())
@@ -0,0 +1,38 @@
+from django.test import TestCase
+from apps.authentication.tests.factories import UserFactory
+from apps.employees import usernames
+from apps.employees.usernames import allocate_usernames, username_base
+
+
+class UsernameAllocationTests(TestCase):
+    def test_base_is_slugified_and_bounded(self):
+        self.assertEqual(username_base('Mary Ann', "O'Neil"), 'mary-annoneil')
+        self.assertEqual(username_base('李', '雷'), 'employee')
+        self.assertEqual(len(username_base('a' * 100, 'b' * 100)), 140)
+
+    def test_suffixes_skip_taken_names(self):
+        for username in ('johnsmith', 'johnsmith2', 'JohnSmith3', 'johnsmithe', 'johnsmith4x'):
+            UserFactory(username=username)
+
+        with self.assertNumQueries(1):
+            allocated = allocate_usernames(['johnsmith', 'janedoe', 'johnsmith', 'johnsmith'], reserved={'johnsmith4'})
+
+        self.assertEqual(allocated, ['johnsmith3', 'janedoe', 'johnsmith5', 'johnsmith6'])
+
+    def test_one_query_for_many_distinct_bases(self):
+        UserFactory(username='user7')
+        UserFactory(username='user77')
+        bases = [f'user{n}' for n in range(2000)]
+
+        with self.assertNumQueries(1):
+            allocated = allocate_usernames(bases)
+
+        self.assertEqual(len(set(allocated)), 2000)
+        self.assertEqual(allocated[7], 'user72')
+        self.assertEqual(allocated[77], 'user772')
+
+    def test_prefixes_are_bounded(self):
+        bases = {f'{chr(97 + n % 26)}{n}' for n in range(1000)}
+        prefixes = usernames._prefixes(bases)
+        self.assertLessEqual(len(prefixes), usernames.MAX_PREFIXES)
+        self.assertTrue(all(any(base.startswith(prefix) for prefix in prefixes) for base in bases))
@@ -0,0 +1,103 @@
+from datetime import date
+from itertools import count
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from apps.authentication.tests.factories import UserFactory
+from apps.core.testing import QueryBudget, QueryBudgetTestCase
+from apps.employees.models import Employee
+from apps.employees.views import EmployeeViewSet
+from apps.leaves.models import LeaveBalance
+from apps.leaves.tests.factories import LeaveTypeFactory
+from ..factories import EmployeeFactory
+
+User = get_user_model()
+
+sequence = count()
+
+
+def make_employees(test, number):
+    """Bulk-create ``number`` employees, each with its own user account."""
+    numbers = [next(sequence) for _ in range(number)]
+    users = User.objects.bulk_create([
+        User(username=f'budget{n}', email=f'budget{n}@example.com') for n in numbers
+    ])
+    Employee.objects.bulk_create([
+        Employee(user=user, created_by=test.user, first_name='Budget', last_name=str(n),
+                 email=user.email, department='Engineering', position='Developer',
+                 salary=50000, hire_date=date(2024, 1, 1))
+        for user, n in zip(users, numbers)
+    ])
+
+
+def make_balances(test, number):
+    for _ in range(number):
+        LeaveBalance.objects.create(
+            employee=test.employee, leave_type=LeaveTypeFactory(name=f'budget-type-{next(sequence)}'),
+            year=2024,
+        )
+
+
+def payload():
+    n = next(sequence)
+    return {
+        'first_name': 'Budget',
+        'last_name': f'Employee{n}',
+        'email': f'budget.employee{n}@example.com',
+        'phone': '555-123-4567',
+        'department': 'Engineering',
+        'position': 'Developer',
+        'salary': 85000,
+        'hire_date': '2023-02-01',
+    }
+
+
+def import_file():
+    header = ','.join(payload())
+    rows = [','.join(str(value) for value in payload().values()) for _ in range(2)]
+    return '\n'.join([header, *rows])
+
+
+def detail(test, employee=None):
+    return reverse('employee-detail', kwargs={'pk': (employee or test.employee).pk})
+
+
+@override_settings(EMPLOYEE_IMPORT_HASH_WORKERS=1)
+class EmployeeQueryBudgetTests(QueryBudgetTestCase):
+    views = (EmployeeViewSet,)
+    budgets = (
+        QueryBudget(EmployeeViewSet, 'list', 2, populate=make_employees,
+                    request=lambda test, _: test.client.get(reverse('employee-list'))),
+        QueryBudget(EmployeeViewSet, 'retrieve', 2, populate=make_employees,
+                    request=lambda test, _: test.client.get(detail(test))),
+        QueryBudget(EmployeeViewSet, 'create', 6, populate=make_employees, status=201,
+                    request=lambda test, _: test.client.post(reverse('employee-list'), payload(), format='json')),
+        QueryBudget(EmployeeViewSet, 'update', 7, populate=make_employees,
+                    request=lambda test, _: test.client.put(detail(test), payload(), format='json')),
+        QueryBudget(EmployeeViewSet, 'partial_update', 7, populate=make_employees,
+                    request=lambda test, _: test.client.patch(detail(test), {'position': 'Lead'}, format='json')),
+        QueryBudget(EmployeeViewSet, 'destroy', 8, populate=make_employees,
+                    target=lambda test: EmployeeFactory(created_by=test.user, email=f'gone{next(sequence)}@example.com'),
+                    request=lambda test, employee: test.client.delete(detail(test, employee))),
+        QueryBudget(EmployeeViewSet, 'export', 1, populate=make_employees,
+                    request=lambda test, _: test.client.get(reverse('employee-export'))),
+        QueryBudget(EmployeeViewSet, 'import_employees', 7, populate=make_employees,
+                    request=lambda test, _: test.client.generic(
+                        'POST', reverse('employee-import-employees'), import_file(), content_type='text/csv')),
+        QueryBudget(EmployeeViewSet, 'bulk_update', 4, populate=make_employees,
+                    request=lambda test, _: test.client.post(reverse('employee-bulk-update'), {'changes': [
+                        {'id': test.employee.pk, 'position': 'Lead'},
+                        {'id': test.other.pk, 'salary': '90000.00'},
+                    ]}, format='json')),
+        QueryBudget(EmployeeViewSet, 'departments', 1, populate=make_employees,
+                    request=lambda test, _: test.client.get(reverse('employee-departments'))),
+        QueryBudget(EmployeeViewSet, 'balances', 2, populate=make_balances,
+                    request=lambda test, _: test.client.get(
+                        reverse('employee-balances', kwargs={'pk': test.employee.pk}), {'year': 2024})),
+    )
+
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.employee = EmployeeFactory(created_by=self.user)
+        self.other = EmployeeFactory(created_by=self.user)
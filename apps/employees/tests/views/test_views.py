@@ -1,10 +1,17 @@
-from django.test import TestCase
+import json
+from unittest import mock
+from datetime import date, timedelta
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from django.utils import timezone
+from apps.core.sync import make_sync_token
 from apps.employees.models import Employee
 from ..factories import EmployeeFactory
 from apps.authentication.tests.factories import UserFactory
+from apps.leaves.tests.factories import LeaveFactory, LeaveTypeFactory
 
 class EmployeeViewSetTest(TestCase):
     def setUp(self):
@@ -121,4 +128,197 @@ class EmployeeViewSetTest(TestCase):
         response = self.client.delete(
             reverse('employee-detail', kwargs={'pk': self.employee.pk})
         )
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN) 
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN) 
+
+    def test_export_employees_ndjson(self):
+        response = self.client.get(reverse('employee-export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), len(self.employees))
+        self.assertEqual({row['email'] for row in rows}, {e.email for e in self.employees})
+
+    def test_export_employees_csv(self):
+        response = self.client.get(reverse('employee-export'), {'output': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b''.join(response.streaming_content).decode()
+        header = content.splitlines()[0]
+        self.assertTrue(header.startswith('id,user_id,first_name'))
+        self.assertEqual(len(content.splitlines()), len(self.employees) + 1)
+
+    def test_employee_balances(self):
+        leave_type = LeaveTypeFactory(max_days=20)
+        LeaveFactory(employee=self.employee, leave_type=leave_type, status='approved',
+                     start_date=date(2024, 2, 1), end_date=date(2024, 2, 3))
+        LeaveFactory(employee=self.employee, leave_type=leave_type, status='pending',
+                     start_date=date(2024, 3, 1), end_date=date(2024, 3, 1))
+        response = self.client.get(
+            reverse('employee-balances', kwargs={'pk': self.employee.pk}), {'year': 2024}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 1)
+        balance = response.data['data'][0]
+        self.assertEqual(balance['used_days'], 3)
+        self.assertEqual(balance['pending_days'], 1)
+        self.assertEqual(balance['available_days'], 16)
+
+    def test_sparse_fieldset(self):
+        response = self.client.get(reverse('employee-list'), {'fields': 'id,email'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['data'][0]), {'id', 'email'})
+
+    def test_conditional_get(self):
+        url = reverse('employee-detail', kwargs={'pk': self.employee.pk})
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.employee.position = 'Director'
+        self.employee.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['position'], 'Director')
+
+    def test_malformed_pk_is_not_found(self):
+        response = self.client.get(reverse('employee-detail', kwargs={'pk': 'abc'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delta_sync(self):
+        token = make_sync_token(timezone.now())
+        Employee.objects.exclude(pk=self.employee.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.employee.position = 'Director'
+        self.employee.save()
+        removed = self.employees[1].pk
+        self.client.delete(reverse('employee-detail', kwargs={'pk': removed}))
+
+        response = self.client.get(reverse('employee-list'), {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['data']], [self.employee.pk])
+        self.assertEqual(response.data['deleted'], [removed])
+
+
+@override_settings(EMPLOYEE_IMPORT_HASH_WORKERS=1)
+class EmployeeImportViewTest(TestCase):
+    CSV = (
+        'first_name,last_name,email,phone,department,position,salary,hire_date\n'
+        'Ada,Lovelace,ada@example.com,555-0100,Engineering,Developer,90000,2024-01-15\n'
+        'Bad,Salary,bad@example.com,555-0101,Engineering,Developer,-1,2024-01-15\n'
+    )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('employee-import-employees')
+
+    def test_import_multipart_csv(self):
+        upload = SimpleUploadedFile('staff.csv', self.CSV.encode(), content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'Imported 1 of 2 employees')
+        self.assertEqual(response.data['data']['failed'], 1)
+        self.assertEqual(response.data['data']['errors'][0]['row'], 2)
+        self.assertEqual(Employee.objects.get(email='ada@example.com').created_by, self.user)
+
+    def test_import_raw_ndjson_body(self):
+        body = '\n'.join(json.dumps({
+            'first_name': 'Grace', 'last_name': f'Hopper{n}', 'email': f'grace{n}@example.com',
+            'phone': '555-0102', 'department': 'Engineering', 'position': 'Admiral',
+            'salary': 95000, 'hire_date': '2024-02-01',
+        }) for n in range(3))
+        response = self.client.generic('POST', self.url, body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['created'], 3)
+
+    def test_import_rejects_unknown_format(self):
+        response = self.client.generic('POST', self.url, 'a,b\n', content_type='application/xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.generic('POST', f'{self.url}?input=csv', '', content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_reports_unexpected_errors(self):
+        with mock.patch('apps.employees.views.import_employees', side_effect=RuntimeError('pool died')):
+            response = self.client.generic('POST', self.url, self.CSV, content_type='text/csv')
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.data['message'], 'Error importing employees')
+        self.assertEqual(response.data['error'], 'pool died')
+
+    def test_import_requires_staff(self):
+        self.client.force_authenticate(user=UserFactory())
+        response = self.client.generic('POST', self.url, self.CSV, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class EmployeeBulkUpdateViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('employee-bulk-update')
+        self.engineers = [EmployeeFactory(department='Engineering', salary=80000) for _ in range(2)]
+        self.designer = EmployeeFactory(department='Design', salary=60000)
+
+    def test_per_id_changes(self):
+        response = self.client.post(self.url, {'changes': [
+            {'id': self.engineers[0].pk, 'position': 'Staff Engineer'},
+            {'id': self.designer.pk, 'salary': '65000.00'},
+            {'id': 999999, 'position': 'Ghost'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], {'updated': 2, 'not_found': [999999]})
+        self.designer.refresh_from_db()
+        self.assertEqual(str(self.designer.salary), '65000.00')
+
+    def test_filter_with_raise(self):
+        response = self.client.post(self.url, {
+            'filter': {'department': 'Engineering'},
+            'salary': {'operation': 'multiply', 'value': '1.03'},
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], '2 employees updated')
+        self.assertEqual(
+            set(Employee.objects.filter(department='Engineering').values_list('salary', flat=True)),
+            {82400},
+        )
+
+    def test_rejects_invalid_requests(self):
+        payloads = [
+            {},
+            {'changes': [{'id': self.designer.pk, 'email': 'new@example.com'}]},
+            {'changes': [{'id': self.designer.pk, 'salary': '-1'}]},
+            {'changes': [{'position': 'No id'}]},
+            {'filter': {}, 'set': {'position': 'Everyone'}},
+            {'filter': {'departmnt': 'Engineering'}, 'set': {'position': 'Typo'}},
+            {'filter': {'department': 'Engineering'}},
+            {'filter': {'department': 'Engineering'}, 'salary': {'operation': 'add', 'value': '-90000'}},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, payload, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Employee.objects.exclude(salary__in=[80000, 60000]).exists())
+
+
+class EmployeeDepartmentsViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+
+    def test_headcount_per_department(self):
+        for department in ('Engineering', 'engineering', 'Sales'):
+            EmployeeFactory(department=department)
+
+        response = self.client.get(reverse('employee-departments'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['name'], row['headcount']) for row in response.data['data']],
+            [('Engineering', 2), ('Sales', 1)],
+        )
@@ -0,0 +1,77 @@
+import re
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Room left after the base for a numeric suffix
+SUFFIX_DIGITS = 10
+
+# Upper bound on the LIKE clauses of one lookup; SQLite refuses expression
+# trees deeper than 1000 and long OR chains plan badly everywhere
+MAX_PREFIXES = 100
+
+FALLBACK_BASE = 'employee'
+
+
+def username_base(first_name, last_name):
+    """The username an employee gets when it is free: slugified first+last name."""
+    max_length = get_user_model()._meta.get_field('username').max_length
+    return slugify(f"{first_name}{last_name}")[:max_length - SUFFIX_DIGITS] or FALLBACK_BASE
+
+
+def _prefixes(bases):
+    """
+    At most MAX_PREFIXES prefixes covering every base, shortening them all
+    together until enough bases share one.
+    """
+    length = max(len(base) for base in bases)
+    prefixes = set(bases)
+    while len(prefixes) > MAX_PREFIXES and length > 1:
+        length -= 1
+        prefixes = {base[:length] for base in bases}
+    # Drop prefixes another (shorter) prefix already covers
+    kept = []
+    for prefix in sorted(prefixes):
+        if not kept or not prefix.startswith(kept[-1]):
+            kept.append(prefix)
+    return kept
+
+
+def allocate_usernames(bases, reserved=()):
+    """
+    A free username for each of ``bases``, in order: the base itself or the
+    base followed by the lowest free number from 2 up.
+
+    One query fetches every existing username starting with a (shared)
+    prefix of the bases; suffixes are then assigned in memory, so the cost
+    is one query however many names collide. ``reserved`` names count as
+    taken. A concurrent insert can still claim a name between the lookup
+    and the caller's insert, which the unique constraint then rejects.
+    """
+    bases = list(bases)
+    if not bases:
+        return []
+    User = get_user_model()
+    lookup = Q()
+    for prefix in _prefixes(set(bases)):
+        lookup |= Q(username__startswith=prefix)
+    # startswith may be case-insensitive (SQLite LIKE); only exact names matter
+    pattern = re.compile('^(?:%s)[0-9]*$' % '|'.join(map(re.escape, set(bases))))
+    taken = {
+        username for username in User.objects.filter(lookup).order_by().values_list('username', flat=True)
+        if pattern.match(username)
+    }
+    taken.update(reserved)
+
+    allocated, next_suffix = [], {}
+    for base in bases:
+        username, suffix = base, next_suffix.get(base, 2)
+        if username in taken:
+            while f"{base}{suffix}" in taken:
+                suffix += 1
+            username = f"{base}{suffix}"
+            suffix += 1
+        next_suffix[base] = suffix
+        taken.add(username)
+        allocated.append(username)
+    return allocated
@@ -1,17 +1,42 @@
+import logging
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count
 from django.shortcuts import render
+from django.utils import timezone
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
-from .models import Employee
-from .serializers import EmployeeSerializer
+from apps.core.compiled import CompiledListMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.exports import EXPORT_CONTENT_TYPES, EXPORT_FORMAT_PARAM, stream_export
+from apps.core.imports import IMPORT_CONTENT_TYPES, IMPORT_FORMAT_PARAM, detect_format, iter_rows
+from apps.core.sync import DeltaSyncMixin
+from apps.leaves.balances import working_day_totals
+from apps.leaves.models import LeaveBalance
+from apps.leaves.serializers import LeaveBalanceSerializer
+from apps.leaves.workdays import get_default_calculator
+from .imports import MAX_REQUEST_HASH_WORKERS, import_employees
+from .models import Department, Employee
+from .serializers import BulkUpdateSerializer, EmployeeSerializer
+from .services import update_employees, update_matching
+
+logger = logging.getLogger(__name__)
 
 # Create your views here.
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(CompiledListMixin, ConditionalGetMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            return self.get_serializer().optimize_queryset(queryset)
+        return queryset
+
     def get_renderer_context(self):
         context = super().get_renderer_context()
         if getattr(self, 'swagger_fake_view', False):
@@ -84,6 +109,8 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+        if self.is_sync_request(request):
+            return self.sync_list(request, queryset)
         page = self.paginate_queryset(queryset)
         
         if page is not None:
@@ -95,10 +122,134 @@ class EmployeeViewSet(viewsets.ModelViewSet):
                 'data': serializer.data
             })
 
-        serializer = self.get_serializer(queryset, many=True)
+        data = self.serialize_many(queryset)
         if request.accepted_renderer.format in ['api', 'html']:
-            return Response(serializer.data)
+            return Response(data)
         return Response({
             'message': 'Employees retrieved successfully',
-            'data': serializer.data
+            'data': data
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        output = request.query_params.get(EXPORT_FORMAT_PARAM, 'ndjson')
+        if output not in EXPORT_CONTENT_TYPES:
+            return Response({
+                'message': f"Unsupported export format '{output}'",
+                'formats': list(EXPORT_CONTENT_TYPES),
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        return stream_export(
+            queryset,
+            fields=('id', 'user_id', 'first_name', 'last_name', 'email', 'phone', 'department',
+                    'position', 'salary', 'hire_date', 'created_by_id', 'created_at', 'updated_at'),
+            output=output,
+            filename='employees',
+        )
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_employees(self, request):
+        """
+        Create employees (and their user accounts) from a CSV or NDJSON file,
+        sent as the multipart field ``file`` or as the raw request body.
+        """
+        if request.content_type.startswith('multipart/'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({
+                    'message': "Upload the file in the 'file' field"
+                }, status=status.HTTP_400_BAD_REQUEST)
+            stream, name, content_type = upload, upload.name, upload.content_type
+        else:
+            stream, name, content_type = request.stream, '', request.content_type
+
+        input_format = request.query_params.get(IMPORT_FORMAT_PARAM) or detect_format(name, content_type)
+        if input_format not in IMPORT_CONTENT_TYPES:
+            return Response({
+                'message': f"Unsupported import format '{input_format}'",
+                'formats': list(IMPORT_CONTENT_TYPES),
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if stream is None:
+            return Response({
+                'message': 'The import file is empty'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            workers = min(getattr(settings, 'EMPLOYEE_IMPORT_HASH_WORKERS', 2), MAX_REQUEST_HASH_WORKERS)
+            report = import_employees(iter_rows(stream, input_format), created_by=request.user, workers=workers)
+            return Response({
+                'message': f'Imported {report.created} of {report.total} employees',
+                'data': report.as_dict()
+            })
+        except Exception as e:
+            logger.error(f"Error in import_employees: {str(e)}")
+            return Response({
+                'message': 'Error importing employees',
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """
+        Update many employees in one transaction, from per-id ``changes`` or
+        a ``filter`` with ``set`` values and/or a ``salary`` adjustment.
+        """
+        serializer = BulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'message': 'Error updating employees',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        if 'changes' in data:
+            employees, not_found = update_employees(data['changes'])
+            updated = len(employees)
+        else:
+            salary = data.get('salary')
+            try:
+                updated = update_matching(
+                    data['filter'], data.get('set'),
+                    (salary['operation'], salary['value']) if salary else None,
+                )
+            except ValidationError as e:
+                return Response({
+                    'message': 'Error updating employees',
+                    'errors': e.message_dict
+                }, status=status.HTTP_400_BAD_REQUEST)
+            not_found = []
+        return Response({
+            'message': f'{updated} employees updated',
+            'data': {'updated': updated, 'not_found': not_found}
+        })
+
+    @action(detail=False, methods=['get'])
+    def departments(self, request):
+        """Headcount per department, grouped on the department foreign key."""
+        departments = Department.objects.annotate(headcount=Count('employees')).values('id', 'name', 'headcount')
+        return Response({
+            'message': 'Departments retrieved successfully',
+            'data': list(departments)
+        })
+
+    @action(detail=True, methods=['get'])
+    def balances(self, request, pk=None):
+        try:
+            year = int(request.query_params.get('year', timezone.localdate().year))
+        except ValueError:
+            return Response({
+                'message': 'Year must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        employee = self.get_object()
+        balances = list(LeaveBalance.objects.filter(employee=employee, year=year).select_related('leave_type'))
+        if request.query_params.get('duration') == 'working':
+            totals = working_day_totals(employee, year, get_default_calculator())
+            for balance in balances:
+                balance.used_days = totals[balance.leave_type_id]['used_days']
+                balance.pending_days = totals[balance.leave_type_id]['pending_days']
+        return Response({
+            'message': 'Leave balances retrieved successfully',
+            'data': LeaveBalanceSerializer(balances, many=True).data
         })
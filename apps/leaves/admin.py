@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import LeaveType, Leave, LeaveApproval
+from .models import LeaveType, Leave, LeaveApproval, HolidayCalendar, Holiday
 
 @admin.register(LeaveType)
 class LeaveTypeAdmin(admin.ModelAdmin):
@@ -17,3 +17,13 @@ class LeaveAdmin(admin.ModelAdmin):
 class LeaveApprovalAdmin(admin.ModelAdmin):
     list_display = ('leave', 'approver', 'approved_at')
     search_fields = ('leave__employee__first_name', 'leave__employee__last_name', 'comments')
+
+class HolidayInline(admin.TabularInline):
+    model = Holiday
+    extra = 1
+
+@admin.register(HolidayCalendar)
+class HolidayCalendarAdmin(admin.ModelAdmin):
+    list_display = ('name', 'weekmask', 'is_default', 'updated_at')
+    search_fields = ('name', 'description')
+    inlines = [HolidayInline]
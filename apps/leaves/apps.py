@@ -4,3 +4,9 @@ class LeavesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.leaves'
     verbose_name = 'Leave Management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from . import policies  # noqa: F401
+        from apps.core.policies import registry
+        registry.compile()
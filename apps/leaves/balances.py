@@ -0,0 +1,153 @@
+from collections import defaultdict
+from datetime import date
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from .models import Leave, LeaveBalance
+
+# Which ledger column a leave's days count towards, by leave status.
+# Rejected and cancelled leaves do not count at all.
+STATUS_COLUMNS = {
+    'pending': 'pending_days',
+    'approved': 'used_days',
+}
+
+# (employee, leave type, year) keys written per ledger UPDATE
+BATCH_SIZE = 500
+
+
+def days_by_year(start_date, end_date):
+    """Split the calendar days of [start_date, end_date] by year."""
+    days = {}
+    for year in range(start_date.year, end_date.year + 1):
+        first = max(start_date, date(year, 1, 1))
+        last = min(end_date, date(year, 12, 31))
+        days[year] = (last - first).days + 1
+    return days
+
+
+def contributions(employee_id, leave_type_id, start_date, end_date, status, sign=1):
+    """
+    Ledger deltas contributed by one leave, keyed by
+    (employee_id, leave_type_id, year) -> {column: days}.
+    """
+    column = STATUS_COLUMNS.get(status)
+    deltas = defaultdict(lambda: defaultdict(int))
+    if column is None or start_date is None or end_date is None or start_date > end_date:
+        return deltas
+    for year, days in days_by_year(start_date, end_date).items():
+        deltas[(employee_id, leave_type_id, year)][column] += sign * days
+    return deltas
+
+
+def merge(*delta_sets):
+    merged = defaultdict(lambda: defaultdict(int))
+    for deltas in delta_sets:
+        for key, columns in deltas.items():
+            for column, days in columns.items():
+                merged[key][column] += days
+    return merged
+
+
+def apply(deltas):
+    """
+    Apply ledger deltas set-based, in batches of ``BATCH_SIZE`` (employee,
+    leave type, year) keys: one read finds the existing rows, one
+    ``UPDATE ... SET col = col + CASE id WHEN ... END`` adds to all of them
+    and one bulk insert creates the rest. A single key is updated directly.
+    Missing rows are created only when
+    a delta adds days, so deletes cascading from an employee never resurrect
+    rows.
+    """
+    pending = []
+    for key, columns in deltas.items():
+        columns = {column: days for column, days in columns.items() if days}
+        if columns:
+            pending.append((key, columns))
+    for offset in range(0, len(pending), BATCH_SIZE):
+        _apply_batch(dict(pending[offset:offset + BATCH_SIZE]))
+
+
+def _apply_batch(batch):
+    if len(batch) == 1:
+        # A lone key needs no read: update it, and create it if that missed
+        _apply_one(*next(iter(batch.items())))
+        return
+    employee_ids, leave_type_ids, years = (set(part) for part in zip(*batch))
+    # The __in filters may match a few extra rows; only batch keys are kept
+    existing = {
+        (employee_id, leave_type_id, year): pk
+        for pk, employee_id, leave_type_id, year in LeaveBalance.objects.filter(
+            employee_id__in=employee_ids, leave_type_id__in=leave_type_ids, year__in=years,
+        ).order_by().values_list('pk', 'employee_id', 'leave_type_id', 'year')
+        if (employee_id, leave_type_id, year) in batch
+    }
+
+    if existing:
+        changes = {}
+        for column in {column for columns in batch.values() for column in columns}:
+            whens = [
+                When(pk=pk, then=Value(batch[key][column]))
+                for key, pk in existing.items() if batch[key].get(column)
+            ]
+            changes[column] = F(column) + Case(*whens, default=Value(0))
+        LeaveBalance.objects.filter(pk__in=existing.values()).update(**changes, updated_at=timezone.now())
+
+    missing = {
+        key: columns for key, columns in batch.items()
+        if key not in existing and any(days > 0 for days in columns.values())
+    }
+    if not missing:
+        return
+    try:
+        with transaction.atomic():
+            LeaveBalance.objects.bulk_create([
+                LeaveBalance(employee_id=employee_id, leave_type_id=leave_type_id, year=year, **columns)
+                for (employee_id, leave_type_id, year), columns in missing.items()
+            ])
+    except IntegrityError:
+        # Some were created concurrently by another writer; add on top of theirs
+        for key, columns in missing.items():
+            _apply_one(key, columns)
+
+
+def _apply_one(key, columns):
+    employee_id, leave_type_id, year = key
+    lookup = {'employee_id': employee_id, 'leave_type_id': leave_type_id, 'year': year}
+    changes = {column: F(column) + days for column, days in columns.items()}
+    if LeaveBalance.objects.filter(**lookup).update(**changes, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            LeaveBalance.objects.create(**lookup, **columns)
+    except IntegrityError:
+        LeaveBalance.objects.filter(**lookup).update(**changes, updated_at=timezone.now())
+
+
+def record_transition(leaves, from_status, to_status):
+    """Move the days of ``leaves`` from their old status column to the new one."""
+    deltas = [
+        merge(
+            contributions(leave.employee_id, leave.leave_type_id, leave.start_date, leave.end_date, from_status, -1),
+            contributions(leave.employee_id, leave.leave_type_id, leave.start_date, leave.end_date, to_status),
+        )
+        for leave in leaves
+    ]
+    apply(merge(*deltas))
+
+
+def working_day_totals(employee, year, calculator):
+    """
+    Working-day equivalents of the ledger for one employee and year, keyed by
+    leave_type_id -> {column: days}. One query over the year's leaves, with
+    each leave clipped to the year and counted in O(log holidays).
+    """
+    first, last = date(year, 1, 1), date(year, 12, 31)
+    rows = Leave.objects.filter(
+        employee=employee, status__in=list(STATUS_COLUMNS), start_date__lte=last, end_date__gte=first
+    ).values_list('leave_type_id', 'start_date', 'end_date', 'status')
+
+    totals = defaultdict(lambda: defaultdict(int))
+    for leave_type_id, start_date, end_date, status in rows:
+        totals[leave_type_id][STATUS_COLUMNS[status]] += calculator.count(max(start_date, first), min(end_date, last))
+    return totals
@@ -0,0 +1,147 @@
+import threading
+import time
+from datetime import date
+from bisect import bisect_left, bisect_right, insort
+from django.conf import settings
+
+
+class LeaveIntervalIndex:
+    """
+    In-process index of approved leave date ranges for "who is out" queries.
+
+    Intervals are kept in a list sorted by start date. Because no interval is
+    longer than ``_max_span`` days, every interval overlapping [start, end]
+    must begin inside [start - _max_span, end], so a lookup is two bisections
+    plus a scan over that window rather than over the whole year.
+
+    The index is loaded lazily from the (status, start_date, end_date) index,
+    kept current by the Leave/Employee signal handlers in ``signals.py`` and
+    rebuilt after ``LEAVE_INTERVAL_INDEX_TTL`` seconds so writes made by other
+    processes are picked up.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._starts = []          # sorted (start_ordinal, leave_id)
+        self._entries = {}         # leave_id -> (start_ordinal, end_ordinal, employee_id)
+        self._departments = {}     # employee_id -> department id
+        self._unresolved = set()   # employee_ids added without a department
+        self._max_span = 0
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'LEAVE_INTERVAL_INDEX_TTL', 300)
+
+    @property
+    def is_loaded(self):
+        return self._loaded_at is not None
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+            self._reset()
+
+    def rebuild(self):
+        from .models import Leave
+
+        rows = (
+            Leave.objects.filter(status='approved')
+            .order_by()
+            .values_list('id', 'employee_id', 'start_date', 'end_date', 'employee__department_ref_id')
+        )
+        with self._lock:
+            self._reset()
+            for leave_id, employee_id, start_date, end_date, department in rows.iterator(chunk_size=5000):
+                self._insert(leave_id, employee_id, start_date, end_date)
+                self._departments[employee_id] = department
+            self._starts.sort()
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.rebuild()
+
+    def _insert(self, leave_id, employee_id, start_date, end_date):
+        start, end = start_date.toordinal(), end_date.toordinal()
+        self._entries[leave_id] = (start, end, employee_id)
+        self._starts.append((start, leave_id))
+        self._max_span = max(self._max_span, end - start)
+
+    def _remove(self, leave_id):
+        entry = self._entries.pop(leave_id, None)
+        if entry is None:
+            return
+        position = bisect_left(self._starts, (entry[0], leave_id))
+        if position < len(self._starts) and self._starts[position] == (entry[0], leave_id):
+            del self._starts[position]
+
+    def add(self, leave_id, employee_id, start_date, end_date, department_id=None):
+        with self._lock:
+            if not self.is_loaded:
+                return
+            self._remove(leave_id)
+            start, end = start_date.toordinal(), end_date.toordinal()
+            self._entries[leave_id] = (start, end, employee_id)
+            insort(self._starts, (start, leave_id))
+            self._max_span = max(self._max_span, end - start)
+            if department_id is not None:
+                self._departments[employee_id] = department_id
+                self._unresolved.discard(employee_id)
+            elif employee_id not in self._departments:
+                self._unresolved.add(employee_id)
+
+    def discard(self, leave_id):
+        with self._lock:
+            if self.is_loaded:
+                self._remove(leave_id)
+
+    def set_department(self, employee_id, department_id):
+        with self._lock:
+            if employee_id in self._departments:
+                self._departments[employee_id] = department_id
+
+    def _resolve_departments(self):
+        # Entries added without a department (e.g. by bulk updates) are
+        # resolved with one query the first time a department filter runs.
+        from apps.employees.models import Employee
+
+        if self._unresolved:
+            self._departments.update(
+                Employee.objects.filter(id__in=self._unresolved).values_list('id', 'department_ref_id')
+            )
+            self._unresolved.clear()
+
+    def overlapping(self, start_date, end_date, department_id=None):
+        """
+        Return (leave_id, employee_id, start_date, end_date) tuples for approved
+        leaves intersecting [start_date, end_date], optionally for one department
+        (compared by id).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if department_id is not None:
+                self._resolve_departments()
+            start, end = start_date.toordinal(), end_date.toordinal()
+            lo = bisect_left(self._starts, (start - self._max_span,))
+            hi = bisect_right(self._starts, (end, float('inf')))
+
+            results = []
+            for _, leave_id in self._starts[lo:hi]:
+                leave_start, leave_end, employee_id = self._entries[leave_id]
+                if leave_end < start:
+                    continue
+                if department_id is not None and self._departments.get(employee_id) != department_id:
+                    continue
+                results.append((leave_id, employee_id, leave_start, leave_end))
+
+        return [
+            (leave_id, employee_id, date.fromordinal(leave_start), date.fromordinal(leave_end))
+            for leave_id, employee_id, leave_start, leave_end in results
+        ]
+
+
+leave_index = LeaveIntervalIndex()
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+LIST_MESSAGE = 'Leave types retrieved successfully'
+
+# Unknown ids trigger a reload at most this often (seconds)
+MISS_RELOAD_INTERVAL = 1
+
+
+class LeaveTypeCache:
+    """
+    In-process, versioned snapshot of every LeaveType.
+
+    Leave types change a few times a year, so the whole table is loaded in one
+    query and kept as model instances, their serialized representations and
+    the fully rendered list response body. ``version`` is a fingerprint of that
+    body, identical across processes holding the same data, and serves as the
+    ETag validator. The snapshot is dropped by the LeaveType signal handlers in
+    ``signals.py`` and reloaded after ``LEAVE_TYPE_CACHE_TTL`` seconds so edits
+    made by other processes are picked up.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._instances = {}
+        self._representations = {}
+        self._list_body = b''
+        self._version = ''
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'LEAVE_TYPE_CACHE_TTL', 300)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def reload(self):
+        from .models import LeaveType
+        from .serializers import LeaveTypeSerializer
+
+        # Loading under the lock means an invalidation can never be lost to a
+        # load that read the table before the write
+        with self._lock:
+            leave_types = list(LeaveType.objects.all())
+            data = LeaveTypeSerializer(leave_types, many=True).data
+            body = JSONRenderer().render({'message': LIST_MESSAGE, 'data': data})
+            self._instances = {leave_type.pk: leave_type for leave_type in leave_types}
+            self._representations = {item['id']: item for item in data}
+            self._list_body = body
+            self._version = hashlib.md5(body, usedforsecurity=False).hexdigest()
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.reload()
+
+    @property
+    def version(self):
+        with self._lock:
+            self._ensure_loaded()
+            return self._version
+
+    def list_body(self):
+        """JSON bytes of the default list response."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._list_body
+
+    def _lookup(self, entries, leave_type_id):
+        with self._lock:
+            self._ensure_loaded()
+            if leave_type_id not in entries() and time.monotonic() - self._loaded_at > MISS_RELOAD_INTERVAL:
+                # Possibly created by another process since the last load
+                self.reload()
+            return entries().get(leave_type_id)
+
+    def get(self, leave_type_id):
+        """The cached LeaveType instance; treat it as read-only."""
+        return self._lookup(lambda: self._instances, leave_type_id)
+
+    def representation(self, leave_type_id):
+        """LeaveTypeSerializer output for one leave type, or None if unknown."""
+        data = self._lookup(lambda: self._representations, leave_type_id)
+        return dict(data) if data is not None else None
+
+
+leave_type_cache = LeaveTypeCache()
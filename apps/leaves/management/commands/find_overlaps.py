@@ -0,0 +1,58 @@
+import heapq
+from itertools import groupby
+from operator import itemgetter
+from django.core.management.base import BaseCommand
+from apps.leaves.models import Leave
+
+
+def sweep(leaves):
+    """
+    Yield overlapping (earlier, later) pairs from one employee's leaves.
+
+    ``leaves`` must be (id, start_date, end_date) tuples sorted by start date.
+    Leaves still running are kept in a min-heap keyed by end date, so each leave
+    is pushed and popped once and only genuinely overlapping pairs are visited.
+    """
+    active = []
+    for leave in leaves:
+        _, start_date, _ = leave
+        while active and active[0][0] < start_date:
+            heapq.heappop(active)
+        for _, other in active:
+            yield other, leave
+        heapq.heappush(active, (leave[2], leave))
+
+
+class Command(BaseCommand):
+    help = 'Report leaves that overlap another leave of the same employee'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employee', type=int, help='Only check this employee id')
+        parser.add_argument(
+            '--include-inactive', action='store_true',
+            help='Also consider rejected and cancelled leaves',
+        )
+
+    def handle(self, *args, **options):
+        leaves = Leave.objects.all()
+        if not options['include_inactive']:
+            leaves = leaves.exclude(status__in=Leave.INACTIVE_STATUSES)
+        if options['employee']:
+            leaves = leaves.filter(employee_id=options['employee'])
+        rows = (
+            leaves.order_by('employee_id', 'start_date', 'id')
+            .values_list('employee_id', 'id', 'start_date', 'end_date')
+            .iterator(chunk_size=5000)
+        )
+
+        found = 0
+        for employee_id, group in groupby(rows, key=itemgetter(0)):
+            for first, second in sweep(row[1:] for row in group):
+                found += 1
+                self.stdout.write(
+                    f'employee {employee_id}: leave {first[0]} ({first[1]} to {first[2]}) '
+                    f'overlaps leave {second[0]} ({second[1]} to {second[2]})'
+                )
+
+        style = self.style.WARNING if found else self.style.SUCCESS
+        self.stdout.write(style(f'{found} overlapping leave pairs found'))
@@ -0,0 +1,57 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import ExtractYear
+from apps.leaves.balances import STATUS_COLUMNS, contributions, merge
+from apps.leaves.models import Leave, LeaveBalance
+
+
+class Command(BaseCommand):
+    help = 'Recompute the leave balance ledger from the leaves table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        totals = defaultdict(lambda: defaultdict(int))
+        counted = Leave.objects.filter(status__in=list(STATUS_COLUMNS))
+
+        # Leaves within one calendar year are summed entirely in the database:
+        # days = SUM(end_date - start_date) + COUNT(*)
+        same_year = (
+            counted.annotate(year=ExtractYear('start_date'), end_year=ExtractYear('end_date'))
+            .filter(year=F('end_year'))
+            .order_by()
+            .values('employee_id', 'leave_type_id', 'year', 'status')
+            .annotate(
+                span=Sum(ExpressionWrapper(F('end_date') - F('start_date'), output_field=DurationField())),
+                leaves=Count('id'),
+            )
+        )
+        for row in same_year:
+            key = (row['employee_id'], row['leave_type_id'], row['year'])
+            totals[key][STATUS_COLUMNS[row['status']]] += row['span'].days + row['leaves']
+
+        # The few leaves spanning New Year are split per year in Python
+        spanning = (
+            counted.annotate(year=ExtractYear('start_date'), end_year=ExtractYear('end_date'))
+            .exclude(year=F('end_year'))
+            .values_list('employee_id', 'leave_type_id', 'start_date', 'end_date', 'status')
+        )
+        totals = merge(totals, *(contributions(*row) for row in spanning.iterator()))
+
+        with transaction.atomic():
+            LeaveBalance.objects.all().delete()
+            LeaveBalance.objects.bulk_create(
+                (
+                    LeaveBalance(
+                        employee_id=employee_id, leave_type_id=leave_type_id, year=year,
+                        used_days=columns.get('used_days', 0), pending_days=columns.get('pending_days', 0),
+                    )
+                    for (employee_id, leave_type_id, year), columns in totals.items()
+                ),
+                batch_size=options['batch_size'],
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(totals)} leave balance rows'))
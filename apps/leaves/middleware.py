@@ -2,35 +2,21 @@ from django.http import HttpResponseForbidden
 from django.urls import resolve
 from functools import wraps
 from rest_framework.permissions import BasePermission
+from apps.authentication.principal import get_principal
+from apps.core.policies import registry
 
 class EmployeeRolePermission(BasePermission):
     """
     Custom permission class for role-based access control.
+
+    Decisions come from the policy table in ``apps.leaves.policies``. Row
+    ownership is enforced by scoping ``get_queryset`` with the same rule, so
+    any object a view can load is one the caller may access.
     """
     def has_permission(self, request, view):
-        # Admin users can access everything
-        if request.user.is_authenticated and (request.user.is_admin() or request.user.is_staff):
-            return True
-
-        # Allow all authenticated users to view leave types and leave approvals
-        if view.action in ['list', 'retrieve'] and view.__class__.__name__ in ['LeaveTypeViewSet', 'LeaveApprovalViewSet']:
-            return request.user.is_authenticated
-
-        # For LeaveViewSet, employees can perform all actions on their own leaves
-        if view.__class__.__name__ == 'LeaveViewSet':
-            if view.action in ['create', 'list', 'retrieve', 'update', 'partial_update']:
-                return request.user.is_authenticated and hasattr(request.user, 'employee_profile')
-            return False
-
-        return False
+        principal = get_principal(request)
+        return registry.rule_for(view, principal).permits(principal)
 
     def has_object_permission(self, request, view, obj):
-        # Admin users can access everything
-        if request.user.is_authenticated and (request.user.is_admin() or request.user.is_staff):
-            return True
-
-        # For leaves, employees can only access their own leaves
-        if view.__class__.__name__ == 'LeaveViewSet':
-            return obj.employee.user == request.user
-
-        return False 
\ No newline at end of file
+        principal = get_principal(request)
+        return registry.rule_for(view, principal).permits(principal)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_employee_user'),
+        ('leaves', '0004_delete_leavebalance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['-created_at', '-id'], name='leave_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_employee_user'),
+        ('leaves', '0005_leave_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['status', 'start_date', 'end_date'], name='leave_status_dates_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_employee_user'),
+        ('leaves', '0006_leave_status_dates_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('used_days', models.IntegerField(default=0)),
+                ('pending_days', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_balances', to='employees.employee')),
+                ('leave_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='leaves.leavetype')),
+            ],
+            options={
+                'ordering': ['-year', 'leave_type'],
+                'unique_together': {('employee', 'leave_type', 'year')},
+            },
+        ),
+    ]
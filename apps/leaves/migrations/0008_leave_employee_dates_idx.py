@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_employee_user'),
+        ('leaves', '0007_leavebalance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['employee', 'start_date', 'end_date'], name='leave_employee_dates_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:55
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0008_leave_employee_dates_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HolidayCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('weekmask', models.CharField(default='1111100', help_text='Working days Monday to Sunday as 1/0 flags, e.g. 1111100', max_length=7, validators=[django.core.validators.RegexValidator('^[01]{7}$', 'Use seven 0/1 flags, Monday first')])),
+                ('is_default', models.BooleanField(default=False, help_text='Calendar used for working-day durations')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('name', models.CharField(max_length=100)),
+                ('calendar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holidays', to='leaves.holidaycalendar')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('calendar', 'date')},
+            },
+        ),
+    ]
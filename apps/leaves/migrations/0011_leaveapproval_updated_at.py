@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0010_leave_updated_at_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaveapproval',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='leaveapproval',
+            index=models.Index(fields=['updated_at'], name='approval_updated_at_idx'),
+        ),
+    ]
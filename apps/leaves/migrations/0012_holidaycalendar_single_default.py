@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+def keep_one_default(apps, schema_editor):
+    # Keep the oldest default calendar so the constraint can be added
+    HolidayCalendar = apps.get_model('leaves', 'HolidayCalendar')
+    defaults = HolidayCalendar.objects.filter(is_default=True).order_by('pk').values_list('pk', flat=True)
+    HolidayCalendar.objects.filter(pk__in=list(defaults[1:])).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0011_leaveapproval_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_one_default, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='holidaycalendar',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('is_default',), name='holiday_calendar_single_default'),
+        ),
+    ]
@@ -1,9 +1,14 @@
 from .leave_types import LeaveType
 from .leaves import Leave
 from .leave_approvals import LeaveApproval
+from .leave_balances import LeaveBalance
+from .holidays import HolidayCalendar, Holiday
 
 __all__ = [
     'LeaveType',
     'Leave',
     'LeaveApproval',
+    'LeaveBalance',
+    'HolidayCalendar',
+    'Holiday',
 ] 
\ No newline at end of file
@@ -0,0 +1,50 @@
+from django.core.validators import RegexValidator
+from django.db import models, transaction
+from django.utils import timezone
+
+class HolidayCalendar(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True)
+    weekmask = models.CharField(
+        max_length=7,
+        default='1111100',
+        validators=[RegexValidator(r'^[01]{7}$', 'Use seven 0/1 flags, Monday first')],
+        help_text="Working days Monday to Sunday as 1/0 flags, e.g. 1111100",
+    )
+    is_default = models.BooleanField(default=False, help_text="Calendar used for working-day durations")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.is_default:
+                # Making a calendar the default demotes the previous one
+                HolidayCalendar.objects.filter(is_default=True).exclude(pk=self.pk).update(
+                    is_default=False, updated_at=timezone.now()
+                )
+            super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ['name']
+        constraints = [
+            # The working-day calculator and its ETag read "the" default calendar
+            models.UniqueConstraint(
+                fields=['is_default'], condition=models.Q(is_default=True), name='holiday_calendar_single_default',
+            ),
+        ]
+
+
+class Holiday(models.Model):
+    calendar = models.ForeignKey(HolidayCalendar, on_delete=models.CASCADE, related_name='holidays')
+    date = models.DateField()
+    name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return f"{self.name} ({self.date})"
+
+    class Meta:
+        ordering = ['date']
+        unique_together = ('calendar', 'date')
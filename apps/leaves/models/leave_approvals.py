@@ -7,6 +7,14 @@ class LeaveApproval(models.Model):
     approver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='approved_leaves')
     comments = models.TextField(blank=True)
     approved_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"Approval for {self.leave} by {self.approver}" 
\ No newline at end of file
+        return f"Approval for {self.leave} by {self.approver}"
+
+    class Meta:
+        indexes = [
+            # Delta sync (?since=) range scans
+            models.Index(fields=['updated_at'], name='approval_updated_at_idx'),
+        ]
+ 
\ No newline at end of file
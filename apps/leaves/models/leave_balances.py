@@ -0,0 +1,22 @@
+from django.db import models
+from apps.employees.models import Employee
+from .leave_types import LeaveType
+
+class LeaveBalance(models.Model):
+    """
+    Materialized per-year leave usage, maintained incrementally by
+    ``apps.leaves.balances`` and rebuilt with ``manage.py rebuild_balances``.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='leave_balances')
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.CASCADE, related_name='balances')
+    year = models.PositiveIntegerField()
+    used_days = models.IntegerField(default=0)
+    pending_days = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.employee} - {self.leave_type} ({self.year})"
+
+    class Meta:
+        ordering = ['-year', 'leave_type']
+        unique_together = ('employee', 'leave_type', 'year')
@@ -9,6 +9,8 @@ class Leave(models.Model):
         ('rejected', 'Rejected'),
         ('cancelled', 'Cancelled'),
     ]
+    # Statuses that no longer block the employee's calendar
+    INACTIVE_STATUSES = ('rejected', 'cancelled')
 
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='leaves')
     leave_type = models.ForeignKey(LeaveType, on_delete=models.CASCADE, related_name='leaves')
@@ -26,5 +28,21 @@ class Leave(models.Model):
     def duration(self):
         return (self.end_date - self.start_date).days + 1
 
+    @property
+    def working_days(self):
+        """Duration excluding weekends and holidays of the default HolidayCalendar."""
+        from ..workdays import get_default_calculator
+        return get_default_calculator().count(self.start_date, self.end_date)
+
     class Meta:
-        ordering = ['-created_at'] 
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Matches LeaveCursorPagination.ordering for keyset page seeks
+            models.Index(fields=['-created_at', '-id'], name='leave_created_id_idx'),
+            # Range probes for "who is out" over approved leaves
+            models.Index(fields=['status', 'start_date', 'end_date'], name='leave_status_dates_idx'),
+            # Per-employee overlap probes
+            models.Index(fields=['employee', 'start_date', 'end_date'], name='leave_employee_dates_idx'),
+            # MAX(updated_at) for conditional GET validators and ?since= delta sync
+            models.Index(fields=['updated_at'], name='leave_updated_at_idx'),
+        ] 
\ No newline at end of file
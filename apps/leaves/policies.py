@@ -0,0 +1,23 @@
+from apps.core.policies import ADMIN, ALLOW, ANY_ACTION, EMPLOYEE, own, own_or_managed, registry
+from .views import LeaveApprovalViewSet, LeaveTypeViewSet, LeaveViewSet
+
+# Who may do what in the leaves API. Admins (role 'admin' or staff) may do
+# everything; employees only reach their own leaves and approvals, and may
+# read the leaves of the people reporting to them.
+registry.register(LeaveViewSet, {
+    ADMIN: {ANY_ACTION: ALLOW},
+    EMPLOYEE: {
+        ('create', 'update', 'partial_update'): own('employee_id'),
+        ('list', 'retrieve'): own_or_managed('employee_id'),
+    },
+})
+
+registry.register(LeaveTypeViewSet, {
+    ADMIN: {ANY_ACTION: ALLOW},
+    EMPLOYEE: {('list', 'retrieve'): ALLOW},
+})
+
+registry.register(LeaveApprovalViewSet, {
+    ADMIN: {ANY_ACTION: ALLOW},
+    EMPLOYEE: {('list', 'retrieve'): own('leave__employee_id')},
+})
@@ -1,9 +1,12 @@
 from .leave_types import LeaveTypeSerializer
-from .leaves import LeaveSerializer
+from .leaves import LeaveSerializer, BulkDecisionSerializer
 from .leave_approvals import LeaveApprovalSerializer
+from .leave_balances import LeaveBalanceSerializer
 
 __all__ = [
     'LeaveTypeSerializer',
     'LeaveSerializer',
+    'BulkDecisionSerializer',
     'LeaveApprovalSerializer',
+    'LeaveBalanceSerializer',
 ] 
\ No newline at end of file
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from ..models import LeaveApproval
 from apps.authentication.serializers import UserSerializer
 
-class LeaveApprovalSerializer(serializers.ModelSerializer):
+class LeaveApprovalSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     approver_details = UserSerializer(source='approver', read_only=True)
     comments = serializers.CharField(max_length=500, required=False, allow_blank=True)
     approved_at = serializers.DateTimeField(read_only=True)
@@ -11,6 +12,9 @@ class LeaveApprovalSerializer(serializers.ModelSerializer):
         model = LeaveApproval
         fields = ['id', 'leave', 'approver', 'approver_details', 'comments', 'approved_at']
         read_only_fields = ('approved_at', 'approver_details', 'approver')
+        expandable_fields = {
+            'approver': 'approver_details',
+        }
 
     def create(self, validated_data):
         validated_data['approver'] = self.context['request'].user
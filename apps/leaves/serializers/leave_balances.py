@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from ..models import LeaveBalance
+
+class LeaveBalanceSerializer(serializers.ModelSerializer):
+    leave_type_name = serializers.CharField(source='leave_type.name', read_only=True)
+    max_days = serializers.IntegerField(source='leave_type.max_days', read_only=True)
+    available_days = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LeaveBalance
+        fields = ('leave_type', 'leave_type_name', 'year', 'max_days', 'used_days',
+                  'pending_days', 'available_days', 'updated_at')
+        read_only_fields = fields
+
+    def get_available_days(self, obj):
+        return obj.leave_type.max_days - obj.used_days - obj.pending_days
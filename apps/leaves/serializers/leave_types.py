@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from ..leave_type_cache import leave_type_cache
 from ..models import LeaveType
 
 class LeaveTypeSerializer(serializers.ModelSerializer):
@@ -16,4 +17,17 @@ class LeaveTypeSerializer(serializers.ModelSerializer):
     def validate_max_days(self, value):
         if value < 0:
             raise serializers.ValidationError("Maximum days cannot be negative")
-        return value 
\ No newline at end of file
+        return value 
+
+
+class CachedLeaveTypeField(serializers.Field):
+    """
+    Read-only nested leave type rendered from ``leave_type_cache``. Use the
+    foreign key column as ``source`` so the queryset needs no join.
+    """
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return leave_type_cache.representation(value)
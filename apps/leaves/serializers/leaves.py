@@ -1,11 +1,15 @@
 from rest_framework import serializers
-from ..models import Leave
+from apps.core.serializers import SparseFieldsetMixin
+from ..balances import contributions, days_by_year
+from ..models import Leave, LeaveBalance
 from apps.employees.serializers import EmployeeSerializer
-from .leave_types import LeaveTypeSerializer
+from .leave_types import CachedLeaveTypeField
+from ..services import DECISIONS
 
-class LeaveSerializer(serializers.ModelSerializer):
+class LeaveSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     employee_details = EmployeeSerializer(source='employee', read_only=True)
-    leave_type_details = LeaveTypeSerializer(source='leave_type', read_only=True)
+    # Served from the in-process leave type cache instead of a join
+    leave_type_details = CachedLeaveTypeField(source='leave_type_id')
     duration = serializers.IntegerField(read_only=True)
     start_date = serializers.DateField()
     end_date = serializers.DateField()
@@ -20,12 +24,101 @@ class LeaveSerializer(serializers.ModelSerializer):
                  'start_date', 'end_date', 'reason', 'status', 'duration', 
                  'created_at', 'updated_at')
         read_only_fields = ('created_at', 'updated_at', 'status', 'duration')
+        expandable_fields = {
+            'employee': 'employee_details',
+            'leave_type': 'leave_type_details',
+        }
+        field_dependencies = {
+            'duration': ('start_date', 'end_date'),
+        }
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # ?duration=working reports working days (default HolidayCalendar)
+        request = self.context.get('request')
+        if 'duration' in fields and request is not None and request.query_params.get('duration') == 'working':
+            fields['duration'] = serializers.IntegerField(source='working_days', read_only=True)
+        return fields
 
     def validate(self, data):
-        if data['start_date'] > data['end_date']:
+        # Partial updates fall back to the stored values
+        def resolve(field):
+            return data.get(field, getattr(self.instance, field, None))
+
+        start_date, end_date = resolve('start_date'), resolve('end_date')
+        if start_date and end_date and start_date > end_date:
             raise serializers.ValidationError("End date must be after start date")
+
+        if self.instance is None or {'employee', 'start_date', 'end_date'} & data.keys():
+            self.check_overlap(resolve('employee'), start_date, end_date)
+        if self.instance is None or {'employee', 'leave_type', 'start_date', 'end_date'} & data.keys():
+            self.check_max_days(resolve('employee'), resolve('leave_type'), start_date, end_date)
         return data
 
+    def check_overlap(self, employee, start_date, end_date):
+        """
+        Reject leaves intersecting another active leave of the same employee
+        with a single EXISTS probe on (employee_id, start_date, end_date).
+        """
+        if not (employee and start_date and end_date):
+            return
+        overlapping = Leave.objects.filter(
+            employee=employee, start_date__lte=end_date, end_date__gte=start_date
+        ).exclude(status__in=Leave.INACTIVE_STATUSES)
+        if self.instance is not None:
+            overlapping = overlapping.exclude(pk=self.instance.pk)
+        if overlapping.exists():
+            raise serializers.ValidationError("Leave overlaps an existing leave for this employee")
+
+    def check_max_days(self, employee, leave_type, start_date, end_date):
+        """
+        Reject leaves that would take the employee over ``leave_type.max_days``
+        in any calendar year, using the LeaveBalance counters (one indexed
+        lookup) instead of summing the employee's leave history.
+        """
+        if not (employee and leave_type and start_date and end_date):
+            return
+        requested = days_by_year(start_date, end_date)
+        booked = {
+            year: used + pending
+            for year, used, pending in LeaveBalance.objects.filter(
+                employee=employee, leave_type=leave_type, year__in=list(requested)
+            ).values_list('year', 'used_days', 'pending_days')
+        }
+
+        # On update the leave's own days are already counted in the ledger
+        if self.instance is not None:
+            own = contributions(
+                self.instance.employee_id, self.instance.leave_type_id,
+                self.instance.start_date, self.instance.end_date, self.instance.status,
+            )
+            for (employee_id, leave_type_id, year), columns in own.items():
+                if employee_id == employee.pk and leave_type_id == leave_type.pk:
+                    booked[year] = booked.get(year, 0) - sum(columns.values())
+
+        for year, days in sorted(requested.items()):
+            remaining = leave_type.max_days - booked.get(year, 0)
+            if days > remaining:
+                raise serializers.ValidationError(
+                    f"{leave_type.name} is limited to {leave_type.max_days} days per year; "
+                    f"{max(remaining, 0)} days remaining in {year}, {days} requested"
+                )
+
     def create(self, validated_data):
         validated_data['status'] = 'pending'
-        return super().create(validated_data) 
\ No newline at end of file
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        # Write only the submitted columns; status changes go through services.transition
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance 
+
+
+class BulkDecisionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000
+    )
+    decision = serializers.ChoiceField(choices=list(DECISIONS))
+    comments = serializers.CharField(max_length=500, required=False, allow_blank=True, default='')
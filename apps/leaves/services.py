@@ -0,0 +1,128 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import Leave, LeaveApproval
+from .signals import leave_status_changed
+
+# Decision verbs accepted by the API mapped to the resulting leave status
+DECISIONS = {
+    'approve': 'approved',
+    'reject': 'rejected',
+}
+
+
+def transition(leave, to_status, from_status='pending'):
+    """
+    Move ``leave`` from ``from_status`` to ``to_status`` atomically.
+
+    Issues ``UPDATE ... SET status, updated_at WHERE id = %s AND status = %s``
+    and uses the affected row count as the compare-and-swap result, so two
+    concurrent callers can never both win and no row or table lock is taken.
+    Only the two changed columns are written. Returns True if this call
+    performed the transition; ``leave`` is updated in memory on success.
+    """
+    now = timezone.now()
+    changed = Leave.objects.filter(pk=leave.pk, status=from_status).update(
+        status=to_status, updated_at=now
+    )
+    if not changed:
+        return False
+
+    leave.status = to_status
+    leave.updated_at = now
+    leave_status_changed.send(sender=Leave, leaves=[leave], from_status=from_status, to_status=to_status)
+    return True
+
+
+def decide(leave, decision, approver, comments=''):
+    """
+    Approve or reject a single pending leave and record the approval.
+
+    Returns the new LeaveApproval, or None if the leave was no longer pending
+    (e.g. another approver got there first).
+    """
+    try:
+        with transaction.atomic():
+            if not transition(leave, DECISIONS[decision]):
+                return None
+            return LeaveApproval.objects.create(leave=leave, approver=approver, comments=comments)
+    except IntegrityError:
+        # A stale approval row already exists; the transition was rolled back
+        leave.status = 'pending'
+        return None
+
+
+def reopen(approval):
+    """Delete ``approval`` and move its leave back to pending."""
+    leave = approval.leave
+    with transaction.atomic():
+        transition(leave, 'pending', from_status=leave.status)
+        approval.delete()
+    return leave
+
+
+def bulk_decide(leave_ids, decision, approver, comments=''):
+    """
+    Approve or reject many pending leaves at once.
+
+    Runs one locking read, one ``UPDATE ... WHERE status = 'pending' AND id IN
+    (...)`` and one ``bulk_create`` of LeaveApproval rows in a single
+    transaction; approvals are only created for rows the update changed.
+    Returns a list of per-id outcomes in request order.
+    """
+    new_status = DECISIONS[decision]
+    leave_ids = list(dict.fromkeys(leave_ids))
+
+    with transaction.atomic():
+        rows = {
+            row[0]: row
+            for row in Leave.objects.select_for_update(of=('self',))
+            .filter(id__in=leave_ids)
+            .order_by()
+            .values_list('id', 'status', 'approval__id', 'employee_id', 'leave_type_id', 'start_date', 'end_date')
+        }
+        decided = [
+            leave_id for leave_id in leave_ids
+            if leave_id in rows and rows[leave_id][1] == 'pending' and rows[leave_id][2] is None
+        ]
+        if decided:
+            now = timezone.now()
+            updated = Leave.objects.filter(id__in=decided, status='pending').update(status=new_status, updated_at=now)
+            if updated != len(decided):
+                # Another writer moved some rows between the read and the
+                # update (the lock is a no-op on some backends); only rows this
+                # update changed get an approval
+                changed = set(
+                    Leave.objects.filter(id__in=decided, status=new_status, updated_at=now)
+                    .values_list('id', flat=True)
+                )
+                decided = [leave_id for leave_id in decided if leave_id in changed]
+            LeaveApproval.objects.bulk_create([
+                LeaveApproval(leave_id=leave_id, approver=approver, comments=comments)
+                for leave_id in decided
+            ])
+            leave_status_changed.send(
+                sender=Leave,
+                leaves=[
+                    Leave(
+                        id=leave_id, employee_id=employee_id, leave_type_id=leave_type_id,
+                        start_date=start_date, end_date=end_date, status=new_status, updated_at=now,
+                    )
+                    for leave_id, _, _, employee_id, leave_type_id, start_date, end_date
+                    in (rows[leave_id] for leave_id in decided)
+                ],
+                from_status='pending',
+                to_status=new_status,
+            )
+
+    decided = set(decided)
+    outcomes = []
+    for leave_id in leave_ids:
+        if leave_id in decided:
+            outcomes.append({'id': leave_id, 'status': new_status, 'outcome': 'updated'})
+        elif leave_id not in rows:
+            outcomes.append({'id': leave_id, 'status': None, 'outcome': 'not_found'})
+        elif rows[leave_id][1] != 'pending':
+            outcomes.append({'id': leave_id, 'status': rows[leave_id][1], 'outcome': 'not_pending'})
+        else:
+            outcomes.append({'id': leave_id, 'status': rows[leave_id][1], 'outcome': 'already_decided'})
+    return outcomes
@@ -0,0 +1,123 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from apps.core.sync import track_deletions
+from apps.employees.models import Employee
+from apps.employees.signals import employees_updated
+from . import balances
+from .intervals import leave_index
+from .leave_type_cache import leave_type_cache
+from .models import Holiday, HolidayCalendar, Leave, LeaveApproval, LeaveType
+from .workdays import invalidate_default_calculator
+
+# Sent by the transition service after queryset-level status updates, which
+# bypass post_save. Receives ``leaves`` (instances carrying at least id,
+# employee_id, leave_type_id, start_date and end_date), ``from_status`` and
+# ``to_status``.
+leave_status_changed = Signal()
+
+# Leave columns that affect the balance ledger
+LEDGER_FIELDS = ('employee_id', 'leave_type_id', 'start_date', 'end_date', 'status')
+LEDGER_UPDATE_FIELDS = {'employee', 'leave_type', *LEDGER_FIELDS}
+
+
+@receiver(pre_save, sender=Leave)
+def snapshot_leave_for_ledger(sender, instance, update_fields=None, **kwargs):
+    instance._ledger_previous = None
+    instance._ledger_unchanged = update_fields is not None and not LEDGER_UPDATE_FIELDS & set(update_fields)
+    if not instance._state.adding and not instance._ledger_unchanged:
+        instance._ledger_previous = (
+            Leave.objects.filter(pk=instance.pk).values_list(*LEDGER_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Leave)
+def update_ledger_on_save(sender, instance, **kwargs):
+    if getattr(instance, '_ledger_unchanged', False):
+        return
+    previous = getattr(instance, '_ledger_previous', None)
+    balances.apply(balances.merge(
+        balances.contributions(*previous, sign=-1) if previous else {},
+        balances.contributions(*(getattr(instance, field) for field in LEDGER_FIELDS)),
+    ))
+
+
+@receiver(post_delete, sender=Leave)
+def update_ledger_on_delete(sender, instance, **kwargs):
+    balances.apply(balances.contributions(*(getattr(instance, field) for field in LEDGER_FIELDS), sign=-1))
+
+
+@receiver(post_save, sender=Leave)
+def index_leave_on_save(sender, instance, **kwargs):
+    # Snapshot now: the instance may be changed again before the commit. The
+    # department is left to the index, which resolves it only once loaded.
+    interval = (instance.id, instance.employee_id, instance.start_date, instance.end_date)
+    if instance.status == 'approved':
+        transaction.on_commit(lambda: leave_index.add(*interval))
+    else:
+        transaction.on_commit(lambda: leave_index.discard(interval[0]))
+
+
+@receiver(post_delete, sender=Leave)
+def unindex_leave_on_delete(sender, instance, **kwargs):
+    leave_id = instance.id
+    transaction.on_commit(lambda: leave_index.discard(leave_id))
+
+
+@receiver(post_save, sender=Employee)
+def reindex_employee_department(sender, instance, created, **kwargs):
+    if not created:
+        department = (instance.id, instance.department_ref_id)
+        transaction.on_commit(lambda: leave_index.set_department(*department))
+
+
+@receiver(employees_updated, sender=Employee)
+def reindex_departments_on_bulk_update(sender, employees, fields, **kwargs):
+    if 'department_ref' not in fields:
+        return
+    if employees is None:
+        # Updated by filter; which employees changed is unknown
+        transaction.on_commit(leave_index.invalidate)
+        return
+    departments = [(employee.id, employee.department_ref_id) for employee in employees]
+    transaction.on_commit(lambda: [leave_index.set_department(*pair) for pair in departments])
+
+
+@receiver(leave_status_changed, sender=Leave)
+def index_leaves_on_transition(sender, leaves, to_status, **kwargs):
+    if to_status == 'approved':
+        intervals = [(leave.id, leave.employee_id, leave.start_date, leave.end_date) for leave in leaves]
+        transaction.on_commit(lambda: [leave_index.add(*interval) for interval in intervals])
+    else:
+        leave_ids = [leave.id for leave in leaves]
+        transaction.on_commit(lambda: [leave_index.discard(leave_id) for leave_id in leave_ids])
+
+
+@receiver(leave_status_changed, sender=Leave)
+def update_ledger_on_transition(sender, leaves, from_status, to_status, **kwargs):
+    balances.record_transition(leaves, from_status, to_status)
+
+
+@receiver([post_save, post_delete], sender=HolidayCalendar)
+@receiver([post_save, post_delete], sender=Holiday)
+def reset_working_day_calendar(sender, **kwargs):
+    transaction.on_commit(invalidate_default_calculator)
+
+
+@receiver([post_save, post_delete], sender=LeaveType)
+def reset_leave_type_cache(sender, **kwargs):
+    # Again on commit, in case a concurrent reload read the old rows
+    leave_type_cache.invalidate()
+    transaction.on_commit(leave_type_cache.invalidate)
+
+
+def _approval_owner(approval):
+    try:
+        return approval.leave.employee_id
+    except Leave.DoesNotExist:
+        return None
+
+
+# Deletion tombstones for ?since= delta sync, scoped to the owning employee
+track_deletions(Leave, scope=lambda leave: leave.employee_id)
+track_deletions(LeaveApproval, scope=_approval_owner)
@@ -0,0 +1,37 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from apps.employees.tests.factories import EmployeeFactory
+from ..factories import LeaveFactory
+
+
+class FindOverlapsCommandTests(TestCase):
+    def setUp(self):
+        self.employee = EmployeeFactory()
+        self.a = self.leave(date(2024, 1, 1), date(2024, 1, 10))
+        self.b = self.leave(date(2024, 1, 5), date(2024, 1, 6))
+        self.c = self.leave(date(2024, 1, 9), date(2024, 1, 12))
+        self.d = self.leave(date(2024, 1, 13), date(2024, 1, 14))
+        self.leave(date(2024, 1, 1), date(2024, 1, 31), status='cancelled')
+        # Same dates for someone else never count
+        LeaveFactory(start_date=date(2024, 1, 1), end_date=date(2024, 1, 10), status='approved')
+
+    def leave(self, start, end, status='approved'):
+        return LeaveFactory(employee=self.employee, start_date=start, end_date=end, status=status)
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('find_overlaps', *args, stdout=out)
+        return out.getvalue()
+
+    def test_reports_each_overlapping_pair_once(self):
+        output = self.run_command()
+        self.assertIn(f'leave {self.a.id} (2024-01-01 to 2024-01-10) overlaps leave {self.b.id}', output)
+        self.assertIn(f'leave {self.a.id} (2024-01-01 to 2024-01-10) overlaps leave {self.c.id}', output)
+        self.assertNotIn(f'overlaps leave {self.d.id}', output)
+        self.assertIn('2 overlapping leave pairs found', output)
+
+    def test_include_inactive(self):
+        output = self.run_command('--include-inactive', '--employee', str(self.employee.id))
+        self.assertIn('6 overlapping leave pairs found', output)
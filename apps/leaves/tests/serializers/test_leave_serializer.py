@@ -0,0 +1,99 @@
+from datetime import date
+from django.test import TestCase
+from apps.employees.tests.factories import EmployeeFactory
+from ..factories import LeaveFactory, LeaveTypeFactory
+from ...serializers import LeaveSerializer
+
+
+class LeaveMaxDaysTests(TestCase):
+    def setUp(self):
+        self.employee = EmployeeFactory()
+        self.leave_type = LeaveTypeFactory(name='Vacation', max_days=10)
+        LeaveFactory(
+            employee=self.employee, leave_type=self.leave_type, status='approved',
+            start_date=date(2024, 1, 8), end_date=date(2024, 1, 13),  # 6 days
+        )
+
+    def payload(self, start, end):
+        return {
+            'employee': self.employee.pk,
+            'leave_type': self.leave_type.pk,
+            'start_date': start,
+            'end_date': end,
+            'reason': 'Trip',
+        }
+
+    def test_create_within_limit(self):
+        serializer = LeaveSerializer(data=self.payload('2024-03-04', '2024-03-07'))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_create_over_limit_is_rejected(self):
+        serializer = LeaveSerializer(data=self.payload('2024-03-04', '2024-03-08'))
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('4 days remaining in 2024', str(serializer.errors['non_field_errors'][0]))
+
+    def test_pending_days_count_towards_limit(self):
+        LeaveFactory(
+            employee=self.employee, leave_type=self.leave_type, status='pending',
+            start_date=date(2024, 2, 1), end_date=date(2024, 2, 3),
+        )
+        serializer = LeaveSerializer(data=self.payload('2024-03-04', '2024-03-05'))
+        self.assertFalse(serializer.is_valid())
+
+    def test_other_years_are_independent(self):
+        serializer = LeaveSerializer(data=self.payload('2025-03-03', '2025-03-12'))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_update_does_not_count_the_leave_twice(self):
+        leave = LeaveFactory(
+            employee=self.employee, leave_type=self.leave_type, status='pending',
+            start_date=date(2024, 3, 4), end_date=date(2024, 3, 6),
+        )
+        serializer = LeaveSerializer(leave, data={'end_date': '2024-03-07'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer = LeaveSerializer(leave, data={'end_date': '2024-03-08'}, partial=True)
+        self.assertFalse(serializer.is_valid())
+
+    def test_check_uses_a_single_counter_lookup(self):
+        serializer = LeaveSerializer(data=self.payload('2024-03-04', '2024-03-05'))
+        # employee and leave_type primary key lookups, the overlap probe and one ledger read
+        with self.assertNumQueries(4):
+            serializer.is_valid()
+
+
+class LeaveOverlapTests(TestCase):
+    def setUp(self):
+        self.employee = EmployeeFactory()
+        self.leave_type = LeaveTypeFactory(max_days=60)
+        self.leave = LeaveFactory(
+            employee=self.employee, leave_type=self.leave_type, status='pending',
+            start_date=date(2024, 5, 6), end_date=date(2024, 5, 10),
+        )
+
+    def payload(self, start, end, employee=None):
+        return {
+            'employee': (employee or self.employee).pk,
+            'leave_type': self.leave_type.pk,
+            'start_date': start,
+            'end_date': end,
+            'reason': 'Trip',
+        }
+
+    def test_overlapping_leave_is_rejected(self):
+        for start, end in [('2024-05-10', '2024-05-12'), ('2024-05-01', '2024-05-06'), ('2024-05-07', '2024-05-08')]:
+            serializer = LeaveSerializer(data=self.payload(start, end))
+            self.assertFalse(serializer.is_valid(), (start, end))
+            self.assertIn('overlaps', str(serializer.errors['non_field_errors'][0]))
+
+    def test_adjacent_leave_and_other_employees_are_allowed(self):
+        self.assertTrue(LeaveSerializer(data=self.payload('2024-05-11', '2024-05-12')).is_valid())
+        self.assertTrue(LeaveSerializer(data=self.payload('2024-05-06', '2024-05-10', EmployeeFactory())).is_valid())
+
+    def test_cancelled_and_rejected_leaves_do_not_block(self):
+        self.leave.status = 'cancelled'
+        self.leave.save()
+        self.assertTrue(LeaveSerializer(data=self.payload('2024-05-06', '2024-05-10')).is_valid())
+
+    def test_update_ignores_the_leave_itself(self):
+        serializer = LeaveSerializer(self.leave, data={'end_date': '2024-05-11'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
@@ -0,0 +1,85 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from apps.authentication.tests.factories import UserFactory
+from apps.employees.tests.factories import EmployeeFactory
+from ..factories import LeaveFactory, LeaveTypeFactory
+from ...balances import apply, days_by_year
+from ...models import LeaveBalance
+from ...services import bulk_decide, decide
+
+
+class LeaveBalanceLedgerTests(TestCase):
+    def setUp(self):
+        self.employee = EmployeeFactory()
+        self.leave_type = LeaveTypeFactory(max_days=30)
+        self.approver = UserFactory(is_staff=True)
+
+    def balance(self, year=2024):
+        row = LeaveBalance.objects.filter(employee=self.employee, leave_type=self.leave_type, year=year).first()
+        return (row.used_days, row.pending_days) if row else None
+
+    def make_leave(self, start, end, status='pending'):
+        return LeaveFactory(
+            employee=self.employee, leave_type=self.leave_type,
+            start_date=start, end_date=end, status=status,
+        )
+
+    def test_days_by_year_splits_across_new_year(self):
+        self.assertEqual(days_by_year(date(2024, 12, 30), date(2025, 1, 2)), {2024: 2, 2025: 2})
+
+    def test_pending_leave_counts_as_pending_days(self):
+        self.make_leave(date(2024, 3, 4), date(2024, 3, 8))
+        self.assertEqual(self.balance(), (0, 5))
+
+    def test_transitions_move_days_between_columns(self):
+        leave = self.make_leave(date(2024, 3, 4), date(2024, 3, 8))
+        decide(leave, 'approve', self.approver)
+        self.assertEqual(self.balance(), (5, 0))
+
+        other = self.make_leave(date(2024, 4, 1), date(2024, 4, 2))
+        bulk_decide([other.id], 'reject', self.approver)
+        self.assertEqual(self.balance(), (5, 0))
+
+    def test_date_edits_and_deletes_are_reflected(self):
+        leave = self.make_leave(date(2024, 3, 4), date(2024, 3, 8), status='approved')
+        leave.end_date = date(2024, 3, 5)
+        leave.save()
+        self.assertEqual(self.balance(), (2, 0))
+        leave.delete()
+        self.assertEqual(self.balance(), (0, 0))
+
+    def test_leave_spanning_years_is_split(self):
+        self.make_leave(date(2024, 12, 30), date(2025, 1, 2), status='approved')
+        self.assertEqual(self.balance(2024), (2, 0))
+        self.assertEqual(self.balance(2025), (2, 0))
+
+    def test_apply_updates_and_creates_in_one_batch(self):
+        self.make_leave(date(2024, 3, 4), date(2024, 3, 8))
+        other_type = LeaveTypeFactory()
+        deltas = {
+            (self.employee.id, self.leave_type.id, 2024): {'pending_days': -5, 'used_days': 5},
+            (self.employee.id, self.leave_type.id, 2025): {'used_days': 2},
+            (self.employee.id, other_type.id, 2024): {'pending_days': -1},
+        }
+        # Read, update, savepoint, insert, release
+        with self.assertNumQueries(5):
+            apply(deltas)
+        self.assertEqual(self.balance(), (5, 0))
+        self.assertEqual(self.balance(2025), (2, 0))
+        # Negative deltas never create rows
+        self.assertFalse(LeaveBalance.objects.filter(leave_type=other_type).exists())
+
+    def test_rebuild_matches_incremental_ledger(self):
+        self.make_leave(date(2024, 3, 4), date(2024, 3, 8), status='approved')
+        self.make_leave(date(2024, 5, 1), date(2024, 5, 1), status='pending')
+        self.make_leave(date(2024, 6, 1), date(2024, 6, 9), status='rejected')
+        self.make_leave(date(2024, 12, 31), date(2025, 1, 1), status='approved')
+        incremental = set(LeaveBalance.objects.values_list('employee', 'leave_type', 'year', 'used_days', 'pending_days'))
+
+        LeaveBalance.objects.update(used_days=0, pending_days=0)
+        call_command('rebuild_balances', stdout=StringIO())
+        rebuilt = set(LeaveBalance.objects.values_list('employee', 'leave_type', 'year', 'used_days', 'pending_days'))
+        self.assertEqual(rebuilt, incremental)
+        self.assertEqual(self.balance(2024), (6, 1))
@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.authentication.tests.factories import UserFactory
+from ..factories import LeaveFactory
+from ...models import Leave, LeaveApproval
+from ...services import bulk_decide, decide, reopen, transition
+
+
+class TransitionServiceTests(TestCase):
+    def setUp(self):
+        self.approver = UserFactory(is_staff=True)
+        self.leave = LeaveFactory(status='pending')
+
+    def test_transition_is_compare_and_swap(self):
+        stale_copy = Leave.objects.get(pk=self.leave.pk)
+        self.assertTrue(transition(self.leave, 'approved'))
+        self.assertFalse(transition(stale_copy, 'rejected'))
+        self.leave.refresh_from_db()
+        self.assertEqual(self.leave.status, 'approved')
+
+    def test_transition_writes_a_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            transition(self.leave, 'cancelled')
+        leave_writes = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "leaves_leave"')]
+        self.assertEqual(len(leave_writes), 1)
+        self.assertIn('"status"', leave_writes[0])
+        self.assertNotIn('"reason"', leave_writes[0])
+        self.assertEqual(self.leave.status, 'cancelled')
+
+    def test_concurrent_decisions_only_one_wins(self):
+        stale_copy = Leave.objects.get(pk=self.leave.pk)
+        first = decide(self.leave, 'approve', self.approver)
+        second = decide(stale_copy, 'reject', UserFactory(is_staff=True))
+        self.assertIsNotNone(first)
+        self.assertIsNone(second)
+        self.assertEqual(LeaveApproval.objects.filter(leave=self.leave).count(), 1)
+        self.assertEqual(Leave.objects.get(pk=self.leave.pk).status, 'approved')
+
+    def test_bulk_decide_skips_rows_changed_after_the_read(self):
+        other = LeaveFactory(status='pending')
+        raced = False
+
+        def cancel_first(execute, sql, params, many, context):
+            # Another writer cancels self.leave right before the bulk update
+            nonlocal raced
+            if not raced and sql.startswith('UPDATE "leaves_leave" SET "status"'):
+                raced = True
+                Leave.objects.filter(pk=self.leave.pk).update(status='cancelled')
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(cancel_first):
+            outcomes = bulk_decide([self.leave.pk, other.pk], 'approve', self.approver)
+
+        self.assertEqual([outcome['outcome'] for outcome in outcomes], ['already_decided', 'updated'])
+        self.assertFalse(LeaveApproval.objects.filter(leave=self.leave).exists())
+        self.assertTrue(LeaveApproval.objects.filter(leave=other).exists())
+        self.assertEqual(Leave.objects.get(pk=self.leave.pk).status, 'cancelled')
+
+    def test_reopen_moves_leave_back_to_pending(self):
+        approval = decide(self.leave, 'approve', self.approver)
+        reopen(approval)
+        self.assertEqual(Leave.objects.get(pk=self.leave.pk).status, 'pending')
+        self.assertFalse(LeaveApproval.objects.filter(leave=self.leave).exists())
+
+
+class ApprovalEndpointRaceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = UserFactory(is_staff=True, role='admin')
+        self.client.force_authenticate(user=self.admin)
+        self.leave = LeaveFactory(status='pending')
+
+    def test_second_approval_is_rejected_without_server_error(self):
+        url = reverse('leave-approve', kwargs={'pk': self.leave.pk})
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_leave_approval_create_uses_transition(self):
+        response = self.client.post(
+            reverse('leaveapproval-list'), {'leave': self.leave.pk, 'comments': 'fine'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['comments'], 'fine')
+        self.assertEqual(Leave.objects.get(pk=self.leave.pk).status, 'approved')
+
+        response = self.client.post(
+            reverse('leaveapproval-list'), {'leave': self.leave.pk}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.authentication.tests.factories import UserFactory
+from apps.employees.tests.factories import EmployeeFactory
+from ..factories import LeaveFactory, LeaveTypeFactory
+from ...models import Holiday, HolidayCalendar, Leave
+from ...workdays import WorkingDayCalculator, invalidate_default_calculator
+
+
+def brute_force(start, end, holidays, weekmask):
+    days, day = 0, start
+    while day <= end:
+        if weekmask[day.weekday()] == '1' and day not in holidays:
+            days += 1
+        day += timedelta(days=1)
+    return days
+
+
+class WorkingDayCalculatorTests(TestCase):
+    def test_weekends_are_excluded(self):
+        calculator = WorkingDayCalculator()
+        self.assertEqual(calculator.count(date(2024, 1, 1), date(2024, 1, 7)), 5)   # Mon..Sun
+        self.assertEqual(calculator.count(date(2024, 1, 6), date(2024, 1, 7)), 0)   # weekend
+        self.assertEqual(calculator.count(date(2024, 1, 5), date(2024, 1, 8)), 2)   # Fri..Mon
+        self.assertEqual(calculator.count(date(2024, 1, 8), date(2024, 1, 5)), 0)
+
+    def test_matches_day_by_day_count(self):
+        holidays = {date(2024, 1, 1), date(2024, 3, 29), date(2024, 12, 25), date(2024, 12, 28)}
+        for weekmask in ('1111100', '1111110', '0111110'):
+            calculator = WorkingDayCalculator(holidays, weekmask)
+            for offset in range(0, 360, 7):
+                start = date(2024, 1, 1) + timedelta(days=offset)
+                for length in (0, 1, 4, 13, 40):
+                    end = start + timedelta(days=length)
+                    self.assertEqual(
+                        calculator.count(start, end), brute_force(start, end, holidays, weekmask),
+                        (weekmask, start, end),
+                    )
+
+    def test_batched_counts(self):
+        calculator = WorkingDayCalculator([date(2024, 1, 2)])
+        ranges = [(date(2024, 1, 1), date(2024, 1, 3)), (date(2024, 1, 6), date(2024, 1, 6))]
+        self.assertEqual(calculator.count_many(ranges), [2, 0])
+        leave = LeaveFactory(start_date=date(2024, 1, 1), end_date=date(2024, 1, 12))
+        with self.assertNumQueries(1):
+            self.assertEqual(calculator.for_queryset(Leave.objects.all()), {leave.id: 9})
+
+
+class HolidayCalendarTests(TestCase):
+    def test_only_one_default_calendar(self):
+        default = HolidayCalendar.objects.create(name='Default', is_default=True)
+        regional = HolidayCalendar.objects.create(name='Regional')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            HolidayCalendar.objects.filter(pk=regional.pk).update(is_default=True)
+
+        # Saving a new default demotes the old one
+        regional.is_default = True
+        regional.save()
+        self.assertEqual(list(HolidayCalendar.objects.filter(is_default=True)), [regional])
+        default.refresh_from_db()
+        self.assertFalse(default.is_default)
+
+
+class WorkingDayDurationTests(TestCase):
+    def setUp(self):
+        invalidate_default_calculator()
+        calendar = HolidayCalendar.objects.create(name='Default', is_default=True)
+        Holiday.objects.create(calendar=calendar, date=date(2024, 1, 1), name="New Year's Day")
+        self.admin = UserFactory(is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.employee = EmployeeFactory()
+        self.leave_type = LeaveTypeFactory(max_days=30)
+        self.leave = LeaveFactory(
+            employee=self.employee, leave_type=self.leave_type, status='approved',
+            start_date=date(2024, 1, 1), end_date=date(2024, 1, 14),
+        )
+
+    def tearDown(self):
+        invalidate_default_calculator()
+
+    def test_duration_defaults_to_calendar_days(self):
+        response = self.client.get(reverse('leave-detail', kwargs={'pk': self.leave.pk}))
+        self.assertEqual(response.data['data']['duration'], 14)
+
+    def test_duration_working(self):
+        response = self.client.get(reverse('leave-detail', kwargs={'pk': self.leave.pk}), {'duration': 'working'})
+        self.assertEqual(response.data['data']['duration'], 9)
+
+    def test_list_computes_working_days_without_per_row_queries(self):
+        for week in range(1, 6):
+            LeaveFactory(employee=self.employee, start_date=date(2024, 3, 1) + timedelta(weeks=week),
+                         end_date=date(2024, 3, 3) + timedelta(weeks=week))
+        self.client.get(reverse('leave-list'), {'duration': 'working'})  # warm the calendar cache
+        # ETag validator, holiday calendar validator and the page; none per row
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('leave-list'), {'duration': 'working'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_balances_in_working_days(self):
+        url = reverse('employee-balances', kwargs={'pk': self.employee.pk})
+        response = self.client.get(url, {'year': 2024, 'duration': 'working'})
+        self.assertEqual(response.data['data'][0]['used_days'], 9)
+        response = self.client.get(url, {'year': 2024})
+        self.assertEqual(response.data['data'][0]['used_days'], 14)
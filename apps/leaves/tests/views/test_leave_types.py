@@ -0,0 +1,57 @@
+import json
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..factories import LeaveTypeFactory
+from ...leave_type_cache import leave_type_cache
+from ...models import LeaveType
+from ...serializers import LeaveTypeSerializer
+from apps.authentication.tests.factories import UserFactory
+
+
+class LeaveTypeCacheTests(APITestCase):
+    def setUp(self):
+        leave_type_cache.invalidate()
+        self.annual = LeaveTypeFactory(name='Annual', max_days=25)
+        self.sick = LeaveTypeFactory(name='Sick', max_days=10)
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.list_url = reverse('leavetype-list')
+
+    def tearDown(self):
+        leave_type_cache.invalidate()
+
+    def test_list_body_matches_serializer_output(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = JSONRenderer().render({
+            'message': 'Leave types retrieved successfully',
+            'data': LeaveTypeSerializer(LeaveType.objects.all(), many=True).data,
+        })
+        self.assertEqual(response.content, expected)
+
+    def test_steady_state_reads_do_not_touch_the_database(self):
+        self.client.get(self.list_url)
+        detail_url = reverse('leavetype-detail', kwargs={'pk': self.sick.pk})
+        with self.assertNumQueries(0):
+            etag = self.client.get(self.list_url)['ETag']
+            self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            response = self.client.get(detail_url)
+        self.assertEqual(response.data['data']['name'], 'Sick')
+
+    def test_writes_invalidate_the_cache(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.annual.max_days = 30
+        self.annual.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['data'][0]['max_days'], 30)
+
+    def test_unknown_leave_type_is_not_found(self):
+        response = self.client.get(reverse('leavetype-detail', kwargs={'pk': self.sick.pk + 100}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_nested_leave_types_come_from_the_cache(self):
+        self.assertEqual(leave_type_cache.representation(self.annual.pk), LeaveTypeSerializer(self.annual).data)
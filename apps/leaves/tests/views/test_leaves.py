@@ -1,7 +1,23 @@
+import csv
+import io
+import json
+from datetime import date
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from ..factories import LeaveFactory, LeaveTypeFactory
+from ...intervals import leave_index
+from ...leave_type_cache import leave_type_cache
+from ...models import Holiday, HolidayCalendar, Leave
+from ...services import decide
+from apps.core.models import Tombstone
+from apps.authentication.serializers import PrincipalTokenObtainPairSerializer
+from apps.core.sync import make_sync_token
 from apps.employees.tests.factories import EmployeeFactory
 from apps.authentication.tests.factories import UserFactory
 
@@ -10,7 +26,7 @@ class LeaveViewSetTests(APITestCase):
         # Create test data
         self.user = UserFactory(is_staff=True)
         self.employee = EmployeeFactory(user=self.user)
-        self.leave_type = LeaveTypeFactory()
+        self.leave_type = LeaveTypeFactory(max_days=30)
         self.leave = LeaveFactory(
             employee=self.employee,
             leave_type=self.leave_type,
@@ -54,8 +70,8 @@ class LeaveViewSetTests(APITestCase):
         }
         response = self.client.patch(self.detail_url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        # The response doesn't include a message for updates
-        self.assertEqual(response.data['reason'], 'Updated reason')
+        self.assertEqual(response.data['message'], 'Leave updated successfully')
+        self.assertEqual(response.data['data']['reason'], 'Updated reason')
 
     def test_delete_leave(self):
         response = self.client.delete(self.detail_url)
@@ -86,4 +102,585 @@ class LeaveViewSetTests(APITestCase):
         url = reverse('leave-reject', kwargs={'pk': self.leave.pk})
         response = self.client.post(url, {'comments': 'Rejected for testing'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['message'], 'Leave rejected successfully') 
\ No newline at end of file
+        self.assertEqual(response.data['message'], 'Leave rejected successfully') 
+
+class LeavePaginationTests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.employee = EmployeeFactory(user=self.user)
+        self.leave_type = LeaveTypeFactory()
+        self.leaves = [
+            LeaveFactory(employee=self.employee, leave_type=self.leave_type)
+            for _ in range(5)
+        ]
+        self.list_url = reverse('leave-list')
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_is_paginated_with_cursors(self):
+        response = self.client.get(self.list_url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'Leaves retrieved successfully')
+        self.assertEqual(len(response.data['data']), 2)
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_cursor_walk_returns_every_leave_once_newest_first(self):
+        seen = []
+        url = f'{self.list_url}?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item['id'] for item in response.data['data'])
+            url = response.data['next']
+        expected = sorted(self.leaves, key=lambda leave: (leave.created_at, leave.id), reverse=True)
+        self.assertEqual(seen, [leave.id for leave in expected])
+
+    def test_my_leaves_is_paginated(self):
+        response = self.client.get(reverse('leave-my-leaves'), {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 3)
+        self.assertIn('next', response.data)
+
+
+class LeaveExportTests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.employee = EmployeeFactory(user=self.user)
+        self.leaves = [LeaveFactory(employee=self.employee) for _ in range(3)]
+        self.url = reverse('leave-export')
+        self.client.force_authenticate(user=self.user)
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['id'] for row in rows], sorted(leave.id for leave in self.leaves))
+        self.assertEqual(rows[0]['employee_first_name'], self.employee.first_name)
+        self.assertIn('leave_type_name', rows[0])
+
+    def test_export_csv(self):
+        response = self.client.get(self.url, {'output': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['start_date'], self.leaves[0].start_date.isoformat())
+
+    def test_export_rejects_unknown_format(self):
+        response = self.client.get(self.url, {'output': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class WhoIsOutTests(APITestCase):
+    def setUp(self):
+        leave_index.invalidate()
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.engineer = EmployeeFactory(department='Engineering')
+        self.marketer = EmployeeFactory(department='Marketing')
+        self.long_leave = LeaveFactory(
+            employee=self.engineer, status='approved',
+            start_date=date(2024, 1, 1), end_date=date(2024, 1, 31),
+        )
+        self.short_leave = LeaveFactory(
+            employee=self.marketer, status='approved',
+            start_date=date(2024, 1, 10), end_date=date(2024, 1, 11),
+        )
+        LeaveFactory(
+            employee=self.marketer, status='pending',
+            start_date=date(2024, 1, 15), end_date=date(2024, 1, 16),
+        )
+        self.url = reverse('leave-out')
+
+    def tearDown(self):
+        leave_index.invalidate()
+
+    def out(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['leave'] for row in response.data['data']]
+
+    def test_only_approved_overlapping_leaves_are_returned(self):
+        self.assertEqual(self.out(**{'from': '2024-01-15', 'to': '2024-01-20'}), [self.long_leave.id])
+        self.assertEqual(
+            self.out(**{'from': '2024-01-11', 'to': '2024-01-11'}),
+            [self.long_leave.id, self.short_leave.id],
+        )
+        self.assertEqual(self.out(**{'from': '2024-02-01', 'to': '2024-02-28'}), [])
+
+    def test_department_filter(self):
+        self.assertEqual(
+            self.out(**{'from': '2024-01-01', 'to': '2024-12-31', 'department': 'marketing'}),
+            [self.short_leave.id],
+        )
+
+    def test_index_follows_status_changes_and_deletes(self):
+        self.out(**{'from': '2024-01-01', 'to': '2024-12-31'})  # load the index
+        with self.captureOnCommitCallbacks(execute=True):
+            self.short_leave.status = 'cancelled'
+            self.short_leave.save()
+            self.long_leave.delete()
+            added = LeaveFactory(
+                employee=self.engineer, status='approved',
+                start_date=date(2024, 3, 1), end_date=date(2024, 3, 2),
+            )
+        self.assertEqual(self.out(**{'from': '2024-01-01', 'to': '2024-12-31'}), [added.id])
+
+    def test_index_keeps_the_values_saved_before_commit(self):
+        self.out(**{'from': '2024-01-01', 'to': '2024-12-31'})  # load the index
+        with self.captureOnCommitCallbacks(execute=True):
+            self.short_leave.start_date, self.short_leave.end_date = date(2024, 5, 1), date(2024, 5, 2)
+            self.short_leave.save()
+            # Changed again in memory only
+            self.short_leave.start_date, self.short_leave.end_date = date(2024, 6, 1), date(2024, 6, 2)
+        self.assertEqual(
+            self.out(**{'from': '2024-05-01', 'to': '2024-05-31', 'department': 'marketing'}), [self.short_leave.id]
+        )
+        self.assertEqual(self.out(**{'from': '2024-06-01', 'to': '2024-06-30'}), [])
+
+    def test_invalid_range(self):
+        response = self.client.get(self.url, {'from': '2024-02-01', 'to': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'from': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkDecideTests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.pending = [LeaveFactory(status='pending') for _ in range(3)]
+        self.approved = LeaveFactory(status='approved')
+        self.url = reverse('leave-bulk-decide')
+
+    def test_bulk_approve_reports_per_id_outcomes(self):
+        ids = [leave.id for leave in self.pending] + [self.approved.id, 999999]
+        response = self.client.post(self.url, {'ids': ids, 'decision': 'approve', 'comments': 'ok'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        outcomes = {row['id']: row['outcome'] for row in response.data['data']}
+        self.assertEqual([row['id'] for row in response.data['data']], ids)
+        self.assertEqual(outcomes[self.approved.id], 'not_pending')
+        self.assertEqual(outcomes[999999], 'not_found')
+        for leave in self.pending:
+            self.assertEqual(outcomes[leave.id], 'updated')
+            leave.refresh_from_db()
+            self.assertEqual(leave.status, 'approved')
+            self.assertEqual(leave.approval.approver, self.user)
+            self.assertEqual(leave.approval.comments, 'ok')
+
+    def test_bulk_reject_uses_constant_queries(self):
+        ids = [leave.id for leave in self.pending]
+        # savepoint, locking read, update, bulk insert, ledger read, ledger
+        # update, release
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, {'ids': ids, 'decision': 'reject'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Leave.objects.filter(id__in=ids, status='rejected').count(), 3)
+
+    def test_bulk_decide_validates_payload(self):
+        response = self.client.post(self.url, {'ids': [], 'decision': 'maybe'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ids', response.data['errors'])
+        self.assertIn('decision', response.data['errors'])
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.leave = LeaveFactory(status='pending')
+        self.list_url = reverse('leave-list')
+
+    def test_nested_objects_are_collapsed_to_ids_by_default(self):
+        response = self.client.get(self.list_url)
+        item = response.data['data'][0]
+        self.assertEqual(item['employee'], self.leave.employee_id)
+        self.assertNotIn('employee_details', item)
+        self.assertNotIn('leave_type_details', item)
+
+    def test_expand_includes_requested_nested_objects(self):
+        response = self.client.get(self.list_url, {'expand': 'employee'})
+        item = response.data['data'][0]
+        self.assertEqual(item['employee_details']['email'], self.leave.employee.email)
+        self.assertNotIn('leave_type_details', item)
+
+    def test_fields_limits_output(self):
+        response = self.client.get(self.list_url, {'fields': 'id,status,duration'})
+        self.assertEqual(set(response.data['data'][0]), {'id', 'status', 'duration'})
+        self.assertEqual(response.data['data'][0]['duration'], self.leave.duration)
+
+    def test_queryset_selects_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.list_url, {'fields': 'id,status'})
+        sql = queries[-1]['sql']
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('"reason"', sql)
+
+        leave_type_cache.reload()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {'expand': 'employee,leave_type'})
+        # ETag validator aggregate, then the page itself; leave types come from the cache
+        self.assertEqual(len(queries), 2)
+        self.assertIn('JOIN "employees_employee"', queries[-1]['sql'])
+        self.assertNotIn('JOIN "leaves_leavetype"', queries[-1]['sql'])
+        self.assertEqual(response.data['data'][0]['leave_type_details']['name'], self.leave.leave_type.name)
+
+    def test_fields_are_ignored_for_writes(self):
+        data = {
+            'employee': self.leave.employee_id,
+            'leave_type': self.leave.leave_type_id,
+            'start_date': '2020-01-06',
+            'end_date': '2020-01-06',
+            'reason': 'Dentist',
+        }
+        response = self.client.post(f'{self.list_url}?fields=id', data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['reason'], 'Dentist')
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.leave = LeaveFactory(status='pending')
+        self.list_url = reverse('leave-list')
+        self.detail_url = reverse('leave-detail', kwargs={'pk': self.leave.pk})
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.assertTrue(etag)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)
+
+    def test_changes_invalidate_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.leave.reason = 'Changed'
+        self.leave.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = self.client.get(self.list_url)['ETag']
+        LeaveFactory(status='pending')
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_expanded_relation_changes_invalidate_etag(self):
+        etag = self.client.get(self.list_url, {'expand': 'employee'})['ETag']
+        employee = self.leave.employee
+        employee.position = 'Director'
+        employee.save()
+        response = self.client.get(self.list_url, {'expand': 'employee'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_working_day_etag_follows_the_default_calendar(self):
+        calendar = HolidayCalendar.objects.create(name='Default', is_default=True)
+        holiday = Holiday.objects.create(calendar=calendar, date=date(2024, 1, 1), name='New Year')
+        other = HolidayCalendar.objects.create(name='Other')
+        params = {'duration': 'working'}
+
+        def changed(etag):
+            return self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+        etag = self.client.get(self.list_url, params)['ETag']
+        Holiday.objects.create(calendar=other, date=date(2024, 1, 2), name='Elsewhere')
+        self.assertFalse(changed(etag))
+
+        # Moving a holiday leaves the count and the calendar timestamp alone
+        holiday.date = date(2024, 1, 3)
+        holiday.save()
+        self.assertTrue(changed(etag))
+
+        etag = self.client.get(self.list_url, params)['ETag']
+        HolidayCalendar.objects.filter(pk=calendar.pk).update(is_default=False)
+        HolidayCalendar.objects.filter(pk=other.pk).update(is_default=True)
+        self.assertTrue(changed(etag))
+
+    def test_malformed_pk_is_not_found(self):
+        response = self.client.get(reverse('leave-detail', kwargs={'pk': 'abc'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+    def test_etag_depends_on_query_and_caller(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.assertNotEqual(self.client.get(self.list_url, {'fields': 'id'})['ETag'], etag)
+
+        self.client.force_authenticate(user=self.leave.employee.user)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_leave_types_support_conditional_get(self):
+        url = reverse('leavetype-list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class DeltaSyncTests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.list_url = reverse('leave-list')
+        self.old = LeaveFactory(status='pending')
+        self.token = make_sync_token(timezone.now())
+        Leave.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def test_since_returns_changes_and_deletions(self):
+        stale = LeaveFactory(status='pending')
+        Leave.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        new = LeaveFactory(status='pending')
+        self.client.delete(reverse('leave-detail', kwargs={'pk': stale.pk}))
+
+        response = self.client.get(self.list_url, {'since': self.token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['data']], [new.id])
+        self.assertEqual(response.data['deleted'], [stale.id])
+        self.assertGreaterEqual(int(response.data['sync_token']), int(self.token))
+
+    def test_zero_token_is_a_full_sync(self):
+        response = self.client.get(self.list_url, {'since': '0'})
+        self.assertEqual([item['id'] for item in response.data['data']], [self.old.id])
+        self.assertEqual(response.data['deleted'], [])
+
+    @override_settings(DELTA_SYNC_PAGE_SIZE=2)
+    def test_since_is_paged(self):
+        created = [LeaveFactory(status='pending') for _ in range(3)]
+        response = self.client.get(self.list_url, {'since': '0'})
+        self.assertEqual([item['id'] for item in response.data['data']], [self.old.id, created[0].id])
+        self.assertNotIn('sync_token', response.data)
+
+        # Updated mid-sync: moves past the cursor and comes again
+        created[0].reason = 'Changed'
+        created[0].save()
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in response.data['data']], [created[1].id, created[2].id])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in response.data['data']], [created[0].id])
+        self.assertIsNone(response.data['next'])
+        self.assertIn('sync_token', response.data)
+
+        response = self.client.get(self.list_url, {'since': '0', 'after': 'nonsense'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_and_expired_tokens(self):
+        response = self.client.get(self.list_url, {'since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        expired = make_sync_token(timezone.now() - timedelta(days=365))
+        response = self.client.get(self.list_url, {'since': expired})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_tombstones_are_scoped_to_the_caller(self):
+        own = LeaveFactory(status='pending')
+        other = LeaveFactory(status='pending')
+        own_id = own.id
+        own.delete()
+        other.delete()
+        self.client.force_authenticate(user=own.employee.user)
+        response = self.client.get(self.list_url, {'since': self.token})
+        self.assertEqual(response.data['deleted'], [own_id])
+
+    def test_approval_sync(self):
+        approval = decide(self.old, 'approve', self.user)
+        url = reverse('leaveapproval-list')
+        response = self.client.get(url, {'since': self.token})
+        self.assertEqual([item['id'] for item in response.data['data']], [approval.id])
+
+        approval_id = approval.id
+        self.client.delete(reverse('leaveapproval-detail', kwargs={'pk': approval_id}))
+        response = self.client.get(url, {'since': self.token})
+        self.assertEqual(response.data['data'], [])
+        self.assertEqual(response.data['deleted'], [approval_id])
+        self.assertTrue(Tombstone.objects.filter(model='leaves.leaveapproval', object_id=approval_id).exists())
+        # Reopening moved the leave back to pending, so it syncs too
+        response = self.client.get(self.list_url, {'since': self.token})
+        self.assertEqual([item['id'] for item in response.data['data']], [self.old.id])
+
+
+class PrincipalAuthorizationTests(APITestCase):
+    def setUp(self):
+        self.leave = LeaveFactory(status='pending')
+        self.other = LeaveFactory(status='pending')
+        token = PrincipalTokenObtainPairSerializer.get_token(self.leave.employee.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+    def test_employee_authorization_resolves_employee_once(self):
+        url = reverse('leave-detail', kwargs={'pk': self.leave.pk})
+        # User lookup (with the employee id), ETag validator, reports' version
+        # and the leave itself
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_employee_cannot_see_other_leaves(self):
+        response = self.client.get(reverse('leave-detail', kwargs={'pk': self.other.pk}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('leave-list'))
+        self.assertEqual([item['id'] for item in response.data['data']], [self.leave.id])
+
+    def test_employee_relinks_apply_before_token_expiry(self):
+        # The token still carries the old employee id; the database wins
+        employee = self.leave.employee
+        user = employee.user
+        employee.user = UserFactory()
+        employee.save()
+        self.other.employee.user = user
+        self.other.employee.save()
+        response = self.client.get(reverse('leave-list'))
+        self.assertEqual([item['id'] for item in response.data['data']], [self.other.id])
+
+    def test_role_changes_apply_before_token_expiry(self):
+        user = self.leave.employee.user
+        user.is_staff = True
+        user.save()
+        response = self.client.get(reverse('leave-detail', kwargs={'pk': self.other.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class PolicyTests(APITestCase):
+    def setUp(self):
+        self.leave = LeaveFactory(status='pending')
+        self.other = LeaveFactory(status='pending')
+        self.user = self.leave.employee.user
+        self.client.force_authenticate(user=self.user)
+
+    def test_unlisted_actions_are_denied(self):
+        response = self.client.post(reverse('leave-bulk-decide'), {'ids': [self.leave.id], 'decision': 'approve'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.delete(reverse('leave-detail', kwargs={'pk': self.leave.pk}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_scoping_happens_in_sql(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                reverse('leave-detail', kwargs={'pk': self.other.pk}), {'reason': 'Mine now'}, format='json'
+            )
+        self.assertNotEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(f'"employee_id" = {self.leave.employee_id}', queries[-1]['sql'])
+        self.other.refresh_from_db()
+        self.assertNotEqual(self.other.reason, 'Mine now')
+
+    def test_employees_see_only_their_approvals(self):
+        admin = UserFactory(is_staff=True)
+        own = decide(self.leave, 'approve', admin)
+        decide(self.other, 'approve', admin)
+        response = self.client.get(reverse('leaveapproval-list'))
+        self.assertEqual([item['id'] for item in response.data['data']], [own.id])
+
+    def test_admin_role_is_not_scoped(self):
+        self.user.role = 'admin'
+        self.user.save()
+        response = self.client.get(reverse('leave-detail', kwargs={'pk': self.other.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class OrgLeavesTests(APITestCase):
+    def setUp(self):
+        # head > manager > report > intern, head > peer
+        self.head = EmployeeFactory()
+        self.manager = EmployeeFactory(reports_to=self.head)
+        self.report = EmployeeFactory(reports_to=self.manager)
+        self.intern = EmployeeFactory(reports_to=self.report)
+        self.peer = EmployeeFactory(reports_to=self.head)
+        self.leaves = {
+            employee.pk: LeaveFactory(employee=employee, status='pending')
+            for employee in (self.head, self.manager, self.report, self.intern, self.peer)
+        }
+        self.client.force_authenticate(user=UserFactory(is_staff=True))
+        self.url = reverse('leave-list')
+
+    def org_leaves(self, employee):
+        response = self.client.get(self.url, {'org_of': employee.pk})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['employee'] for item in response.data['data']}
+
+    def test_org_of_returns_the_whole_subtree(self):
+        self.assertEqual(self.org_leaves(self.manager), {self.report.pk, self.intern.pk})
+        self.assertEqual(
+            self.org_leaves(self.head), {self.manager.pk, self.report.pk, self.intern.pk, self.peer.pk}
+        )
+        self.assertEqual(self.org_leaves(self.intern), set())
+
+    def test_org_of_follows_manager_changes(self):
+        self.report.reports_to = self.peer
+        self.report.save()
+        self.assertEqual(self.org_leaves(self.manager), set())
+        self.assertEqual(self.org_leaves(self.peer), {self.report.pk, self.intern.pk})
+
+    def test_org_of_is_one_join_whatever_the_depth(self):
+        self.org_leaves(self.manager)  # warm up
+        with CaptureQueriesContext(connection) as shallow:
+            self.org_leaves(self.report)
+        with CaptureQueriesContext(connection) as deep:
+            self.org_leaves(self.head)
+        self.assertEqual(len(shallow), len(deep))
+        self.assertIn('employees_reportingline', deep[-1]['sql'])
+
+    def test_etag_follows_manager_changes(self):
+        # Swap one report for another whose leave is older than the newest
+        # one: the leaves' count and latest timestamp stay the same, only the
+        # hierarchy changed
+        outsider = EmployeeFactory()
+        leave = LeaveFactory(employee=outsider, status='pending')
+        Leave.objects.filter(pk=leave.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        Leave.objects.filter(pk=self.leaves[self.report.pk].pk).update(updated_at=timezone.now() + timedelta(days=1))
+        scoped = [(UserFactory(is_staff=True), {'org_of': self.manager.pk}), (self.manager.user, {})]
+        etags = []
+        for user, params in scoped:
+            self.client.force_authenticate(user=user)
+            etags.append(self.client.get(self.url, params)['ETag'])
+
+        self.intern.reports_to = self.peer
+        self.intern.save()
+        outsider.reports_to = self.report
+        outsider.save()
+        for (user, params), etag in zip(scoped, etags):
+            self.client.force_authenticate(user=user)
+            response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn(outsider.pk, {item['employee'] for item in response.data['data']})
+
+    def test_manager_delta_sync_follows_reports(self):
+        self.client.force_authenticate(user=self.manager.user)
+        token = make_sync_token(timezone.now())
+        removed = self.leaves[self.intern.pk].id
+        self.leaves[self.intern.pk].delete()
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], [removed])
+
+        # The report's leaves are unchanged, so only a full sync can drop them
+        # for the old manager or bring them to the new one
+        self.report.reports_to = self.peer
+        self.report.save()
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.client.force_authenticate(user=self.peer.user)
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        # The head sees the same people as before
+        self.client.force_authenticate(user=self.head.user)
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_org_of(self):
+        response = self.client.get(self.url, {'org_of': 'me'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_managers_read_their_reports_leaves(self):
+        self.client.force_authenticate(user=self.manager.user)
+        response = self.client.get(self.url)
+        self.assertEqual(
+            {item['employee'] for item in response.data['data']}, {self.manager.pk, self.report.pk, self.intern.pk}
+        )
+        self.assertEqual(self.org_leaves(self.head), {self.manager.pk, self.report.pk, self.intern.pk})
+
+        response = self.client.patch(
+            reverse('leave-detail', kwargs={'pk': self.leaves[self.report.pk].pk}), {'reason': 'Mine'}, format='json'
+        )
+        self.assertNotEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,185 @@
+from datetime import date, timedelta
+from itertools import count
+from django.urls import reverse
+from apps.authentication.models import User
+from apps.authentication.tests.factories import UserFactory
+from apps.core.testing import QueryBudget, QueryBudgetTestCase
+from apps.employees.models import Employee
+from apps.employees.tests.factories import EmployeeFactory
+from apps.leaves.intervals import leave_index
+from apps.leaves.leave_type_cache import leave_type_cache
+from apps.leaves.models import Leave, LeaveApproval, LeaveType
+from apps.leaves.services import decide
+from apps.leaves.views import LeaveApprovalViewSet, LeaveTypeViewSet, LeaveViewSet
+from ..factories import LeaveFactory, LeaveTypeFactory
+
+sequence = count()
+START = date(2024, 3, 1)
+
+
+def make_employee(test):
+    n = next(sequence)
+    return EmployeeFactory(
+        created_by=test.user,
+        user=UserFactory(username=f'budget{n}', email=f'budget{n}@example.com'),
+        email=f'budget{n}@example.com',
+    )
+
+
+def make_leave(test):
+    return LeaveFactory(
+        employee=make_employee(test), leave_type=test.leave_type,
+        start_date=START, end_date=START + timedelta(days=2), status='pending',
+    )
+
+
+def make_leaves(test, number, employee=None):
+    """
+    Bulk-create ``number`` leaves, each with its own employee and leave type
+    unless ``employee`` is given, so per-row lookups show up in the counts.
+    """
+    numbers = [next(sequence) for _ in range(number)]
+    if employee is None:
+        users = User.objects.bulk_create([
+            User(username=f'budget{n}', email=f'budget{n}@example.com') for n in numbers
+        ])
+        employees = Employee.objects.bulk_create([
+            Employee(user=user, created_by=test.user, first_name='Budget', last_name=str(n),
+                     email=user.email, department='Engineering', position='Developer',
+                     salary=50000, hire_date=START)
+            for user, n in zip(users, numbers)
+        ])
+    else:
+        employees = [employee] * number
+    leave_types = LeaveType.objects.bulk_create([LeaveType(name=f'Type {n}', max_days=30) for n in numbers])
+    Leave.objects.bulk_create([
+        Leave(employee=employee, leave_type=leave_type, reason='Budget', status='pending',
+              start_date=START + timedelta(days=3 * i), end_date=START + timedelta(days=3 * i + 1))
+        for i, (employee, leave_type) in enumerate(zip(employees, leave_types))
+    ])
+    # bulk_create sends no signals, so drop the process-local caches by hand
+    leave_type_cache.invalidate()
+    leave_index.invalidate()
+
+
+def make_own_leaves(test, number):
+    make_leaves(test, number, employee=test.employee)
+
+
+def make_leave_types(test, number):
+    LeaveType.objects.bulk_create([LeaveType(name=f'Type {next(sequence)}', max_days=30) for _ in range(number)])
+    leave_type_cache.invalidate()
+
+
+def make_approvals(test, number):
+    make_leaves(test, number)
+    approvers = User.objects.bulk_create([
+        User(username=f'approver{n}', email=f'approver{n}@example.com', is_staff=True)
+        for n in (next(sequence) for _ in range(number))
+    ])
+    pending = Leave.objects.filter(status='pending', approval__isnull=True).exclude(pk=test.leave.pk)
+    LeaveApproval.objects.bulk_create([
+        LeaveApproval(leave_id=leave_id, approver=approver)
+        for leave_id, approver in zip(pending.values_list('id', flat=True), approvers)
+    ])
+
+
+def make_approval(test):
+    return decide(make_leave(test), 'approve', test.user)
+
+
+def leave_payload(test, employee):
+    return {
+        'employee': employee.pk,
+        'leave_type': test.leave_type.pk,
+        'start_date': '2024-05-06',
+        'end_date': '2024-05-08',
+        'reason': 'Holiday',
+    }
+
+
+def leave_type_payload():
+    return {'name': f'Type {next(sequence)}', 'description': 'Budget', 'max_days': 10}
+
+
+def detail(name, obj):
+    return reverse(f'{name}-detail', kwargs={'pk': obj.pk})
+
+
+def action(name, obj):
+    return reverse(f'leave-{name}', kwargs={'pk': obj.pk})
+
+
+class LeaveQueryBudgetTests(QueryBudgetTestCase):
+    views = (LeaveViewSet, LeaveTypeViewSet, LeaveApprovalViewSet)
+    budgets = (
+        QueryBudget(LeaveViewSet, 'list', 2, populate=make_leaves,
+                    request=lambda test, _: test.client.get(reverse('leave-list'), {'expand': 'employee'})),
+        QueryBudget(LeaveViewSet, 'retrieve', 2, populate=make_leaves,
+                    request=lambda test, _: test.client.get(detail('leave', test.leave), {'expand': 'employee'})),
+        QueryBudget(LeaveViewSet, 'create', 9, populate=make_leaves, target=make_employee, status=201,
+                    request=lambda test, employee: test.client.post(
+                        reverse('leave-list'), leave_payload(test, employee), format='json')),
+        QueryBudget(LeaveViewSet, 'update', 7, populate=make_leaves, target=make_leave,
+                    request=lambda test, leave: test.client.put(
+                        detail('leave', leave), leave_payload(test, leave.employee), format='json')),
+        QueryBudget(LeaveViewSet, 'partial_update', 2, populate=make_leaves,
+                    request=lambda test, _: test.client.patch(
+                        detail('leave', test.leave), {'reason': 'Updated'}, format='json')),
+        QueryBudget(LeaveViewSet, 'destroy', 5, populate=make_leaves, target=make_leave,
+                    request=lambda test, leave: test.client.delete(detail('leave', leave))),
+        QueryBudget(LeaveViewSet, 'my_leaves', 2, populate=make_own_leaves,
+                    request=lambda test, _: test.client.get(reverse('leave-my-leaves'))),
+        QueryBudget(LeaveViewSet, 'export', 1, populate=make_leaves,
+                    request=lambda test, _: test.client.get(reverse('leave-export'))),
+        QueryBudget(LeaveViewSet, 'out', 1, populate=make_leaves,
+                    request=lambda test, _: test.client.get(reverse('leave-out'), {'from': START.isoformat()})),
+        QueryBudget(LeaveViewSet, 'approve', 6, populate=make_leaves, target=make_leave,
+                    request=lambda test, leave: test.client.post(action('approve', leave), format='json')),
+        QueryBudget(LeaveViewSet, 'reject', 6, populate=make_leaves, target=make_leave,
+                    request=lambda test, leave: test.client.post(action('reject', leave), format='json')),
+        QueryBudget(LeaveViewSet, 'bulk_decide', 7, populate=make_leaves,
+                    target=lambda test: [make_leave(test).pk, make_leave(test).pk],
+                    request=lambda test, ids: test.client.post(
+                        reverse('leave-bulk-decide'), {'ids': ids, 'decision': 'approve'}, format='json')),
+
+        QueryBudget(LeaveTypeViewSet, 'list', 1, populate=make_leave_types,
+                    request=lambda test, _: test.client.get(reverse('leavetype-list'))),
+        QueryBudget(LeaveTypeViewSet, 'retrieve', 1, populate=make_leave_types,
+                    request=lambda test, _: test.client.get(detail('leavetype', test.leave_type))),
+        QueryBudget(LeaveTypeViewSet, 'create', 1, populate=make_leave_types, status=201,
+                    request=lambda test, _: test.client.post(
+                        reverse('leavetype-list'), leave_type_payload(), format='json')),
+        QueryBudget(LeaveTypeViewSet, 'update', 2, populate=make_leave_types,
+                    request=lambda test, _: test.client.put(
+                        detail('leavetype', test.leave_type), leave_type_payload(), format='json')),
+        QueryBudget(LeaveTypeViewSet, 'partial_update', 2, populate=make_leave_types,
+                    request=lambda test, _: test.client.patch(
+                        detail('leavetype', test.leave_type), {'max_days': 12}, format='json')),
+        QueryBudget(LeaveTypeViewSet, 'destroy', 4, populate=make_leave_types,
+                    target=lambda test: LeaveTypeFactory(),
+                    request=lambda test, leave_type: test.client.delete(detail('leavetype', leave_type))),
+
+        QueryBudget(LeaveApprovalViewSet, 'list', 1, populate=make_approvals,
+                    request=lambda test, _: test.client.get(reverse('leaveapproval-list'), {'expand': 'approver'})),
+        QueryBudget(LeaveApprovalViewSet, 'retrieve', 1, populate=make_approvals, target=make_approval,
+                    request=lambda test, approval: test.client.get(detail('leaveapproval', approval))),
+        QueryBudget(LeaveApprovalViewSet, 'create', 7, populate=make_approvals, target=make_leave, status=201,
+                    request=lambda test, leave: test.client.post(
+                        reverse('leaveapproval-list'), {'leave': leave.pk}, format='json')),
+        QueryBudget(LeaveApprovalViewSet, 'update', 2, populate=make_approvals, target=make_approval,
+                    request=lambda test, approval: test.client.put(
+                        detail('leaveapproval', approval), {'comments': 'Enjoy'}, format='json')),
+        QueryBudget(LeaveApprovalViewSet, 'partial_update', 2, populate=make_approvals, target=make_approval,
+                    request=lambda test, approval: test.client.patch(
+                        detail('leaveapproval', approval), {'comments': 'Enjoy'}, format='json')),
+        QueryBudget(LeaveApprovalViewSet, 'destroy', 8, populate=make_approvals, target=make_approval,
+                    request=lambda test, approval: test.client.delete(detail('leaveapproval', approval))),
+    )
+
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.employee = EmployeeFactory(user=self.user, created_by=self.user, email=self.user.email)
+        self.leave_type = LeaveTypeFactory(max_days=30)
+        self.leave = make_leave(self)
@@ -1,16 +1,21 @@
+from django.http import Http404
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from apps.core.compiled import CompiledListMixin
+from apps.core.policies import PolicyScopedMixin
+from apps.core.sync import DeltaSyncMixin
 from ..models import LeaveApproval
 from ..serializers import LeaveApprovalSerializer
 from ..middleware import EmployeeRolePermission
+from ..services import decide, reopen
 import logging
 
 logger = logging.getLogger(__name__)
 
-class LeaveApprovalViewSet(viewsets.ModelViewSet):
+class LeaveApprovalViewSet(CompiledListMixin, PolicyScopedMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     queryset = LeaveApproval.objects.all()
     serializer_class = LeaveApprovalSerializer
     permission_classes = [IsAuthenticated, EmployeeRolePermission]
@@ -27,10 +32,10 @@ class LeaveApprovalViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         try:
-            queryset = LeaveApproval.objects.all()
-            if not self.request.user.is_admin():
-                # Regular users can only see their own leave approvals
-                queryset = queryset.filter(leave__employee__user=self.request.user)
+            # Regular users can only see their own leave approvals
+            queryset = self.scope_queryset(LeaveApproval.objects.all())
+            if self.action == 'list':
+                return self.get_serializer().optimize_queryset(queryset)
             return queryset.select_related('leave', 'approver', 'leave__employee')
         except Exception as e:
             logger.error(f"Error in get_queryset: {str(e)}")
@@ -59,17 +64,13 @@ class LeaveApprovalViewSet(viewsets.ModelViewSet):
                         'message': f'Leave is already {leave.status}'
                     }, status=status.HTTP_400_BAD_REQUEST)
 
-                # Check if leave already has an approval
-                if LeaveApproval.objects.filter(leave=leave).exists():
+                # Approve only if the leave is still pending at write time
+                approval = decide(leave, 'approve', request.user, serializer.validated_data.get('comments', ''))
+                if approval is None:
                     return Response({
-                        'message': 'Leave already has an approval'
+                        'message': 'Leave has already been decided'
                     }, status=status.HTTP_400_BAD_REQUEST)
-
-                self.perform_create(serializer)
-                
-                # Update leave status
-                leave.status = 'approved'
-                leave.save()
+                serializer.instance = approval
 
                 if request.accepted_renderer.format in ['api', 'html']:
                     return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -133,12 +134,8 @@ class LeaveApprovalViewSet(viewsets.ModelViewSet):
             # Store approval info before deletion
             approval_info = f"Approval for {instance.leave}"
             
-            # Update leave status back to pending
-            leave = instance.leave
-            leave.status = 'pending'
-            leave.save()
-            
-            self.perform_destroy(instance)
+            # Delete the approval and move the leave back to pending
+            reopen(instance)
             return Response({
                 'message': f'{approval_info} deleted successfully'
             }, status=status.HTTP_200_OK)
@@ -152,13 +149,6 @@ class LeaveApprovalViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
-            
-            # Check if user has permission to view this approval
-            if not request.user.is_admin() and instance.leave.employee.user != request.user:
-                return Response({
-                    'message': 'You do not have permission to view this approval'
-                }, status=status.HTTP_403_FORBIDDEN)
-                
             serializer = self.get_serializer(instance)
             if request.accepted_renderer.format in ['api', 'html']:
                 return Response(serializer.data)
@@ -166,7 +156,7 @@ class LeaveApprovalViewSet(viewsets.ModelViewSet):
                 'message': 'Leave approval retrieved successfully',
                 'data': serializer.data
             })
-        except LeaveApproval.DoesNotExist:
+        except (LeaveApproval.DoesNotExist, Http404):
             return Response({
                 'message': 'Leave approval not found'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -180,12 +170,14 @@ class LeaveApprovalViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         try:
             queryset = self.filter_queryset(self.get_queryset())
-            serializer = self.get_serializer(queryset, many=True)
+            if self.is_sync_request(request):
+                return self.sync_list(request, queryset)
+            data = self.serialize_many(queryset)
             if request.accepted_renderer.format in ['api', 'html']:
-                return Response(serializer.data)
+                return Response(data)
             return Response({
                 'message': 'Leave approvals retrieved successfully',
-                'data': serializer.data
+                'data': data
             })
         except Exception as e:
             logger.error(f"Error in list: {str(e)}")
@@ -1,6 +1,10 @@
+import hashlib
+from django.http import Http404, HttpResponse
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from apps.core.conditional import ConditionalGetMixin
+from ..leave_type_cache import leave_type_cache
 from ..models import LeaveType
 from ..serializers import LeaveTypeSerializer
 from ..middleware import EmployeeRolePermission
@@ -8,7 +12,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-class LeaveTypeViewSet(viewsets.ModelViewSet):
+class LeaveTypeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = LeaveType.objects.all()
     serializer_class = LeaveTypeSerializer
     permission_classes = [IsAuthenticated, EmployeeRolePermission]
@@ -23,6 +27,25 @@ class LeaveTypeViewSet(viewsets.ModelViewSet):
             context['response'] = self.get_object() if self.action in ['retrieve', 'update', 'partial_update'] else None
         return context
 
+    def get_object(self):
+        # Reads are answered from the leave type cache; writes load the row
+        if self.action != 'retrieve':
+            return super().get_object()
+        try:
+            leave_type = leave_type_cache.get(int(self.kwargs[self.lookup_url_kwarg or self.lookup_field]))
+        except ValueError:
+            leave_type = None
+        if leave_type is None:
+            raise Http404
+        self.check_object_permissions(self.request, leave_type)
+        return leave_type
+
+    def get_etag(self, request):
+        # Every caller sees the same leave types, so the cache fingerprint is
+        # the validator and no aggregate query is needed
+        raw = f'{leave_type_cache.version}:{self.action}:{request.get_full_path()}'
+        return '"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
     def create(self, request, *args, **kwargs):
         try:
             serializer = self.get_serializer(data=request.data)
@@ -96,7 +119,7 @@ class LeaveTypeViewSet(viewsets.ModelViewSet):
                 'message': 'Leave type retrieved successfully',
                 'data': serializer.data
             })
-        except LeaveType.DoesNotExist:
+        except (LeaveType.DoesNotExist, Http404):
             return Response({
                 'message': 'Leave type not found'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -109,6 +132,13 @@ class LeaveTypeViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         try:
+            # The plain JSON list is rendered once per cache version
+            if (
+                request.accepted_renderer.format == 'json'
+                and not request.query_params
+                and 'indent' not in request.accepted_media_type
+            ):
+                return HttpResponse(leave_type_cache.list_body(), content_type='application/json')
             queryset = self.filter_queryset(self.get_queryset())
             serializer = self.get_serializer(queryset, many=True)
             if request.accepted_renderer.format in ['api', 'html']:
@@ -1,19 +1,38 @@
+from datetime import date
+from django.http import Http404
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.core.exceptions import ObjectDoesNotExist
-from ..models import Leave, LeaveApproval
-from ..serializers import LeaveSerializer
+from django.db.models import F
+from apps.authentication.principal import get_principal
+from apps.core.compiled import CompiledListMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.policies import ManagedRule, PolicyScopedMixin
+from apps.core.exports import EXPORT_CONTENT_TYPES, EXPORT_FORMAT_PARAM, stream_export
+from apps.core.sync import DeltaSyncMixin
+from apps.employees.departments import resolve_departments
+from apps.employees.hierarchy import subtree, subtree_version
+from apps.employees.models import Employee
+from ..intervals import leave_index
+from ..leave_type_cache import leave_type_cache
+from ..models import HolidayCalendar, Leave
+from ..serializers import LeaveSerializer, BulkDecisionSerializer
+from ..services import bulk_decide, decide
+from ..workdays import get_default_calculator
 from ..middleware import EmployeeRolePermission
+from ..pagination import LeaveCursorPagination
 import logging
 
 logger = logging.getLogger(__name__)
 
-class LeaveViewSet(viewsets.ModelViewSet):
+class LeaveViewSet(CompiledListMixin, PolicyScopedMixin, ConditionalGetMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     queryset = Leave.objects.all()
     serializer_class = LeaveSerializer
     permission_classes = [IsAuthenticated, EmployeeRolePermission]
+    pagination_class = LeaveCursorPagination
+    read_actions = ('list', 'retrieve', 'my_leaves')
 
     def get_renderer_context(self):
         context = super().get_renderer_context()
@@ -27,29 +46,72 @@ class LeaveViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         try:
-            queryset = Leave.objects.all()
-            if not self.request.user.is_staff:
-                # Get the employee associated with the current user
-                try:
-                    employee = self.request.user.employee_profile
-                    queryset = queryset.filter(employee=employee)
-                except ObjectDoesNotExist:
-                    logger.error(f"No employee record found for user {self.request.user.id}")
-                    return Leave.objects.none()
+            # Employees only ever see their own leaves (see apps.leaves.policies)
+            queryset = self.scope_queryset(Leave.objects.all())
+            if self.action in self.read_actions:
+                # Only join and select what the requested fields/expansions need
+                return self.get_serializer().optimize_queryset(queryset, extra=self.pagination_columns())
             return queryset.select_related('employee', 'leave_type')
         except Exception as e:
             logger.error(f"Error in get_queryset: {str(e)}")
             return Leave.objects.none()
 
+    def get_org_of(self):
+        """The employee id of ``?org_of=`` on list requests, or None."""
+        org_of = self.request.query_params.get('org_of')
+        if org_of is None or self.action != 'list':
+            return None
+        try:
+            return int(org_of)
+        except ValueError:
+            raise ValidationError({'org_of': ['Must be an employee id.']})
+
+    def filter_queryset(self, queryset):
+        """``?org_of=<employee id>`` keeps the leaves of everyone reporting to that employee."""
+        queryset = super().filter_queryset(queryset)
+        org_of = self.get_org_of()
+        if org_of is None:
+            return queryset
+        # A semi-join on the (ancestor, descendant) index, whatever the depth
+        return queryset.filter(employee_id__in=subtree(org_of))
+
+    def pagination_columns(self):
+        return [field.lstrip('-') for field in self.pagination_class.ordering]
+
+    def get_etag_components(self, request):
+        components = []
+        if 'leave_type_details' in self.get_serializer().fields:
+            # Expanded leave types come from the cache rather than a join
+            components.append(leave_type_cache.version)
+        if request.query_params.get('duration') == 'working':
+            # Working-day durations also depend on the default calendar: its
+            # weekmask and every holiday date (holidays carry no timestamp)
+            components.append(list(
+                HolidayCalendar.objects.filter(is_default=True)
+                .order_by('pk', 'holidays__date')
+                .values_list('pk', 'weekmask', 'updated_at', 'holidays__date')
+            ))
+        # Subtree-scoped results change when someone's reports_to does, even
+        # if none of the leaves do
+        org_of = self.get_org_of()
+        if org_of is not None:
+            components.append(subtree_version(org_of))
+        principal = get_principal(request)
+        if isinstance(self.get_policy_rule(), ManagedRule) and principal.employee_id is not None:
+            components.append(subtree_version(principal.employee_id))
+        return components
+
     def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
+            if self.is_sync_request(request):
+                return self.sync_list(request, queryset)
+            data = self.serialize_page(queryset, extra=self.pagination_columns())
             if request.accepted_renderer.format in ['api', 'html']:
-                return Response(serializer.data)
-            return Response({
+                return self.get_paginated_response(data)
+            return self.get_paginated_response({
                 'message': 'Leaves retrieved successfully',
-                'data': serializer.data
+                'data': data
             })
         except Exception as e:
             logger.error(f"Error in list view: {str(e)}")
@@ -61,12 +123,6 @@ class LeaveViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
-            # Check if user has permission to view this leave
-            if not request.user.is_staff and instance.employee.user != request.user:
-                return Response({
-                    'message': 'You do not have permission to view this leave'
-                }, status=status.HTTP_403_FORBIDDEN)
-                
             serializer = self.get_serializer(instance)
             if request.accepted_renderer.format in ['api', 'html']:
                 return Response(serializer.data)
@@ -74,7 +130,7 @@ class LeaveViewSet(viewsets.ModelViewSet):
                 'message': 'Leave retrieved successfully',
                 'data': serializer.data
             })
-        except Leave.DoesNotExist:
+        except (Leave.DoesNotExist, Http404):
             return Response({
                 'message': 'Leave not found'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -87,16 +143,10 @@ class LeaveViewSet(viewsets.ModelViewSet):
 
     def create(self, request, *args, **kwargs):
         try:
-            # If user is not staff, set employee to current user's employee
-            if not request.user.is_staff:
-                try:
-                    employee = request.user.employee_profile
-                    data = request.data.copy()
-                    data['employee'] = employee.id
-                except ObjectDoesNotExist:
-                    return Response({
-                        'message': 'No employee record found for current user',
-                    }, status=status.HTTP_400_BAD_REQUEST)
+            # Employees can only file leaves for themselves
+            if self.get_policy_rule().owner_field is not None:
+                data = request.data.copy()
+                data['employee'] = get_principal(request).employee_id
             else:
                 data = request.data
 
@@ -147,11 +197,6 @@ class LeaveViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
-            # Check if user has permission to delete this leave
-            if not request.user.is_staff and instance.employee.user != request.user:
-                return Response({
-                    'message': 'You do not have permission to delete this leave'
-                }, status=status.HTTP_403_FORBIDDEN)
 
             # Store leave info before deletion
             leave_info = f"Leave for {instance.employee} ({instance.start_date} to {instance.end_date})"
@@ -159,7 +204,7 @@ class LeaveViewSet(viewsets.ModelViewSet):
             return Response({
                 'message': f'{leave_info} deleted successfully'
             }, status=status.HTTP_200_OK)
-        except Leave.DoesNotExist:
+        except (Leave.DoesNotExist, Http404):
             return Response({
                 'message': 'Leave not found'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -173,17 +218,16 @@ class LeaveViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_leaves(self, request):
         try:
-            employee = request.user.employee_profile
-            leaves = self.get_queryset().filter(employee=employee)
-            serializer = self.get_serializer(leaves, many=True)
-            return Response({
+            employee_id = get_principal(request).employee_id
+            if employee_id is None:
+                return Response({
+                    'message': 'No employee record found for current user',
+                }, status=status.HTTP_400_BAD_REQUEST)
+            leaves = self.get_queryset().filter(employee_id=employee_id)
+            return self.get_paginated_response({
                 'message': 'Your leaves retrieved successfully',
-                'data': serializer.data
+                'data': self.serialize_page(leaves, extra=self.pagination_columns())
             })
-        except ObjectDoesNotExist:
-            return Response({
-                'message': 'No employee record found for current user',
-            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error in my_leaves: {str(e)}")
             return Response({
@@ -191,6 +235,83 @@ class LeaveViewSet(viewsets.ModelViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        output = request.query_params.get(EXPORT_FORMAT_PARAM, 'ndjson')
+        if output not in EXPORT_CONTENT_TYPES:
+            return Response({
+                'message': f"Unsupported export format '{output}'",
+                'formats': list(EXPORT_CONTENT_TYPES),
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset().select_related(None).order_by('id')
+        calculator = get_default_calculator()
+        return stream_export(
+            queryset,
+            fields=('id', 'employee_id', 'leave_type_id', 'start_date', 'end_date',
+                    'reason', 'status', 'created_at', 'updated_at'),
+            expressions={
+                'employee_first_name': F('employee__first_name'),
+                'employee_last_name': F('employee__last_name'),
+                'department': F('employee__department'),
+                'leave_type_name': F('leave_type__name'),
+            },
+            computed={
+                'working_days': lambda row: calculator.count(row['start_date'], row['end_date']),
+            },
+            output=output,
+            filename='leaves',
+        )
+
+    @action(detail=False, methods=['get'])
+    def out(self, request):
+        try:
+            start_date = date.fromisoformat(request.query_params['from'])
+            end_date = date.fromisoformat(request.query_params.get('to') or request.query_params['from'])
+        except (KeyError, ValueError):
+            return Response({
+                'message': "Query parameters 'from' and 'to' must be dates in YYYY-MM-DD format"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if start_date > end_date:
+            return Response({
+                'message': "'to' must not be before 'from'"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            department = request.query_params.get('department')
+            if department:
+                department = resolve_departments([department], create=False)[department]
+                matches = leave_index.overlapping(start_date, end_date, department.pk) if department else []
+            else:
+                matches = leave_index.overlapping(start_date, end_date)
+            employees = {
+                row['id']: row
+                for row in Employee.objects.filter(id__in={match[1] for match in matches})
+                .values('id', 'first_name', 'last_name', 'department')
+            }
+            data = [
+                {
+                    'leave': leave_id,
+                    'employee': employee_id,
+                    'employee_name': f"{employees[employee_id]['first_name']} {employees[employee_id]['last_name']}",
+                    'department': employees[employee_id]['department'],
+                    'start_date': leave_start,
+                    'end_date': leave_end,
+                }
+                for leave_id, employee_id, leave_start, leave_end in sorted(matches, key=lambda match: (match[2], match[0]))
+                if employee_id in employees
+            ]
+            return Response({
+                'message': 'Employees on leave retrieved successfully',
+                'data': data
+            })
+        except Exception as e:
+            logger.error(f"Error in out: {str(e)}")
+            return Response({
+                'message': 'Error retrieving employees on leave',
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         try:
@@ -200,14 +321,11 @@ class LeaveViewSet(viewsets.ModelViewSet):
                     'message': 'Leave is not in pending status'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            leave.status = 'approved'
-            leave.save()
-
-            LeaveApproval.objects.create(
-                leave=leave,
-                approver=request.user,
-                comments=request.data.get('comments', '')
-            )
+            approval = decide(leave, 'approve', request.user, request.data.get('comments', ''))
+            if approval is None:
+                return Response({
+                    'message': 'Leave is not in pending status'
+                }, status=status.HTTP_400_BAD_REQUEST)
 
             return Response({
                 'message': 'Leave approved successfully',
@@ -229,14 +347,11 @@ class LeaveViewSet(viewsets.ModelViewSet):
                     'message': 'Leave is not in pending status'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            leave.status = 'rejected'
-            leave.save()
-
-            LeaveApproval.objects.create(
-                leave=leave,
-                approver=request.user,
-                comments=request.data.get('comments', '')
-            )
+            approval = decide(leave, 'reject', request.user, request.data.get('comments', ''))
+            if approval is None:
+                return Response({
+                    'message': 'Leave is not in pending status'
+                }, status=status.HTTP_400_BAD_REQUEST)
 
             return Response({
                 'message': 'Leave rejected successfully',
@@ -248,3 +363,30 @@ class LeaveViewSet(viewsets.ModelViewSet):
                 'message': 'Error rejecting leave',
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['post'])
+    def bulk_decide(self, request):
+        serializer = BulkDecisionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'message': 'Error processing bulk decision',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            outcomes = bulk_decide(
+                serializer.validated_data['ids'],
+                serializer.validated_data['decision'],
+                request.user,
+                serializer.validated_data['comments'],
+            )
+            updated = sum(1 for outcome in outcomes if outcome['outcome'] == 'updated')
+            return Response({
+                'message': f'{updated} of {len(outcomes)} leaves updated',
+                'data': outcomes
+            })
+        except Exception as e:
+            logger.error(f"Error in bulk_decide: {str(e)}")
+            return Response({
+                'message': 'Error processing bulk decision',
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,25 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks.runner import run
+
+
+class Command(BaseCommand):
+    help = 'Time the main API endpoints against the seeded benchmark dataset and report JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--only', nargs='+', help='Scenario names, e.g. leaves.list auth.login')
+        parser.add_argument('--output', help='Write the report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        try:
+            report = run(iterations=options['iterations'], only=options['only'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        body = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(body + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(body)
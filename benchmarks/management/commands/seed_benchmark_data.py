@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks.seed import parse_size, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed employees, user accounts and leaves for benchmarking with bulk_create. '
+        'Use a dedicated database (e.g. DB_NAME=benchmark.sqlite3).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('size', help="Number of employees: 10k, 100k, 1m or an integer")
+        parser.add_argument('--leaves-per-employee', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        try:
+            employees = parse_size(options['size'])
+        except ValueError:
+            raise CommandError(f"Invalid size '{options['size']}'")
+        seed(
+            employees,
+            leaves_per_employee=options['leaves_per_employee'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Benchmark dataset has {employees} employees'))
@@ -0,0 +1,150 @@
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.employees.models import Employee
+from apps.leaves.models import Leave, LeaveType
+from .seed import ADMIN_EMAIL, PASSWORD, User, seeded_employees
+
+# Objects each detail scenario cycles through
+SAMPLE_SIZE = 100
+
+
+class Scenario:
+    """One endpoint call; ``request(client, i)`` performs the i-th iteration."""
+
+    def __init__(self, name, request, authenticated=True):
+        self.name = name
+        self.request = request
+        self.authenticated = authenticated
+
+
+def build_scenarios(sample):
+    employees, leaves, pending = sample['employees'], sample['leaves'], sample['pending']
+    leave_type, employee_user = sample['leave_type'], sample['employee_email']
+
+    def create_leave(client, i):
+        start = timezone.now().date() + timedelta(days=400 + i)
+        return client.post(reverse('leave-list'), {
+            'employee': employees[i % len(employees)],
+            'leave_type': leave_type,
+            'start_date': start.isoformat(),
+            'end_date': start.isoformat(),
+            'reason': 'Benchmark',
+        }, format='json')
+
+    return [
+        Scenario('employees.list', lambda client, i: client.get(reverse('employee-list'))),
+        Scenario('employees.retrieve', lambda client, i: client.get(
+            reverse('employee-detail', kwargs={'pk': employees[i % len(employees)]}))),
+        Scenario('leaves.list', lambda client, i: client.get(reverse('leave-list'))),
+        Scenario('leaves.retrieve', lambda client, i: client.get(
+            reverse('leave-detail', kwargs={'pk': leaves[i % len(leaves)]}))),
+        Scenario('leaves.create', create_leave),
+        Scenario('leaves.approve', lambda client, i: client.post(
+            reverse('leave-approve', kwargs={'pk': pending[i % len(pending)]}), format='json')),
+        Scenario('auth.login', lambda client, i: client.post(
+            reverse('token_obtain_pair'), {'email': employee_user, 'password': PASSWORD}, format='json'),
+            authenticated=False),
+    ]
+
+
+def load_sample():
+    employees = list(seeded_employees().order_by('id').values_list('id', flat=True)[:SAMPLE_SIZE])
+    if not employees:
+        raise ValueError('No benchmark data found; run seed_benchmark_data first')
+    return {
+        'employees': employees,
+        'employee_email': Employee.objects.get(pk=employees[0]).email,
+        'leaves': list(Leave.objects.filter(employee_id__in=employees).values_list('id', flat=True)),
+        'pending': list(
+            Leave.objects.filter(employee_id__in=employees, status='pending').values_list('id', flat=True)
+        ) or [0],
+        'leave_type': LeaveType.objects.values_list('id', flat=True).first(),
+    }
+
+
+def percentile(values, q):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+def measure(scenario, client, iterations):
+    """
+    Run ``scenario`` ``iterations`` times, each inside a transaction that is
+    rolled back so writes do not accumulate, then once more under tracemalloc
+    for peak memory (kept out of the timed runs because tracing slows Python).
+    """
+    latencies, queries, statuses = [], [], {}
+
+    def call(i):
+        with transaction.atomic():
+            response = scenario.request(client, i)
+            transaction.set_rollback(True)
+        return response
+
+    call(0)  # warm caches and imports
+    for i in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = call(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    tracemalloc.start()
+    try:
+        call(iterations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'queries_median': statistics.median(queries),
+        'queries_max': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def run(iterations=50, only=None):
+    """Benchmark every scenario (or those named in ``only``) and return a JSON-ready report."""
+    sample = load_sample()
+    admin = User.objects.get(email=ADMIN_EMAIL)
+    # The test client's default 'testserver' host is not in ALLOWED_HOSTS here
+    host = next((host for host in settings.ALLOWED_HOSTS if host not in ('*', '')), 'localhost')
+    authenticated, anonymous = APIClient(HTTP_HOST=host), APIClient(HTTP_HOST=host)
+    authenticated.force_authenticate(user=admin)
+
+    results = {}
+    for scenario in build_scenarios(sample):
+        if only and scenario.name not in only:
+            continue
+        client = authenticated if scenario.authenticated else anonymous
+        results[scenario.name] = measure(scenario, client, iterations)
+
+    return {
+        'meta': {
+            'timestamp': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'employees': seeded_employees().count(),
+            'leaves': Leave.objects.count(),
+        },
+        'results': results,
+    }
@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import transaction
+from apps.employees.departments import resolve_departments
+from apps.employees.models import Employee
+from apps.leaves.intervals import leave_index
+from apps.leaves.models import Leave, LeaveType
+
+User = get_user_model()
+
+# Every seeded account shares this password, hashed once
+PASSWORD = 'benchmark-pass'
+ADMIN_EMAIL = 'bench-admin@example.com'
+EMAIL_TEMPLATE = 'bench-{}@example.com'
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+FIRST_NAMES = ('Ada', 'Grace', 'Alan', 'Edsger', 'Barbara', 'Donald', 'Frances', 'Ken')
+LAST_NAMES = ('Lovelace', 'Hopper', 'Turing', 'Dijkstra', 'Liskov', 'Knuth', 'Allen', 'Thompson')
+DEPARTMENTS = ('Engineering', 'Sales', 'Marketing', 'Finance', 'Support', 'Operations')
+LEAVE_TYPES = (('Annual', 25), ('Sick', 10), ('Parental', 90), ('Unpaid', 30))
+STATUSES = ('pending', 'approved', 'approved', 'rejected')
+
+
+def parse_size(value):
+    """'10k', '100k', '1m' or a plain integer."""
+    return SIZES.get(value.lower()) or int(value)
+
+
+def seeded_employees():
+    return Employee.objects.filter(email__startswith='bench-')
+
+
+def seed(employees, leaves_per_employee=2, batch_size=5000, log=print):
+    """
+    Top the benchmark dataset up to ``employees`` employees (with their user
+    accounts) and ``leaves_per_employee`` leaves each using ``bulk_create``.
+    Save signals do not run, so the balance ledger is rebuilt at the end.
+    """
+    password = make_password(PASSWORD)
+    admin, _ = User.objects.get_or_create(
+        email=ADMIN_EMAIL,
+        defaults={'username': 'bench-admin', 'password': password, 'role': 'admin', 'is_staff': True},
+    )
+    leave_types = [
+        LeaveType.objects.get_or_create(name=name, defaults={'max_days': max_days})[0]
+        for name, max_days in LEAVE_TYPES
+    ]
+
+    departments = resolve_departments(DEPARTMENTS)
+
+    start = seeded_employees().count()
+    base = date(date.today().year, 1, 5)
+    for offset in range(start, employees, batch_size):
+        indexes = range(offset, min(offset + batch_size, employees))
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    username=f'bench-{i}',
+                    email=EMAIL_TEMPLATE.format(i),
+                    password=password,
+                    first_name=FIRST_NAMES[i % len(FIRST_NAMES)],
+                    last_name=LAST_NAMES[i // len(FIRST_NAMES) % len(LAST_NAMES)],
+                    role='employee',
+                )
+                for i in indexes
+            ])
+            staff = Employee.objects.bulk_create([
+                Employee(
+                    user=user,
+                    created_by=admin,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    email=user.email,
+                    department=DEPARTMENTS[i % len(DEPARTMENTS)],
+                    department_ref=departments[DEPARTMENTS[i % len(DEPARTMENTS)]],
+                    position='Engineer',
+                    salary=50000 + i % 50 * 1000,
+                    hire_date=base - timedelta(days=i % 2000),
+                )
+                for i, user in zip(indexes, users)
+            ])
+            Leave.objects.bulk_create([
+                Leave(
+                    employee=employee,
+                    leave_type=leave_types[(i + j) % len(leave_types)],
+                    start_date=base + timedelta(days=40 * j + i % 20),
+                    end_date=base + timedelta(days=40 * j + i % 20 + i % 5),
+                    reason='Benchmark leave',
+                    status=STATUSES[(i + j) % len(STATUSES)],
+                )
+                for i, employee in zip(indexes, staff)
+                for j in range(leaves_per_employee)
+            ])
+        log(f'Seeded {indexes.stop} / {employees} employees')
+
+    call_command('rebuild_balances', stdout=StringIO())
+    leave_index.invalidate()
+    return admin
@@ -0,0 +1,31 @@
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from apps.employees.models import Employee
+from apps.leaves.models import Leave, LeaveBalance
+from benchmarks.seed import parse_size
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_seed_is_incremental(self):
+        call_command('seed_benchmark_data', '6', '--batch-size', '4', stdout=StringIO())
+        call_command('seed_benchmark_data', '8', stdout=StringIO())
+        self.assertEqual(Employee.objects.filter(email__startswith='bench-').count(), 8)
+        self.assertEqual(Leave.objects.count(), 16)
+        self.assertTrue(LeaveBalance.objects.exists())
+        self.assertEqual(parse_size('100K'), 100_000)
+
+    def test_report(self):
+        call_command('seed_benchmark_data', '5', stdout=StringIO())
+        out = StringIO()
+        call_command('run_benchmarks', '--iterations', '3', stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['meta']['employees'], 5)
+        self.assertEqual(set(report['results']), {
+            'employees.list', 'employees.retrieve', 'leaves.list', 'leaves.retrieve',
+            'leaves.create', 'leaves.approve', 'auth.login',
+        })
+        for name, result in report['results'].items():
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertEqual(set(result['status_codes']) - {'200', '201'}, set(), name)
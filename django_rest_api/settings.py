@@ -53,12 +53,20 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     
     # Project apps
+    'apps.core',
     'apps.authentication',
     'apps.employees',
     'apps.leaves',
 ]
 
+# Benchmark seeding and runner commands (seed_benchmark_data creates up to 1m
+# rows); off unless DEBUG or explicitly enabled
+BENCHMARKS_ENABLED = os.getenv('BENCHMARKS_ENABLED', str(DEBUG)) == 'True'
+if BENCHMARKS_ENABLED:
+    INSTALLED_APPS.append('benchmarks')
+
 MIDDLEWARE = [
+    'apps.core.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,6 +76,11 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request SQL counts/timings (apps.core.sql logger, Server-Timing header
+# for staff users); off unless DEBUG or explicitly enabled
+SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', str(DEBUG)) == 'True'
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 5))
+
 ROOT_URLCONF = 'django_rest_api.urls'
 
 TEMPLATES = [
@@ -144,7 +157,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
@@ -179,3 +192,9 @@ SIMPLE_JWT = {
 
 # Custom user model
 AUTH_USER_MODEL = 'authentication.User'
+
+# Employee imports: rows per batch, password hashing processes per import and
+# the batch size below which passwords are hashed inline without a pool
+EMPLOYEE_IMPORT_BATCH_SIZE = int(os.getenv('EMPLOYEE_IMPORT_BATCH_SIZE', 1000))
+EMPLOYEE_IMPORT_HASH_WORKERS = int(os.getenv('EMPLOYEE_IMPORT_HASH_WORKERS', 2))
+EMPLOYEE_IMPORT_INLINE_HASH_ROWS = int(os.getenv('EMPLOYEE_IMPORT_INLINE_HASH_ROWS', 100))